@@ -8,6 +8,11 @@ __version__ = "0.1.0"
 from .packet import (
     BLEPacket,
     BLEPacketConfig,
+    BLEPacketTemplate,
+    BLEPacketBatch,
+    generate_batch,
+    preamble_bits,
+    coded_spreading,
     BLEPhyMode,
     BLEChannelType,
     AdvertisingPDUType,
@@ -23,9 +28,49 @@ from .packet import (
     RFTestConfig,
     RFTestPacket,
     create_test_packet,
+    create_test_packet_sequence,
+    channel_to_frequency,
 )
-from .modulator import BLEModulator, ModulatorConfig
-from .demodulator import BLEDemodulator, DemodulatorConfig
+from .modulator import BLEModulator, ModulatorConfig, ModulatorStream
+from .pulse import pulse_cache_info, clear_pulse_cache
+from .crc import (
+    crc24,
+    crc24_batch,
+    check_crc24,
+    check_crc24_batch,
+    crc24_shift,
+    crc24_combine,
+    crc24_patch,
+)
+from .coded_phy import (
+    CODED_PREAMBLE,
+    convolutional_encode,
+    pattern_map,
+    encode_fec_block,
+    coded_header,
+    coded_packet_length,
+    coded_sync_pattern,
+    pattern_demap,
+    viterbi_decode,
+    decode_fec_block,
+)
+from .whitening import whitening_sequence, apply_whitening
+from .bitutils import bytes_to_bits, bits_to_bytes, int_to_bits, bits_to_int, popcount
+from .access_address import (
+    ADVERTISING_ACCESS_ADDRESS,
+    access_address_valid,
+    generate_access_addresses,
+)
+from .prbs import prbs_bits, prbs_bytes, PRBSSequence
+from .hopping import (
+    used_channels,
+    csa1_channel_sequence,
+    csa2_channel_sequence,
+    csa2_channels,
+    channel_identifier,
+)
+from .demodulator import BLEDemodulator, DemodulatorConfig, DEMODULATION_RESULT_DTYPE
+from .sync import SyncDetector, SyncHit, sync_pattern, find_sync_word, sync_word_errors, max_sync_errors
 from .visualizer import BLEVisualizer, plot_ble_signal
 from .measure import RFMetrics, RFMeasure, calculate_rf_metrics
 from .report import ReportGenerator
@@ -52,6 +97,14 @@ from .performance import (
     quick_snr_sweep,
     plot_ber_curve,
 )
+from .nco import NCOModulator, NCOConfig
+from .traffic import TrafficGenerator, TrafficConfig, TrafficEvent
+from .wideband import (
+    WidebandSynthesizer,
+    WidebandConfig,
+    WidebandBurst,
+    synthesize_wideband,
+)
 from .iq_io import (
     IQExporter,
     IQImporter,
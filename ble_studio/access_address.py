@@ -0,0 +1,112 @@
+"""
+BLE 接入地址生成 (批量向量化)
+
+连接的接入地址 (Core Spec Vol 6 Part B 2.1.2) 需满足:
+- 不能超过 6 个连续的 0 或 1
+- 不能是广播接入地址, 也不能与广播接入地址只差 1 个比特
+- 4 个字节不能全部相同
+- 比特翻转不能超过 24 次
+- 最高 6 比特内至少 2 次翻转
+- LE Coded PHY 额外要求: 最低 8 比特中至少 3 个 1, 最低 16 比特内翻转不超过 11 次
+
+所有规则都用 uint32 位运算对整批候选地址同时检查 (相邻比特异或得到翻转位置, popcount 计数),
+一次筛选数十万个候选, 代替逐个格式化为二进制字符串的检查。
+"""
+
+import numpy as np
+from typing import Iterable, Optional, Union
+
+from .bitutils import popcount
+
+
+# 广播接入地址
+ADVERTISING_ACCESS_ADDRESS = 0x8E89BED6
+
+# 每轮生成的最少候选数 (合法率约 60%, 一般一轮即可)
+_MIN_CANDIDATES = 1024
+
+_U32 = np.uint32
+
+
+def _transitions(aa: np.ndarray) -> np.ndarray:
+    """相邻比特翻转位置: 第 i 位为 bit[i] ^ bit[i+1] (i = 0..30)"""
+    return (aa ^ (aa >> _U32(1))) & _U32(0x7FFFFFFF)
+
+
+def access_address_valid(access_address: Union[int, np.ndarray],
+                         coded_phy: bool = False) -> Union[bool, np.ndarray]:
+    """
+    检查接入地址是否符合规范
+
+    Args:
+        access_address: 接入地址, 标量或数组
+        coded_phy: 同时检查 LE Coded PHY 的附加规则
+
+    Returns:
+        是否合法 (标量输入返回 bool, 数组输入返回 bool 数组)
+    """
+    aa = np.asarray(access_address, dtype=np.int64).astype(_U32)
+    transitions = _transitions(aa)
+
+    # 连续 7 个相同比特 = 连续 6 个位置没有翻转
+    same = ~transitions & _U32(0x7FFFFFFF)
+    run2 = same & (same >> _U32(1))
+    run4 = run2 & (run2 >> _U32(2))
+    run6 = run4 & (run2 >> _U32(4))
+    valid = run6 == 0
+
+    # 不能是广播接入地址或与其只差 1 个比特
+    valid &= popcount(aa ^ _U32(ADVERTISING_ACCESS_ADDRESS)) > 1
+
+    # 4 个字节不能全部相同
+    valid &= aa != (aa & _U32(0xFF)) * _U32(0x01010101)
+
+    # 翻转不超过 24 次, 最高 6 比特 (bit 26-31) 内至少 2 次翻转
+    valid &= popcount(transitions) <= 24
+    valid &= popcount(transitions & _U32(0x1F << 26)) >= 2
+
+    if coded_phy:
+        valid &= popcount(aa & _U32(0xFF)) >= 3
+        valid &= popcount(transitions & _U32(0x7FFF)) <= 11
+
+    return bool(valid) if valid.ndim == 0 else valid
+
+
+def generate_access_addresses(count: int, coded_phy: bool = False,
+                              exclude: Optional[Iterable[int]] = None,
+                              seed: Optional[int] = None) -> np.ndarray:
+    """
+    批量生成互不相同的随机接入地址
+
+    示例:
+        addresses = generate_access_addresses(10000, seed=1)
+
+    Args:
+        count: 地址数
+        coded_phy: 同时满足 LE Coded PHY 的附加规则
+        exclude: 已在使用的接入地址 (不会重复生成)
+        seed: 随机种子 (None 使用 numpy 全局随机状态)
+
+    Returns:
+        (count,) uint32 数组, 按生成顺序排列
+    """
+    rng = np.random if seed is None else np.random.default_rng(seed)
+    randint = rng.randint if seed is None else rng.integers
+
+    used = np.unique(np.asarray(list(exclude) if exclude is not None else [], dtype=np.int64).astype(_U32))
+    result = np.empty(0, dtype=_U32)
+
+    while len(result) < count:
+        needed = count - len(result)
+        candidates = randint(0, 1 << 32, size=max(2 * needed, _MIN_CANDIDATES), dtype=np.uint64).astype(_U32)
+        candidates = candidates[access_address_valid(candidates, coded_phy)]
+
+        # 去重 (保持生成顺序), 并排除已有地址
+        candidates, first = np.unique(candidates, return_index=True)
+        fresh = ~np.isin(candidates, used, assume_unique=True)
+        candidates = candidates[fresh][np.argsort(first[fresh])][:needed]
+
+        result = np.concatenate([result, candidates])
+        used = np.union1d(used, candidates)
+
+    return result
@@ -0,0 +1,109 @@
+"""
+比特/字节转换工具 (LSB first)
+
+BLE 空口按字节 LSB first 发送, 数据包组装和解析都需要在比特流与字节/整数之间转换。
+本模块基于 np.unpackbits / np.packbits (bitorder='little') 实现, 替代逐比特的 Python 循环。
+所有函数沿最后一维处理, 同时支持单个数据包 (1-D) 和批量数据包 (2-D)。
+"""
+
+import numpy as np
+from typing import Union
+
+
+BytesLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+def _as_uint8(data: BytesLike) -> np.ndarray:
+    """字节数据转换为 uint8 数组 (bytes 类型不复制)"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint8)
+    return np.asarray(data, dtype=np.uint8)
+
+
+def bytes_to_bits(data: BytesLike) -> np.ndarray:
+    """
+    字节转比特 (LSB first)
+
+    Args:
+        data: 字节数据 (bytes), 或字节矩阵 (N, n_bytes)
+
+    Returns:
+        比特数组 (..., n_bytes * 8), uint8
+    """
+    return np.unpackbits(_as_uint8(data), axis=-1, bitorder='little')
+
+
+def bits_to_bytes(bits: np.ndarray, pad: bool = False) -> np.ndarray:
+    """
+    比特转字节 (LSB first)
+
+    Args:
+        bits: 比特数组 (..., n_bits), 非零即为 1
+        pad: 末尾不足 8 比特时补零成一个字节; False 则丢弃不完整的字节
+
+    Returns:
+        字节数组 (..., n_bytes), uint8 (单个数据包可用 .tobytes() 转换为 bytes)
+    """
+    bits = np.asarray(bits)
+    if not pad:
+        bits = bits[..., :bits.shape[-1] // 8 * 8]
+    return np.packbits(bits.astype(np.uint8, copy=False), axis=-1, bitorder='little')
+
+
+def int_to_bits(value: Union[int, np.ndarray], num_bits: int) -> np.ndarray:
+    """
+    整数转比特 (LSB first)
+
+    Args:
+        value: 整数, 或整数数组 (N,) (如批量接入地址)
+        num_bits: 比特数 (<= 64)
+
+    Returns:
+        比特数组 (num_bits,) 或 (N, num_bits), uint8
+    """
+    shifts = np.arange(num_bits, dtype=np.uint64)
+    if np.ndim(value) == 0:
+        return ((np.uint64(value) >> shifts) & np.uint64(1)).astype(np.uint8)
+    value = np.asarray(value).astype(np.uint64)
+    return ((value[..., np.newaxis] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+def bits_to_int(bits: np.ndarray) -> Union[int, np.ndarray]:
+    """
+    比特转整数 (LSB first)
+
+    Args:
+        bits: 比特数组 (n_bits,) 或 (N, n_bits), n_bits <= 64
+
+    Returns:
+        整数 (1-D 输入) 或 uint64 数组 (N,)
+    """
+    bits = np.asarray(bits)
+    weights = np.uint64(1) << np.arange(bits.shape[-1], dtype=np.uint64)
+    values = np.bitwise_or.reduce((bits != 0) * weights, axis=-1)
+    if bits.ndim == 1:
+        return int(values)
+    return values.astype(np.uint64)
+
+
+# 字节内 1 的个数查找表 (np.bitwise_count 不可用时使用)
+_POPCOUNT_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """
+    逐元素统计 1 的个数
+
+    NumPy >= 2.0 使用 np.bitwise_count, 否则按字节查表。
+
+    Args:
+        values: 无符号整数数组
+
+    Returns:
+        各元素中 1 的个数 (uint8)
+    """
+    values = np.asarray(values)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    as_bytes = np.ascontiguousarray(values)[..., np.newaxis].view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.uint8)
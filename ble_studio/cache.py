@@ -0,0 +1,22 @@
+"""
+进程内缓存的公共工具
+
+脉冲、重采样滤波器、跳频表等按参数缓存 (lru_cache) 的数组在多个调用方之间共享,
+返回前统一标记为只读, 调用方不可原地修改。
+"""
+
+import numpy as np
+
+
+def readonly(array: np.ndarray) -> np.ndarray:
+    """
+    将数组标记为只读 (缓存共享, 防止被调用方修改)
+
+    Args:
+        array: 缓存返回的数组 (原地修改标志)
+
+    Returns:
+        同一数组
+    """
+    array.flags.writeable = False
+    return array
@@ -8,6 +8,7 @@ from typing import Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from scipy import signal as scipy_signal
+from .precision import resolve_dtype, real_dtype, phasor
 
 
 class ChannelType(Enum):
@@ -55,6 +56,9 @@ class ChannelConfig:
     # 相位噪声
     phase_noise_level: float = -100  # 相位噪声电平 (dBc/Hz @ 1MHz offset)
 
+    # 数值精度: complex128 / complex64, None 表示沿用输入信号精度
+    dtype: Optional[str] = None
+
     def __post_init__(self):
         if self.path_delays is None:
             self.path_delays = [0.0]
@@ -106,8 +110,11 @@ class AWGNChannel:
 
         noise_power = signal_power / snr_linear
 
-        noise = np.sqrt(noise_power / 2) * (
-            np.random.randn(len(signal)) + 1j * np.random.randn(len(signal))
+        # 噪声按信号精度生成 (标量转为 Python float, 避免单精度信号被提升)
+        rdt = real_dtype(signal.dtype)
+        noise = float(np.sqrt(noise_power / 2)) * (
+            np.random.randn(len(signal)).astype(rdt, copy=False) +
+            1j * np.random.randn(len(signal)).astype(rdt, copy=False)
         )
 
         return signal + noise
@@ -128,13 +135,13 @@ class FlatFadingChannel:
 
         # Jakes 模型
         num_sinusoids = 8
-        fading = np.zeros(num_samples, dtype=complex)
+        fading = np.zeros(num_samples, dtype=signal.dtype)
 
         for n in range(num_sinusoids):
             alpha = 2 * np.pi * n / num_sinusoids
             beta = np.random.uniform(0, 2 * np.pi)
             freq = self.doppler_freq * np.cos(alpha)
-            fading += np.exp(1j * (2 * np.pi * freq * t + beta))
+            fading += phasor(2 * np.pi * freq * t + beta, signal.dtype)
 
         fading /= np.sqrt(num_sinusoids)
 
@@ -173,16 +180,19 @@ class RicianChannel:
         num_samples = len(signal)
         t = np.arange(num_samples) / self.sample_rate
 
+        rdt = real_dtype(signal.dtype)
+
         # 直射分量 (LOS)
-        los_amplitude = np.sqrt(self.k_factor / (self.k_factor + 1))
+        los_amplitude = float(np.sqrt(self.k_factor / (self.k_factor + 1)))
         los_phase = np.random.uniform(0, 2 * np.pi)
-        los = los_amplitude * np.exp(1j * (2 * np.pi * self.doppler_freq * t + los_phase))
+        los = los_amplitude * phasor(2 * np.pi * self.doppler_freq * t + los_phase, signal.dtype)
 
         # 散射分量 (NLOS) - 瑞利
-        nlos_amplitude = np.sqrt(1 / (self.k_factor + 1))
+        nlos_amplitude = float(np.sqrt(1 / (self.k_factor + 1)))
         nlos = nlos_amplitude * (
-            np.random.randn(num_samples) + 1j * np.random.randn(num_samples)
-        ) / np.sqrt(2)
+            np.random.randn(num_samples).astype(rdt, copy=False) +
+            1j * np.random.randn(num_samples).astype(rdt, copy=False)
+        ) / float(np.sqrt(2))
 
         # 组合
         fading = los + nlos
@@ -213,9 +223,9 @@ class MultipathChannel:
     def apply(self, signal: np.ndarray) -> np.ndarray:
         """应用多径衰落"""
         max_delay = max(self.delay_samples)
-        output = np.zeros(len(signal) + max_delay, dtype=complex)
+        output = np.zeros(len(signal) + max_delay, dtype=signal.dtype)
 
-        for delay, gain in zip(self.delay_samples, self.path_gains):
+        for delay, gain in zip(self.delay_samples, self.path_gains.tolist()):
             # 可选: 添加每路径的衰落
             if self.doppler_freq > 0:
                 fading = RayleighChannel(self.doppler_freq, self.sample_rate)
@@ -287,7 +297,7 @@ class IQImbalance:
             phase_imbalance_deg: 相位失衡 (度)
         """
         self.amplitude_imbalance = 10 ** (amplitude_imbalance_db / 20)
-        self.phase_imbalance = np.deg2rad(phase_imbalance_deg)
+        self.phase_imbalance = float(np.deg2rad(phase_imbalance_deg))
 
     def apply(self, signal: np.ndarray) -> np.ndarray:
         """应用 IQ 失衡"""
@@ -297,7 +307,7 @@ class IQImbalance:
         # 应用失衡
         i_out = i
         q_out = self.amplitude_imbalance * (
-            np.sin(self.phase_imbalance) * i + np.cos(self.phase_imbalance) * q
+            float(np.sin(self.phase_imbalance)) * i + float(np.cos(self.phase_imbalance)) * q
         )
 
         return i_out + 1j * q_out
@@ -334,7 +344,7 @@ class PhaseNoise:
         pn_fft = np.sqrt(pn_psd) * np.exp(1j * 2 * np.pi * np.random.rand(num_samples))
         phase_noise = np.real(np.fft.ifft(pn_fft))
 
-        return signal * np.exp(1j * phase_noise)
+        return signal * phasor(phase_noise, signal.dtype)
 
 
 class FrequencyOffset:
@@ -362,7 +372,7 @@ class FrequencyOffset:
         # 相位 = 积分(2*pi*freq)
         phase = 2 * np.pi * np.cumsum(instant_freq) / self.sample_rate
 
-        return signal * np.exp(1j * phase)
+        return signal * phasor(phase, signal.dtype)
 
 
 class TimingOffset:
@@ -399,7 +409,8 @@ class TimingOffset:
         interp_imag = interp1d(t_orig, signal.imag, kind='cubic',
                                bounds_error=False, fill_value=0)
 
-        return interp_real(t_new) + 1j * interp_imag(t_new)
+        output = interp_real(t_new) + 1j * interp_imag(t_new)
+        return output.astype(signal.dtype, copy=False)
 
 
 class DCOffset:
@@ -416,7 +427,7 @@ class DCOffset:
 
     def apply(self, signal: np.ndarray) -> np.ndarray:
         """应用 DC 偏移"""
-        return signal + (self.dc_i + 1j * self.dc_q)
+        return signal + complex(self.dc_i, self.dc_q)
 
 
 class BLEChannel:
@@ -495,9 +506,10 @@ class BLEChannel:
             signal: 输入信号
 
         Returns:
-            经过信道的信号
+            经过信道的信号 (精度由 ChannelConfig.dtype 决定)
         """
-        output = signal.copy()
+        dtype = resolve_dtype(self.config.dtype, signal)
+        output = np.array(signal, dtype=dtype)
 
         for impairment in self.impairments:
             output = impairment.apply(output)
@@ -0,0 +1,291 @@
+"""
+LE Coded PHY 编码与译码 (S=2 / S=8)
+
+数据包结构 (符号速率 1 Msym/s):
+    前导码 (80 符号, 00111100 x 10, 不编码)
+    FEC 块 1: 接入地址 (32) + CI (2) + TERM1 (3), 固定 S=8 编码 -> 296 符号
+    FEC 块 2: 白化后的 PDU + CRC + TERM2 (3), 按 CI 指示的 S=2 或 S=8 编码
+
+FEC 编码为卷积码 (K=4, 码率 1/2, 生成多项式 G0 = 1 + D + D^2 + D^3, G1 = 1 + D^2 + D^3),
+每个 FEC 块从全零状态开始, TERM 的 3 个 0 比特使编码器回到全零状态。
+模式映射: S=8 时每个编码比特映射为 4 个符号 (0 -> 0011, 1 -> 1100), S=2 时不变。
+
+卷积编码是对输入比特移位视图的异或, 模式映射是查表, 两者都沿最后一维向量化,
+批量 (N, L) 比特矩阵一次编码, 与未编码 PHY 的批量生成速度相当。
+
+接收端: 模式解映射 (软值相关) + 软判决 Viterbi 译码。
+Viterbi 每步处理 3 个输入比特 (radix-8): 3 个比特之后编码器状态完全由这 3 个比特决定,
+每个新状态到 8 个旧状态各有唯一一条路径, 网格每步为 8x8 全连接的加-比-选 (数组运算),
+分支度量由软值与 64 种 6 比特编码输出的矩阵乘得到, 同时支持批量数据包。
+"""
+
+import numpy as np
+from typing import Optional, Union
+
+from .bitutils import int_to_bits
+
+
+# 前导码: 00111100 重复 10 次 (80 符号)
+CODED_PREAMBLE = np.tile(np.array([0, 0, 1, 1, 1, 1, 0, 0], dtype=np.uint8), 10)
+CODED_PREAMBLE.flags.writeable = False
+
+# 卷积码约束长度与生成多项式 (系数按 D^0, D^1, D^2, D^3 排列)
+CONSTRAINT_LENGTH = 4
+G0 = (1, 1, 1, 1)
+G1 = (1, 0, 1, 1)
+
+# TERM1 / TERM2 长度 (比特): 编码器回到全零状态
+TERM_LENGTH = CONSTRAINT_LENGTH - 1
+
+# 编码指示 (CI, 2 比特, LSB first): S -> CI
+CODING_INDICATOR = {8: 0b00, 2: 0b01}
+
+# 模式映射 (S=8): 编码比特 -> 4 个符号
+PATTERN_S8 = np.array([[0, 0, 1, 1], [1, 1, 0, 0]], dtype=np.uint8)
+PATTERN_S8.flags.writeable = False
+_PATTERN_S8_WORDS = PATTERN_S8.view('<u4').ravel()
+
+# FEC 块 1 长度 (未编码比特): 接入地址 + CI + TERM1
+FEC_BLOCK1_BITS = 32 + 2 + TERM_LENGTH
+
+
+def _check_spreading(spreading: int):
+    """检查 S"""
+    if spreading not in CODING_INDICATOR:
+        raise ValueError(f"不支持的 S: {spreading} (支持 {sorted(CODING_INDICATOR)})")
+
+
+def convolutional_encode(bits: np.ndarray) -> np.ndarray:
+    """
+    卷积编码 (K=4, 码率 1/2), 编码器初始状态为全零
+
+    Args:
+        bits: 比特序列 (L,) 或批量比特矩阵 (N, L)
+
+    Returns:
+        编码比特 (..., 2L), 每个输入比特输出 a0 (G0) 和 a1 (G1), uint8
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    length = bits.shape[-1]
+
+    # 左侧补 K-1 个 0 (初始状态), delayed[k] 为延迟 k 个比特的序列
+    padded = np.zeros(bits.shape[:-1] + (length + TERM_LENGTH,), dtype=np.uint8)
+    padded[..., TERM_LENGTH:] = bits
+    delayed = [padded[..., TERM_LENGTH - k:TERM_LENGTH - k + length] for k in range(CONSTRAINT_LENGTH)]
+
+    encoded = np.empty(bits.shape[:-1] + (length, 2), dtype=np.uint8)
+    for output, generator in enumerate((G0, G1)):
+        taps = [delayed[k] for k in range(CONSTRAINT_LENGTH) if generator[k]]
+        out = encoded[..., output]
+        np.bitwise_xor(taps[0], taps[1], out=out)
+        for tap in taps[2:]:
+            out ^= tap
+
+    return encoded.reshape(bits.shape[:-1] + (2 * length,))
+
+
+def pattern_map(encoded: np.ndarray, spreading: int) -> np.ndarray:
+    """
+    模式映射
+
+    Args:
+        encoded: 编码比特 (..., M)
+        spreading: S (2 或 8)
+
+    Returns:
+        符号 (..., M) (S=2) 或 (..., 4M) (S=8), uint8
+    """
+    encoded = np.asarray(encoded, dtype=np.uint8)
+    _check_spreading(spreading)
+    if spreading == 2:
+        return encoded
+    # 4 个符号作为一个 uint32 查表, 再按字节展开
+    return _PATTERN_S8_WORDS.take(encoded).view(np.uint8)
+
+
+def encode_fec_block(bits: np.ndarray, spreading: int) -> np.ndarray:
+    """
+    FEC 块编码: 追加 TERM, 卷积编码, 模式映射
+
+    FEC 块 2 即白化后的 PDU + CRC 比特按 S 编码, 批量时传入 (N, L) 矩阵。
+
+    Args:
+        bits: 块内比特 (不含 TERM), (L,) 或 (N, L)
+        spreading: S (2 或 8)
+
+    Returns:
+        符号 (..., (L + 3) * S), uint8
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    terminated = np.zeros(bits.shape[:-1] + (bits.shape[-1] + TERM_LENGTH,), dtype=np.uint8)
+    terminated[..., :bits.shape[-1]] = bits
+    return pattern_map(convolutional_encode(terminated), spreading)
+
+
+def coded_header(access_address: int, spreading: int) -> np.ndarray:
+    """
+    前导码 + FEC 块 1 (接入地址 + CI + TERM1, 固定 S=8)
+
+    对同一接入地址和 S 的所有数据包相同。
+
+    Args:
+        access_address: 接入地址
+        spreading: FEC 块 2 的 S (2 或 8), 决定 CI
+
+    Returns:
+        符号 (80 + 296,), uint8
+    """
+    _check_spreading(spreading)
+    block1 = np.concatenate([
+        int_to_bits(access_address, 32),
+        int_to_bits(CODING_INDICATOR[spreading], 2)
+    ])
+    return np.concatenate([CODED_PREAMBLE, encode_fec_block(block1, 8)])
+
+
+def coded_packet_length(pdu_length: Union[int, np.ndarray], spreading: int) -> Union[int, np.ndarray]:
+    """
+    Coded PHY 数据包符号数 (= 空口时长 us)
+
+    Args:
+        pdu_length: PDU 字节数 (含 2 字节头部)
+        spreading: FEC 块 2 的 S (2 或 8)
+
+    Returns:
+        符号数
+    """
+    _check_spreading(spreading)
+    return len(CODED_PREAMBLE) + FEC_BLOCK1_BITS * 8 + ((pdu_length + 3) * 8 + TERM_LENGTH) * spreading
+
+
+# ---------------------------------------------------------------- 接收端
+
+# 每个 Viterbi 步处理的输入比特数 (radix-8)
+RADIX_BITS = CONSTRAINT_LENGTH - 1
+
+# 每批计算分支度量的步数 (限制 (N, 步数, 64) 度量矩阵的内存)
+_VITERBI_CHUNK_STEPS = 256
+
+# 状态 = 最近 3 个输入比特, 最早的在最高位; STATE_BITS[s] 为到达状态 s 的 3 个输入比特 (时间顺序)
+_STATE_BITS = ((np.arange(8)[:, np.newaxis] >> np.array([2, 1, 0])) & 1).astype(np.uint8)
+
+
+def _branch_table() -> np.ndarray:
+    """radix-8 分支输出: (64, 6), 行 = 旧状态 * 8 + 新状态, 编码比特 1 为 +1, 0 为 -1"""
+    table = np.zeros((8, 8, 2 * RADIX_BITS))
+    for old in range(8):
+        for new in range(8):
+            history = np.concatenate([_STATE_BITS[old], _STATE_BITS[new]])
+            encoded = convolutional_encode(history)[2 * RADIX_BITS:]
+            table[old, new] = 2.0 * encoded - 1
+    return table.reshape(64, 2 * RADIX_BITS)
+
+
+_BRANCH_TABLE = _branch_table()
+
+# CI -> S
+SPREADING_FROM_CI = {ci: spreading for spreading, ci in CODING_INDICATOR.items()}
+
+
+def pattern_demap(soft_symbols: np.ndarray, spreading: int) -> np.ndarray:
+    """
+    模式解映射 (软值)
+
+    Args:
+        soft_symbols: 符号软值 (..., M), 正值表示符号 1
+        spreading: S (2 或 8)
+
+    Returns:
+        编码比特软值 (..., M) (S=2) 或 (..., M / 4) (S=8), 正值表示编码比特 1
+    """
+    soft_symbols = np.asarray(soft_symbols, dtype=np.float64)
+    _check_spreading(spreading)
+    if spreading == 2:
+        return soft_symbols
+    # 1 -> 1100, 0 -> 0011: 与 (+1, +1, -1, -1) 相关
+    groups = soft_symbols[..., :soft_symbols.shape[-1] // 4 * 4]
+    groups = groups.reshape(soft_symbols.shape[:-1] + (-1, 4))
+    return groups[..., 0] + groups[..., 1] - groups[..., 2] - groups[..., 3]
+
+
+def viterbi_decode(soft_bits: np.ndarray, terminated: bool = True) -> np.ndarray:
+    """
+    软判决 Viterbi 译码 (K=4, 码率 1/2), 编码器初始状态为全零
+
+    Args:
+        soft_bits: 编码比特软值 (..., 2L), 正值表示 1 (如 pattern_demap 的输出)
+        terminated: 块以 TERM 结尾 (结束状态为全零); False 时从度量最大的状态回溯
+
+    Returns:
+        译码比特 (..., L), uint8 (含 TERM)
+    """
+    soft_bits = np.asarray(soft_bits, dtype=np.float64)
+    batch_shape = soft_bits.shape[:-1]
+    num_bits = soft_bits.shape[-1] // 2
+    soft = soft_bits.reshape(-1, soft_bits.shape[-1])[:, :2 * num_bits]
+    num_packets = len(soft)
+
+    # 补零 (擦除) 到 3 比特的整数倍; 终止时强制结束状态为 0 同时约束补齐的比特为 0
+    steps = -(-num_bits // RADIX_BITS)
+    padded = np.zeros((num_packets, steps * 2 * RADIX_BITS))
+    padded[:, :soft.shape[1]] = soft
+    padded = padded.reshape(num_packets, steps, 2 * RADIX_BITS)
+
+    metrics = np.full((num_packets, 8), -np.inf)
+    metrics[:, 0] = 0.0
+    survivors = np.empty((steps, num_packets, 8), dtype=np.uint8)
+
+    for chunk_start in range(0, steps, _VITERBI_CHUNK_STEPS):
+        chunk = padded[:, chunk_start:chunk_start + _VITERBI_CHUNK_STEPS]
+        branch = (chunk @ _BRANCH_TABLE.T).reshape(num_packets, -1, 8, 8)
+        for t in range(branch.shape[1]):
+            # 加-比-选: candidates[n, 旧状态, 新状态]
+            candidates = metrics[:, :, np.newaxis] + branch[:, t]
+            survivors[chunk_start + t] = candidates.argmax(axis=1)
+            metrics = candidates.max(axis=1)
+
+    # 回溯
+    rows = np.arange(num_packets)
+    state = np.zeros(num_packets, dtype=np.intp) if terminated else metrics.argmax(axis=1)
+    states = np.empty((num_packets, steps), dtype=np.uint8)
+    for t in range(steps - 1, -1, -1):
+        states[:, t] = state
+        state = survivors[t, rows, state]
+
+    bits = _STATE_BITS[states].reshape(num_packets, steps * RADIX_BITS)[:, :num_bits]
+    return bits.reshape(batch_shape + (num_bits,))
+
+
+def decode_fec_block(soft_symbols: np.ndarray, spreading: int,
+                     terminated: bool = True) -> np.ndarray:
+    """
+    FEC 块译码: 模式解映射 + Viterbi 译码 (encode_fec_block 的逆过程)
+
+    Args:
+        soft_symbols: 符号软值 (..., M), 正值表示 1
+        spreading: S (2 或 8)
+        terminated: 块以 TERM 结尾; True 时返回值去掉 TERM 比特
+
+    Returns:
+        译码比特 (..., M / S - 3) (terminated) 或 (..., M / S)
+    """
+    bits = viterbi_decode(pattern_demap(soft_symbols, spreading), terminated)
+    return bits[..., :-TERM_LENGTH] if terminated else bits
+
+
+def coded_sync_pattern(access_address: int) -> np.ndarray:
+    """
+    同步图样: 前导码 + FEC 块 1 中接入地址部分的编码符号 (80 + 256, 与 CI 无关)
+
+    Args:
+        access_address: 接入地址
+
+    Returns:
+        符号 (336,), uint8
+    """
+    return coded_header(access_address, 8)[:len(CODED_PREAMBLE) + 32 * 8]
+
+
+def spreading_from_ci(ci: int) -> Optional[int]:
+    """CI (2 比特) -> S; 保留值 (0b10, 0b11) 返回 None"""
+    return SPREADING_FROM_CI.get(ci)
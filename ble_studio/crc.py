@@ -0,0 +1,283 @@
+"""
+BLE CRC24 计算 (查表法)
+
+多项式: x^24 + x^10 + x^9 + x^6 + x^4 + x^3 + x + 1
+数据按字节 LSB first 送入移位寄存器, 输出按 LSB first 发送 (兼容 MATLAB bleWaveformGenerator)。
+
+逐比特实现 (MSB-first 直接法 + 结果比特反转) 等价于反射寄存器算法:
+寄存器初值为 init 的比特反转, 反射多项式 0xDA6000, 每字节一次查表。
+最终寄存器即为发送的 CRC 值, 无需再反转。
+
+提供:
+- crc24: 单个 PDU
+- crc24_batch: 二维字节矩阵 (N_packets, N_bytes), 一次计算所有数据包的 CRC
+- check_crc24 / check_crc24_batch: 校验 PDU + CRC (无输出异或, 余式为 0 即正确)
+- crc24_shift / crc24_combine / crc24_patch: 利用 CRC 在 GF(2) 上的线性 (zlib crc32_combine 方法),
+  拼接或修改部分字节后直接更新 CRC, 无需重新计算整个 PDU
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional, Sequence, Union
+
+
+# 多项式 (不含 x^24 项) 及其比特反转
+CRC24_POLY = 0x00065B
+CRC24_POLY_REFLECTED = 0xDA6000
+
+# 广播信道 CRC 初始值
+CRC24_INIT_ADV = 0x555555
+
+CRC24_MASK = 0xFFFFFF
+
+# 移位矩阵缓存大小 (按字节数缓存, BLE PDU 最长 257 字节)
+CRC24_SHIFT_CACHE_SIZE = 512
+
+
+def reverse_bits(value: int, num_bits: int = 24) -> int:
+    """比特反转 (num_bits 位)"""
+    result = 0
+    for _ in range(num_bits):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+def _generate_table() -> np.ndarray:
+    """生成反射 CRC24 字节查找表 (256 项)"""
+    table = np.zeros(256, dtype=np.uint32)
+    for byte in range(256):
+        reg = byte
+        for _ in range(8):
+            reg = (reg >> 1) ^ CRC24_POLY_REFLECTED if reg & 1 else reg >> 1
+        table[byte] = reg
+    return table
+
+
+CRC24_TABLE = _generate_table()
+_TABLE_LIST = CRC24_TABLE.tolist()  # 标量计算使用 Python 列表索引更快
+
+
+def crc24(data: bytes, init: int = CRC24_INIT_ADV) -> int:
+    """
+    计算 BLE CRC24
+
+    Args:
+        data: PDU 字节 (不含 CRC)
+        init: CRC 初始值 (广播信道 0x555555, 数据信道由 CONNECT_IND 指定)
+
+    Returns:
+        CRC 值 (24 bit, 按 LSB first 发送, 即低字节在前)
+    """
+    reg = reverse_bits(init & CRC24_MASK)
+    table = _TABLE_LIST
+    for byte in data:
+        reg = (reg >> 8) ^ table[(reg ^ byte) & 0xFF]
+    return reg
+
+
+def check_crc24(data: bytes, init: int = CRC24_INIT_ADV) -> bool:
+    """
+    校验 PDU + CRC
+
+    Args:
+        data: PDU 字节 + 3 字节 CRC
+        init: CRC 初始值
+
+    Returns:
+        CRC 是否正确
+    """
+    if len(data) < 3:
+        return False
+    return crc24(data, init) == 0
+
+
+def crc24_batch(data: np.ndarray, lengths: Optional[Sequence[int]] = None,
+                init: Union[int, np.ndarray] = CRC24_INIT_ADV) -> np.ndarray:
+    """
+    批量计算 CRC24
+
+    逐列 (字节位置) 处理, 每列对所有数据包做一次向量化查表,
+    运算次数与数据包数量无关。
+
+    Args:
+        data: 字节矩阵 (N_packets, N_bytes), uint8
+        lengths: 每个数据包的有效字节数 (可选, 不等长数据包), 超出部分不参与计算
+        init: CRC 初始值, 标量或 (N_packets,) 数组
+
+    Returns:
+        CRC 值数组 (N_packets,), uint32
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    if data.ndim != 2:
+        raise ValueError(f"字节矩阵须为二维 (N_packets, N_bytes): {data.shape}")
+    num_packets, num_bytes = data.shape
+
+    init = np.broadcast_to(np.asarray(init, dtype=np.uint32) & CRC24_MASK, (num_packets,))
+    # 初值比特反转
+    reg = np.zeros(num_packets, dtype=np.uint32)
+    for i in range(24):
+        reg |= ((init >> i) & 1) << (23 - i)
+
+    # 按列连续存储, 原地运算减少临时数组
+    if lengths is not None:
+        lengths = np.asarray(lengths)
+        num_bytes = min(num_bytes, int(lengths.max(initial=0)))
+    columns = np.ascontiguousarray(data[:, :num_bytes].T)
+    index = np.empty(num_packets, dtype=np.uint32)
+
+    for j, column in enumerate(columns):
+        np.bitwise_xor(reg, column, out=index)
+        index &= 0xFF
+        if lengths is None:
+            reg >>= 8
+            reg ^= CRC24_TABLE.take(index)
+        else:
+            updated = (reg >> 8) ^ CRC24_TABLE.take(index)
+            reg = np.where(j < lengths, updated, reg)
+
+    return reg
+
+
+def check_crc24_batch(data: np.ndarray, lengths: Optional[Sequence[int]] = None,
+                      init: Union[int, np.ndarray] = CRC24_INIT_ADV) -> np.ndarray:
+    """
+    批量校验 PDU + CRC
+
+    Args:
+        data: 字节矩阵 (N_packets, N_bytes), 每行为 PDU + 3 字节 CRC
+        lengths: 每行的有效字节数 (含 CRC), 可选
+        init: CRC 初始值, 标量或 (N_packets,) 数组
+
+    Returns:
+        校验结果 (N_packets,), bool
+    """
+    valid = crc24_batch(data, lengths, init) == 0
+    if lengths is not None:
+        valid &= np.asarray(lengths) >= 3
+    elif np.shape(data)[1] < 3:
+        valid[:] = False
+    return valid
+
+
+# ---------------------------------------------------------------------------
+# GF(2) 线性运算
+#
+# 寄存器更新 reg' = (reg >> 8) ^ T[(reg ^ byte) & 0xFF] 对 (reg, byte) 是 GF(2) 线性的, 因此:
+#   crc(A || B, init) = shift(crc(A, init), len(B)) ^ crc(B, 0)
+# 其中 shift(reg, n) 为寄存器再经过 n 个零字节, 是一个 24x24 的 GF(2) 矩阵。
+# 矩阵按列存储为 24 个整数 (第 i 列 = 输入只有第 i 位为 1 时的输出)。
+# ---------------------------------------------------------------------------
+
+def _gf2_matrix_times(matrix: List[int], vector: int) -> int:
+    """GF(2) 矩阵乘向量"""
+    result = 0
+    i = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[i]
+        vector >>= 1
+        i += 1
+    return result
+
+
+def _gf2_matrix_multiply(a: List[int], b: List[int]) -> List[int]:
+    """GF(2) 矩阵乘法 a * b"""
+    return [_gf2_matrix_times(a, column) for column in b]
+
+
+def _zero_byte_matrix() -> List[int]:
+    """寄存器经过一个零字节的移位矩阵"""
+    columns = []
+    for i in range(24):
+        reg = 1 << i
+        columns.append((reg >> 8) ^ _TABLE_LIST[reg & 0xFF])
+    return columns
+
+
+_ZERO_BYTE_MATRIX = _zero_byte_matrix()
+
+
+@lru_cache(maxsize=CRC24_SHIFT_CACHE_SIZE)
+def _shift_matrix(num_bytes: int) -> tuple:
+    """寄存器经过 num_bytes 个零字节的移位矩阵 (平方-乘法, O(log n) 次矩阵乘法)"""
+    result = [1 << i for i in range(24)]
+    power = _ZERO_BYTE_MATRIX
+    while num_bytes:
+        if num_bytes & 1:
+            result = _gf2_matrix_multiply(power, result)
+        num_bytes >>= 1
+        if num_bytes:
+            power = _gf2_matrix_multiply(power, power)
+    return tuple(result)
+
+
+def crc24_shift(crc: Union[int, np.ndarray], num_bytes: int) -> Union[int, np.ndarray]:
+    """
+    CRC 寄存器经过 num_bytes 个零字节后的值
+
+    等价于 crc24(bytes(num_bytes), init=reverse_bits(crc)), 但与 num_bytes 无关:
+    移位矩阵按字节数缓存, 每次只需 24 次异或。
+
+    Args:
+        crc: CRC 值 (crc24 的返回值), 标量或数组
+        num_bytes: 零字节数
+
+    Returns:
+        移位后的 CRC 值
+    """
+    if num_bytes < 0:
+        raise ValueError(f"字节数不能为负: {num_bytes}")
+    matrix = _shift_matrix(num_bytes)
+
+    if isinstance(crc, np.ndarray):
+        crc = crc.astype(np.uint32)
+        result = np.zeros_like(crc)
+        for i, column in enumerate(matrix):
+            result ^= ((crc >> i) & 1) * np.uint32(column)
+        return result
+
+    return _gf2_matrix_times(matrix, crc & CRC24_MASK)
+
+
+def crc24_combine(crc_a: int, crc_b: int, length_b: int,
+                  init: int = CRC24_INIT_ADV) -> int:
+    """
+    由两段数据的 CRC 计算拼接后的 CRC (与 zlib crc32_combine 用法相同)
+
+    Args:
+        crc_a: crc24(A, init)
+        crc_b: crc24(B, init)
+        length_b: B 的字节数
+        init: 计算 crc_a 和 crc_b 时使用的初始值
+
+    Returns:
+        crc24(A + B, init)
+    """
+    # crc_b 中包含初值经过 B 的分量, 需要抵消
+    return crc24_shift(crc_a ^ reverse_bits(init & CRC24_MASK), length_b) ^ crc_b
+
+
+def crc24_patch(crc: int, data_length: int, offset: int,
+                old: bytes, new: bytes) -> int:
+    """
+    修改部分字节后更新 CRC (运算量与修改的字节数成正比, 与数据总长度无关)
+
+    Args:
+        crc: 原数据的 CRC
+        data_length: 数据总字节数
+        offset: 修改起始位置 (字节)
+        old: 原字节 (data[offset:offset + len(old)])
+        new: 新字节 (与 old 等长)
+
+    Returns:
+        修改后数据的 CRC
+    """
+    if len(old) != len(new):
+        raise ValueError(f"新旧数据长度不一致: {len(old)} != {len(new)}")
+    if offset < 0 or offset + len(new) > data_length:
+        raise ValueError(f"修改区间 [{offset}, {offset + len(new)}) 超出数据长度 {data_length}")
+
+    # 差分 (old ^ new) 的 CRC (初值 0), 再移位到数据末尾
+    delta = bytes(a ^ b for a, b in zip(old, new))
+    return crc ^ crc24_shift(crc24(delta, 0), data_length - offset - len(new))
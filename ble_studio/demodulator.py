@@ -7,13 +7,44 @@ BLE GFSK 解调器
 - 改进的频偏估计 (基于前导码)
 - 频偏跟踪 (数据段持续补偿)
 - Gardner 符号定时恢复
+- LE Coded PHY: 编码同步图样检测, 模式解映射, 软判决 Viterbi 译码 (见 coded_phy)
 """
 
 import numpy as np
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union
 from dataclasses import dataclass
 from scipy import signal as scipy_signal
-from .packet import BLEPhyMode, BLEPacket
+from scipy import ndimage
+from .packet import BLEPhyMode, BLEPacket, coded_spreading
+from .pulse import gaussian_matched_filter
+from .precision import resolve_dtype, real_dtype, phasor
+from .resample import plan_resampling, resample
+from .crc import crc24, check_crc24_batch
+from .whitening import apply_whitening
+from .bitutils import bits_to_bytes, int_to_bits
+from .sync import SyncDetector, SyncHit, sync_pattern, sync_word_errors
+from .coded_phy import (
+    CODED_PREAMBLE, FEC_BLOCK1_BITS, TERM_LENGTH, coded_packet_length,
+    decode_fec_block, viterbi_decode, pattern_demap, spreading_from_ci,
+)
+
+
+# 同步检测后端
+SYNC_BACKENDS = ('correlate', 'bitwise')
+
+# demodulate_batch 的结果 (结构化数组, 每行一个数据包, 字段含义同 DemodulationResult)
+DEMODULATION_RESULT_DTYPE = np.dtype([
+    ('success', np.bool_),
+    ('crc_valid', np.bool_),
+    ('sync_found', np.bool_),
+    ('rssi', np.float64),
+    ('freq_offset', np.float64),
+    ('timing_offset', np.float64),
+    ('sync_position', np.int64),       # 同步图样 (前导码+接入地址) 起始符号, 未同步为 -1
+    ('pdu_length', np.int64),          # 解出的 PDU 字节数 (含 2 字节头部, 不含 CRC)
+    ('num_symbols', np.int64),         # 符号判决的有效个数
+    ('spreading', np.int64),           # LE Coded PHY: 由 CI 得到的 S, 未编码 PHY 为 0
+])
 
 
 @dataclass
@@ -24,11 +55,15 @@ class DemodulatorConfig:
     access_address: int = 0x8E89BED6  # 接入地址
     channel: int = 37                  # 信道号
     whitening: bool = True             # 是否启用去白化 (默认开启)
+    crc_init: int = 0x555555           # CRC 初始值 (广播/DTM 为 0x555555, 连接由 CONNECT_IND 指定)
 
     # 高级选项
     use_matched_filter: bool = True    # 使用高斯匹配滤波器
     freq_tracking: bool = False        # 频偏跟踪 (暂时禁用, 需要进一步调试)
     bt: float = 0.5                    # 高斯滤波器 BT 积
+    dtype: Optional[str] = None        # 数值精度: complex128 / complex64, None 表示沿用输入信号精度
+    max_samples_per_symbol: int = 16   # 内部每符号采样数上限, 超出或非整数倍时先重采样
+    sync_backend: str = 'correlate'    # 同步检测: correlate (浮点相关) / bitwise (uint64 XOR + popcount, 结果相同)
 
 
 @dataclass
@@ -43,6 +78,8 @@ class DemodulationResult:
     timing_offset: float               # 定时偏移估计
     sync_found: bool = False           # 是否找到同步 (前导码+接入地址)
     access_address: int = 0            # 检测到的接入地址
+    spreading: int = 0                 # LE Coded PHY: 由 CI 得到的 S (2 或 8), 未编码 PHY 为 0
+    sample_offset: int = 0             # find_packets: 数据包在输入信号中的起始采样
 
 
 class BLEDemodulator:
@@ -51,6 +88,23 @@ class BLEDemodulator:
     # 广播接入地址
     ADV_ACCESS_ADDRESS = 0x8E89BED6
 
+    # 同步相关阈值 (占图样长度的比例): Coded PHY 工作在低 SNR, 图样长 336 符号, 阈值放宽
+    SYNC_THRESHOLD = 0.8
+    CODED_SYNC_THRESHOLD = 0.5
+
+    # 标称调制指数 (同步检测时鉴频输出的限幅电平)
+    NOMINAL_MODULATION_INDEX = 0.5
+
+    # demodulate_batch 每块的采样数 (行数按信号长度换算, 至少 1 行)
+    BATCH_BLOCK_SAMPLES = 1 << 18
+
+    # Coded PHY 译码 PDU 头部时的 Viterbi 回溯余量 (比特)
+    CODED_HEADER_MARGIN = 32
+
+    # Coded PHY 软值限幅 (以符号软值幅度中位数归一化):
+    # 低 SNR 时 FM 鉴频输出出现大幅度的相位跳变脉冲, 不限幅会主导 Viterbi 度量
+    CODED_SOFT_CLIP = 1.0
+
     def __init__(self, config: Optional[DemodulatorConfig] = None):
         self.config = config or DemodulatorConfig()
         self._update_parameters()
@@ -59,46 +113,47 @@ class BLEDemodulator:
         """更新内部参数"""
         config = self.config
 
+        if config.sync_backend not in SYNC_BACKENDS:
+            raise ValueError(f"不支持的同步检测后端: {config.sync_backend} (支持 {SYNC_BACKENDS})")
+
+        # LE Coded PHY (数据段的 S 由接收到的 CI 决定, 这里只区分是否编码)
+        self.coded = coded_spreading(config.phy_mode) is not None
+
         # 符号率
         if config.phy_mode == BLEPhyMode.LE_2M:
             self.symbol_rate = 2e6
         else:
             self.symbol_rate = 1e6
 
-        # 每符号采样数
-        self.samples_per_symbol = int(config.sample_rate / self.symbol_rate)
+        # 每符号采样数: 采样率非符号率整数倍或过高时, 先重采样到内部采样率
+        self.resample_plan = plan_resampling(
+            config.sample_rate, self.symbol_rate, config.max_samples_per_symbol
+        )
+        self.samples_per_symbol = self.resample_plan.samples_per_symbol
+        self.sample_rate = self.resample_plan.internal_rate
 
         # 生成接入地址比特序列用于相关检测
         self._generate_access_address_pattern()
 
+        # 最长数据包的符号数 (PDU 257 字节; Coded PHY 按 S=8)
+        if self.coded:
+            self.max_packet_symbols = coded_packet_length(2 + 255, 8)
+        else:
+            self.max_packet_symbols = len(self.sync_pattern) + (2 + 255 + 3) * 8
+
         # 生成高斯匹配滤波器
         self._generate_gaussian_filter()
 
     def _generate_access_address_pattern(self):
         """生成接入地址比特模式"""
         aa = self.config.access_address
-        bits = []
-        for i in range(32):
-            bits.append((aa >> i) & 1)
-        self.access_address_bits = np.array(bits, dtype=np.uint8)
+        self.access_address_bits = int_to_bits(aa, 32)
 
-        # 生成前导码 + 接入地址的匹配模式
+        # 前导码 + 接入地址的匹配模式 (Coded PHY: 前导码 + FEC 块 1 中接入地址部分的编码符号)
         # BLE 规范: 前导码取决于接入地址的 LSB
         # - 如果 AA LSB = 0, 前导码 = 01010101 (0x55)
         # - 如果 AA LSB = 1, 前导码 = 10101010 (0xAA)
-        aa_lsb = aa & 1
-        if self.config.phy_mode == BLEPhyMode.LE_2M:
-            if aa_lsb == 0:
-                preamble = np.array([0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1], dtype=np.uint8)
-            else:
-                preamble = np.array([1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0], dtype=np.uint8)
-        else:
-            if aa_lsb == 0:
-                preamble = np.array([0, 1, 0, 1, 0, 1, 0, 1], dtype=np.uint8)
-            else:
-                preamble = np.array([1, 0, 1, 0, 1, 0, 1, 0], dtype=np.uint8)
-
-        self.sync_pattern = np.concatenate([preamble, self.access_address_bits])
+        self.sync_pattern = sync_pattern(aa, self.config.phy_mode)
 
     def _generate_gaussian_filter(self):
         """生成高斯匹配滤波器 (用于接收端)
@@ -108,28 +163,13 @@ class BLEDemodulator:
         - 对于 BT=0.5，脉冲会扩展到约 2 个符号周期
 
         匹配滤波器应该匹配这个高斯脉冲形状。
+        滤波器由 pulse.gaussian_matched_filter 生成并在进程内缓存。
         """
-        config = self.config
-        sps = self.samples_per_symbol
-        bt = config.bt
-
-        # 滤波器长度 (覆盖 3 个符号周期以捕获完整脉冲)
-        filter_span = 3
-        filter_len = sps * filter_span
-
-        # 时间轴 (以符号周期为单位)
-        t = np.linspace(-filter_span/2, filter_span/2, filter_len)
-
-        # 高斯脉冲
-        # BT 积定义: B * T = bt, 其中 B 是 3dB 带宽, T 是符号周期
-        # 高斯函数: g(t) = exp(-t^2 / (2*sigma^2))
-        # 其中 sigma = sqrt(ln(2)) / (2*pi*B) = sqrt(ln(2)) / (2*pi*bt/T)
-        # 简化后: sigma = sqrt(ln(2)) / (2*pi*bt) (以符号周期为单位)
-        sigma = np.sqrt(np.log(2)) / (2 * np.pi * bt)
-        gaussian = np.exp(-t**2 / (2 * sigma**2))
-
-        # 归一化为单位能量
-        self.gaussian_filter = gaussian / np.sqrt(np.sum(gaussian**2))
+        # 滤波器长度覆盖 3 个符号周期以捕获完整脉冲
+        self.gaussian_filter = gaussian_matched_filter(
+            self.samples_per_symbol, self.config.bt, filter_span=3
+        )
+        self._filters = {}  # 按精度缓存的滤波器系数
 
         # 生成用于相关同步的频率脉冲
         self._generate_preamble_template()
@@ -165,7 +205,7 @@ class BLEDemodulator:
         """
         # 差分相位
         phase_diff = np.angle(signal[1:] * np.conj(signal[:-1]))
-        return np.concatenate([[0], phase_diff])
+        return np.concatenate([np.zeros(1, dtype=phase_diff.dtype), phase_diff])
 
     def _matched_filter(self, signal: np.ndarray) -> np.ndarray:
         """
@@ -180,13 +220,21 @@ class BLEDemodulator:
         Returns:
             滤波后信号
         """
-        if self.config.use_matched_filter:
-            # 高斯匹配滤波器 - 最优 SNR
-            return np.convolve(signal, self.gaussian_filter, mode='same')
-        else:
-            # 简单移动平均 (兼容模式)
-            h = np.ones(self.samples_per_symbol) / self.samples_per_symbol
-            return np.convolve(signal, h, mode='same')
+        return np.convolve(signal, self._filter_taps(signal.dtype), mode='same')
+
+    def _filter_taps(self, dtype: np.dtype) -> np.ndarray:
+        """获取与信号精度一致的匹配滤波器系数"""
+        taps = self._filters.get(dtype)
+        if taps is None:
+            if self.config.use_matched_filter:
+                # 高斯匹配滤波器 - 最优 SNR
+                taps = self.gaussian_filter
+            else:
+                # 简单移动平均 (兼容模式)
+                taps = np.ones(self.samples_per_symbol) / self.samples_per_symbol
+            taps = taps.astype(dtype, copy=False)
+            self._filters[dtype] = taps
+        return taps
 
     def _symbol_timing_recovery(self, signal: np.ndarray) -> Tuple[np.ndarray, float]:
         """
@@ -232,33 +280,31 @@ class BLEDemodulator:
             接入地址起始位置 (-1 表示未找到)
         """
         pattern = self.sync_pattern
-        pattern_nrz = 2 * pattern.astype(np.float64) - 1
-        bits_nrz = 2 * bits.astype(np.float64) - 1
 
-        # 相关检测
-        correlation = np.correlate(bits_nrz, pattern_nrz, mode='valid')
+        # 相关检测: 比特并行后端由汉明距离得到相同的 NRZ 相关值 (L - 2 * 错误数)
+        if self.config.sync_backend == 'bitwise':
+            correlation = len(pattern) - 2 * sync_word_errors(bits, pattern)
+        else:
+            pattern_nrz = 2 * pattern.astype(np.float64) - 1
+            bits_nrz = 2 * bits.astype(np.float64) - 1
+            correlation = np.correlate(bits_nrz, pattern_nrz, mode='valid')
 
         # 寻找峰值
-        threshold = len(pattern) * 0.8  # 80% 匹配阈值
+        threshold = len(pattern) * (self.CODED_SYNC_THRESHOLD if self.coded else self.SYNC_THRESHOLD)
         peaks = np.where(correlation > threshold)[0]
 
         if len(peaks) > 0:
+            if self.coded:
+                # 阈值放宽后首个过门限点可能在主峰之前, 在一个 S=8 图样内取最大值
+                first = peaks[0]
+                return first + int(np.argmax(correlation[first:first + 8]))
             return peaks[0]
 
         return -1
 
     def _remove_whitening(self, bits: np.ndarray, channel: int) -> np.ndarray:
-        """去白化"""
-        # 使用 BLEPacket 中的白化函数
-        lfsr = (channel & 0x3F) | 0x40
-
-        result = np.zeros(len(bits), dtype=np.uint8)
-        for i in range(len(bits)):
-            result[i] = bits[i] ^ (lfsr & 1)
-            feedback = ((lfsr >> 6) ^ (lfsr >> 3)) & 1
-            lfsr = ((lfsr << 1) | feedback) & 0x7F
-
-        return result
+        """去白化 (与白化相同, 使用共享的白化序列缓存)"""
+        return apply_whitening(bits, channel)
 
     def _check_crc(self, data: bytes) -> Tuple[bool, int]:
         """
@@ -273,48 +319,17 @@ class BLEDemodulator:
         if len(data) < 3:
             return False, 0
 
-        # PDU 数据 (不含 CRC)
-        pdu = data[:-3]
-
         # 接收到的 CRC
         received_crc = data[-3] | (data[-2] << 8) | (data[-1] << 16)
 
-        # 计算 CRC (MATLAB 兼容方法)
-        # 1. 将字节转为比特流 (LSB first per byte)
-        bits = []
-        for byte in pdu:
-            for i in range(8):
-                bits.append((byte >> i) & 1)
-
-        # 2. MSB-first 直接方法 CRC 计算
-        poly = 0x00065B
-        crc = 0x555555  # 初始值
-
-        for bit in bits:
-            msb = (crc >> 23) & 1
-            crc = (crc << 1) & 0xFFFFFF
-            if msb ^ bit:
-                crc ^= poly
-
-        # 3. Bit reverse CRC 输出
-        crc_rev = 0
-        for i in range(24):
-            if crc & (1 << i):
-                crc_rev |= (1 << (23 - i))
-
-        calculated_crc = crc_rev
+        # 计算 CRC (查表法, 见 crc.crc24)
+        calculated_crc = crc24(data[:-3], self.config.crc_init)
 
         return calculated_crc == received_crc, calculated_crc
 
     def _bits_to_bytes(self, bits: np.ndarray) -> bytes:
-        """比特转字节 (LSB first)"""
-        result = []
-        for i in range(0, len(bits) - 7, 8):
-            byte = 0
-            for j in range(8):
-                byte |= (bits[i + j] << j)
-            result.append(byte)
-        return bytes(result)
+        """比特转字节 (LSB first, 丢弃末尾不完整的字节)"""
+        return bits_to_bytes(bits).tobytes()
 
     def _estimate_frequency_offset(self, signal: np.ndarray) -> float:
         """
@@ -331,13 +346,13 @@ class BLEDemodulator:
         # 使用自相关法估计频偏
         autocorr = np.sum(signal[1:] * np.conj(signal[:-1]))
         phase_diff = np.angle(autocorr)
-        freq_offset = phase_diff * self.config.sample_rate / (2 * np.pi)
+        freq_offset = phase_diff * self.sample_rate / (2 * np.pi)
         return freq_offset
 
     def _compensate_frequency_offset(self, signal: np.ndarray, freq_offset: float) -> np.ndarray:
         """补偿频偏"""
-        t = np.arange(len(signal)) / self.config.sample_rate
-        return signal * np.exp(-1j * 2 * np.pi * freq_offset * t)
+        t = np.arange(len(signal)) / self.sample_rate
+        return signal * phasor(-2 * np.pi * float(freq_offset) * t, signal.dtype)
 
     def _frequency_tracking(self, signal: np.ndarray, initial_offset: float) -> np.ndarray:
         """
@@ -361,13 +376,13 @@ class BLEDemodulator:
         # PLL 参数
         # 带宽设置为符号率的 1%
         bw = self.symbol_rate * 0.01
-        alpha = 2 * np.pi * bw / self.config.sample_rate  # 比例增益
+        alpha = 2 * np.pi * bw / self.sample_rate  # 比例增益
         beta = alpha ** 2 / 2  # 积分增益
 
         # 状态变量
         phase = 0
         freq = 0
-        output = np.zeros(n, dtype=complex)
+        output = np.zeros(n, dtype=signal.dtype)
 
         for i in range(n):
             # 补偿当前相位
@@ -395,6 +410,7 @@ class BLEDemodulator:
         解调 BLE 信号 (优化版)
 
         处理流程:
+        0. 精度转换和重采样 (采样率非符号率整数倍或过高时)
         1. RSSI 估计
         2. 频偏估计和补偿
         3. 频偏跟踪 (可选)
@@ -409,6 +425,26 @@ class BLEDemodulator:
         Returns:
             解调结果
         """
+        return self._demodulate(self._prepare_signal(signal))
+
+    def _prepare_signal(self, signal: np.ndarray) -> np.ndarray:
+        """
+        统一数值精度并重采样到内部采样率
+
+        Args:
+            signal: 外部采样率的 IQ 信号
+
+        Returns:
+            内部采样率 (self.sample_rate) 的 IQ 信号
+        """
+        signal = np.asarray(signal, dtype=resolve_dtype(self.config.dtype, signal))
+        plan = self.resample_plan
+        if plan.required:
+            signal = resample(signal, plan.up, plan.down)
+        return signal
+
+    def _demodulate(self, signal: np.ndarray) -> DemodulationResult:
+        """解调内部采样率的 IQ 信号 (见 demodulate)"""
         config = self.config
 
         # 1. 估计 RSSI
@@ -436,6 +472,289 @@ class BLEDemodulator:
         # 7. 判决
         bits = (samples > 0).astype(np.uint8)
 
+        return self._decode_symbols(samples, bits, rssi, freq_offset, timing_offset)
+
+    def demodulate_batch(self, signals: np.ndarray,
+                         return_bits: bool = False) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        批量解调 (每行一个等长的 IQ 信号)
+
+        与逐行调用 demodulate 的处理流程相同 (结果一致, 仅有浮点舍入差异), 但每一步对所有行一次完成:
+        RSSI、频偏估计、FM 解调、匹配滤波、符号定时 (按行选采样相位)、同步相关 (按 sync_backend: FFT 或比特并行)、
+        去白化和 CRC 校验 (crc24_batch) 均为整个矩阵的向量化运算。
+        频偏补偿合并到 FM 解调的共轭积中 (每行一个常数相量); 启用频偏跟踪时仍逐行补偿和跟踪。
+        LE Coded PHY 的 Viterbi 译码把各行堆叠后一次完成 (FEC 块 2 按 S 和 PDU 长度分组)。
+
+        Args:
+            signals: IQ 信号矩阵 (N, 采样数)
+            return_bits: 同时返回符号判决矩阵
+
+        Returns:
+            结构化数组 (N,), dtype 为 DEMODULATION_RESULT_DTYPE;
+            return_bits=True 时返回 (结构化数组, 符号判决矩阵 (N, 最大符号数)),
+            每行的有效符号数为 num_symbols 字段, 之后补零
+        """
+        signals = np.atleast_2d(signals)
+
+        # 符号判决之前按采样数分块, 中间数组保持在缓存容量附近
+        rows_per_block = max(1, self.BATCH_BLOCK_SAMPLES // max(signals.shape[1], 1))
+        blocks = [self._demodulate_batch(self._prepare_signal(signals[start:start + rows_per_block]))
+                  for start in range(0, len(signals), rows_per_block)]
+        if not blocks:
+            blocks = [self._demodulate_batch(self._prepare_signal(signals))]
+        results, samples, bits = (np.concatenate(arrays) for arrays in zip(*blocks))
+
+        # 符号判决之后的矩阵只有信号的 1/sps, 所有行一起译码 (Coded PHY 的 Viterbi 按行堆叠)
+        if self.coded:
+            self._decode_coded_batch(results, samples, bits)
+        else:
+            self._decode_symbols_batch(results, bits)
+
+        if return_bits:
+            return results, bits
+        return results
+
+    def _demodulate_batch(self, signals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量解调内部采样率的 IQ 信号矩阵直到符号判决 (见 demodulate_batch)
+
+        Returns:
+            (结构化数组 (同步和译码字段待填), 符号软值矩阵, 符号判决矩阵)
+        """
+        config = self.config
+        num_rows, num_samples = signals.shape
+        sps = self.samples_per_symbol
+
+        results = np.zeros(num_rows, dtype=DEMODULATION_RESULT_DTYPE)
+        results['sync_position'] = -1
+
+        # 1. RSSI
+        power = signals.real ** 2 + signals.imag ** 2
+        results['rssi'] = 10 * np.log10(np.mean(power, axis=1) + 1e-10)
+
+        # 2. 频偏估计 (自相关法, 按行)
+        products = signals[:, 1:] * np.conj(signals[:, :-1])
+        freq_offset = np.angle(np.sum(products, axis=1)) * self.sample_rate / (2 * np.pi)
+        results['freq_offset'] = freq_offset
+
+        if config.freq_tracking:
+            # 3. 频偏补偿和跟踪 (逐行), 4. FM 解调
+            t = np.arange(num_samples) / self.sample_rate
+            compensated = signals * phasor(-2 * np.pi * freq_offset[:, np.newaxis] * t, signals.dtype)
+            compensated = np.stack([
+                self._frequency_tracking(row, offset) for row, offset in zip(compensated, freq_offset)
+            ])
+            phase_diff = np.angle(compensated[:, 1:] * np.conj(compensated[:, :-1]))
+        else:
+            # 补偿频偏后相邻采样的共轭积 = 补偿前的共轭积 * exp(-j * 2 pi * 频偏 / 采样率),
+            # 每行只需乘一个常数相量, 无需逐采样生成补偿相量
+            rotation = phasor(-2 * np.pi * freq_offset / self.sample_rate, signals.dtype)
+            phase_diff = np.angle(products * rotation[:, np.newaxis])
+        freq_signal = np.concatenate([np.zeros((num_rows, 1), dtype=phase_diff.dtype), phase_diff], axis=1)
+
+        # 5. 匹配滤波 (与 np.convolve mode='same' 对齐: 偶数长度滤波器中心偏左一个采样)
+        taps = self._filter_taps(freq_signal.dtype)
+        filtered = ndimage.convolve1d(freq_signal, taps, axis=1, mode='constant', origin=len(taps) % 2 - 1)
+
+        # 6. 符号定时: 每行取能量最大的采样相位
+        num_symbols = num_samples // sps
+        if num_symbols < 4:
+            phases = np.full(num_rows, sps // 2)
+            results['timing_offset'] = 0.5
+        else:
+            frames = filtered[:, :num_symbols * sps].reshape(num_rows, num_symbols, sps)
+            phases = np.argmax(np.sum(frames ** 2, axis=1), axis=1)
+            results['timing_offset'] = phases / sps
+
+        max_symbols = -(-num_samples // sps)
+        padded = np.zeros((num_rows, max_symbols * sps), dtype=filtered.dtype)
+        padded[:, :num_samples] = filtered
+        samples = np.take_along_axis(padded.reshape(num_rows, max_symbols, sps),
+                                     phases[:, np.newaxis, np.newaxis], axis=2)[:, :, 0]
+        lengths = (num_samples - phases + sps - 1) // sps
+        results['num_symbols'] = lengths
+
+        # 7. 判决
+        bits = (samples > 0).astype(np.uint8)
+
+        return results, samples, bits
+
+    def _sync_correlation_batch(self, bits: np.ndarray) -> np.ndarray:
+        """
+        批量同步相关 (整数 NRZ 相关值, 两种后端与 _detect_access_address 相同)
+
+        Args:
+            bits: 符号判决矩阵 (N, 符号数)
+
+        Returns:
+            相关值 (N, 符号数 - 图样长度 + 1)
+        """
+        pattern = self.sync_pattern
+        num_rows, max_symbols = bits.shape
+        num_positions = max_symbols - len(pattern) + 1
+
+        if self.config.sync_backend == 'bitwise':
+            # 各行首尾相接为一个比特流, 跨行的窗口丢弃
+            errors = np.zeros(num_rows * max_symbols, dtype=np.int32)
+            flat = sync_word_errors(bits.ravel(), pattern)
+            errors[:len(flat)] = flat
+            return len(pattern) - 2 * errors.reshape(num_rows, max_symbols)[:, :num_positions]
+
+        # FFT 相关, 相关值为整数, 取整后与 np.correlate 相同
+        pattern_nrz = 2 * pattern.astype(np.float64) - 1
+        bits_nrz = 2 * bits.astype(np.float64) - 1
+        return np.rint(scipy_signal.fftconvolve(bits_nrz, pattern_nrz[np.newaxis, ::-1],
+                                                mode='valid', axes=1))
+
+    def _detect_sync_batch(self, bits: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量检测同步图样 (逐行结果与 _detect_access_address 相同)
+
+        Args:
+            bits: 符号判决矩阵 (N, 符号数), 每行只有前 lengths 个有效
+            lengths: 每行的有效符号数
+
+        Returns:
+            (是否同步 (N,), 同步图样起始位置 (N,), 未同步的行为 0)
+        """
+        pattern_length = len(self.sync_pattern)
+        correlation = self._sync_correlation_batch(bits)
+        positions = np.arange(correlation.shape[1])
+        threshold = pattern_length * (self.CODED_SYNC_THRESHOLD if self.coded else self.SYNC_THRESHOLD)
+        valid = positions <= (lengths - pattern_length)[:, np.newaxis]
+        above = (correlation > threshold) & valid
+        first = np.argmax(above, axis=1)
+        if self.coded:
+            # 阈值放宽后首个过门限点可能在主峰之前, 在一个 S=8 图样内取最大值
+            window = np.minimum(first[:, np.newaxis] + np.arange(8), correlation.shape[1] - 1)
+            peak = np.where(np.take_along_axis(valid, window, axis=1),
+                            np.take_along_axis(correlation, window, axis=1), -np.inf)
+            first = first + np.argmax(peak, axis=1)
+        return above.any(axis=1), first
+
+    def _decode_symbols_batch(self, results: np.ndarray, bits: np.ndarray):
+        """批量: 同步检测, 去白化, 解析 PDU 长度, CRC 校验 (结果写入 results)"""
+        config = self.config
+        num_rows, max_symbols = bits.shape
+        lengths = results['num_symbols']
+        pattern_length = len(self.sync_pattern)
+        if num_rows == 0 or max_symbols < pattern_length:
+            return
+
+        sync_found, aa_pos = self._detect_sync_batch(bits, lengths)
+        results['sync_found'] = sync_found
+        results['sync_position'] = np.where(sync_found, aa_pos, -1)
+
+        # 数据段 (前导码 + 接入地址之后) 对齐到每行的第 0 列
+        data_start = aa_pos + pattern_length
+        data_length = np.where(sync_found, np.maximum(lengths - data_start, 0), 0)
+        width = int(data_length.max()) // 8 * 8
+        if width < 16:
+            return
+        index = data_start[:, np.newaxis] + np.arange(width)
+        data_bits = np.take_along_axis(bits, np.minimum(index, max_symbols - 1), axis=1)
+        if config.whitening:
+            data_bits = self._remove_whitening(data_bits, config.channel)
+        data_bytes = bits_to_bytes(data_bits)
+
+        # PDU 长度和 CRC
+        available = data_length // 8
+        has_header = available >= 2
+        total_length = data_bytes[:, 1].astype(np.int64) + 2 + 3
+        complete = has_header & (available >= total_length)
+        crc_valid = complete & check_crc24_batch(data_bytes, np.where(complete, total_length, 0),
+                                                 config.crc_init)
+        results['crc_valid'] = crc_valid
+        results['success'] = crc_valid
+        results['pdu_length'] = np.where(complete, total_length - 3, np.where(has_header, 2, 0))
+
+    def _decode_coded_batch(self, results: np.ndarray, samples: np.ndarray, bits: np.ndarray):
+        """
+        批量: LE Coded PHY 译码 (逐行结果与 _decode_coded 相同, 结果写入 results)
+
+        同步检测对整个矩阵一次完成; Viterbi 译码把可堆叠的行一次译码:
+        FEC 块 1 (S=8) 所有同步的行一起, PDU 头部按 S 分组, 整个 FEC 块 2 按 (S, PDU 长度) 分组
+        """
+        config = self.config
+        num_rows, max_symbols = bits.shape
+        lengths = results['num_symbols']
+        if num_rows == 0 or max_symbols < len(self.sync_pattern):
+            return
+
+        # 1. 同步
+        sync_found, sync_pos = self._detect_sync_batch(bits, lengths)
+        results['sync_found'] = sync_found
+        results['sync_position'] = np.where(sync_found, sync_pos, -1)
+
+        # 软值归一化并限幅 (每行按有效符号的幅度中位数; 各行有效符号数至多相差 1)
+        scale = np.empty(num_rows, dtype=samples.dtype)
+        for length in np.unique(lengths):
+            rows = lengths == length
+            scale[rows] = np.median(np.abs(samples[rows, :length]), axis=1) + 1e-12
+        soft = np.clip(samples / scale[:, np.newaxis], -self.CODED_SOFT_CLIP, self.CODED_SOFT_CLIP)
+
+        # 2. FEC 块 1: 接入地址 (32) + CI (2) + TERM1
+        block1_start = sync_pos + len(CODED_PREAMBLE)
+        block1_symbols = FEC_BLOCK1_BITS * 8
+        block2_start = block1_start + block1_symbols
+        rows = np.flatnonzero(sync_found & (block2_start <= lengths))
+        if len(rows) == 0:
+            return
+        block1_bits = decode_fec_block(self._symbol_windows(soft, rows, block1_start, block1_symbols), 8)
+        ci = block1_bits[:, 32] | (block1_bits[:, 33] << 1)
+        spreading = np.zeros(num_rows, dtype=np.int64)
+        spreading[rows] = np.array([spreading_from_ci(value) or 0 for value in range(4)])[ci]
+        results['spreading'] = spreading
+
+        # 3. PDU 头部 (16 比特), 不终止, 多译码一段回溯余量; 按 S 分组
+        available = lengths - block2_start
+        total_length = np.zeros(num_rows, dtype=np.int64)
+        for s in (2, 8):
+            header_symbols = (16 + self.CODED_HEADER_MARGIN) * s
+            group = np.flatnonzero((spreading == s) & (available >= header_symbols))
+            if len(group) == 0:
+                continue
+            header_soft = self._symbol_windows(soft, group, block2_start, header_symbols)
+            header_bits = viterbi_decode(pattern_demap(header_soft, s), terminated=False)[:, :16]
+            if config.whitening:
+                header_bits = self._remove_whitening(header_bits, config.channel)
+            total_length[group] = 2 + bits_to_bytes(header_bits)[:, 1].astype(np.int64) + 3
+            results['pdu_length'][group] = 2
+
+        # 4. 整个 FEC 块 2: PDU + CRC + TERM2; 按 (S, PDU 长度) 分组
+        block2_symbols = (total_length * 8 + TERM_LENGTH) * spreading
+        complete = (total_length > 0) & (available >= block2_symbols)
+        for s, length in np.unique(np.stack([spreading[complete], total_length[complete]], axis=1), axis=0):
+            group = np.flatnonzero(complete & (spreading == s) & (total_length == length))
+            data_soft = self._symbol_windows(soft, group, block2_start, (length * 8 + TERM_LENGTH) * s)
+            data_bits = decode_fec_block(data_soft, s)
+            if config.whitening:
+                data_bits = self._remove_whitening(data_bits, config.channel)
+            crc_valid = check_crc24_batch(bits_to_bytes(data_bits), init=config.crc_init)
+            results['crc_valid'][group] = crc_valid
+            results['success'][group] = crc_valid
+            results['pdu_length'][group] = length - 3
+
+    @staticmethod
+    def _symbol_windows(matrix: np.ndarray, rows: np.ndarray, starts: np.ndarray, width: int) -> np.ndarray:
+        """取 matrix 中 rows 各行从 starts[行] 开始的 width 个符号, 返回 (len(rows), width)"""
+        index = starts[rows, np.newaxis] + np.arange(width)
+        return np.take_along_axis(matrix[rows], index, axis=1)
+
+    def _decode_symbols(self, samples: np.ndarray, bits: np.ndarray, rssi: float,
+                        freq_offset: float, timing_offset: float) -> DemodulationResult:
+        """
+        符号判决之后: 同步检测, 去白化, 解析 PDU, CRC 校验 (Coded PHY 见 _decode_coded)
+
+        Args:
+            samples: 符号软值 (匹配滤波后的瞬时频率)
+            bits: 符号硬判决
+        """
+        config = self.config
+
+        if self.coded:
+            return self._decode_coded(samples, bits, rssi, freq_offset, timing_offset)
+
         # 7. 检测接入地址
         aa_pos = self._detect_access_address(bits)
 
@@ -531,32 +850,238 @@ class BLEDemodulator:
             access_address=config.access_address
         )
 
-    def find_packets(self, signal: np.ndarray, max_packets: int = 10) -> List[DemodulationResult]:
+    def _decode_coded(self, samples: np.ndarray, bits: np.ndarray, rssi: float,
+                      freq_offset: float, timing_offset: float) -> DemodulationResult:
         """
-        在信号中查找多个数据包
+        LE Coded PHY 译码 (符号判决之后)
+
+        1. 前导码 + 编码接入地址同步
+        2. FEC 块 1 (S=8) Viterbi 译码, 取 CI 得到 FEC 块 2 的 S
+        3. 译码 FEC 块 2 开头 (PDU 头部 + 回溯余量) 得到 PDU 长度
+        4. 按长度译码整个 FEC 块 2 (以 TERM2 终止), 去白化, CRC 校验
 
         Args:
-            signal: IQ 信号
-            max_packets: 最大数据包数量
+            samples: 符号软值 (匹配滤波后的瞬时频率)
+            bits: 符号硬判决
+        """
+        config = self.config
+
+        def result(sync_found: bool, pdu: bytes = b'', crc_valid: bool = False,
+                   spreading: int = 0) -> DemodulationResult:
+            return DemodulationResult(
+                success=crc_valid,
+                bits=bits,
+                pdu=pdu,
+                crc_valid=crc_valid,
+                rssi=rssi,
+                freq_offset=freq_offset,
+                timing_offset=timing_offset,
+                sync_found=sync_found,
+                access_address=config.access_address if sync_found else 0,
+                spreading=spreading
+            )
+
+        # 1. 同步
+        sync_pos = self._detect_access_address(bits)
+        if sync_pos < 0:
+            return result(False)
+
+        # 软值归一化并限幅 (Viterbi 度量只与相对大小有关)
+        scale = np.median(np.abs(samples)) + 1e-12
+        soft = np.clip(samples / scale, -self.CODED_SOFT_CLIP, self.CODED_SOFT_CLIP)
+
+        # 2. FEC 块 1: 接入地址 (32) + CI (2) + TERM1
+        block1_start = sync_pos + len(CODED_PREAMBLE)
+        block1_symbols = FEC_BLOCK1_BITS * 8
+        block1 = soft[block1_start:block1_start + block1_symbols]
+        if len(block1) < block1_symbols:
+            return result(True)
+        block1_bits = decode_fec_block(block1, 8)
+        spreading = spreading_from_ci(int(block1_bits[32]) | (int(block1_bits[33]) << 1))
+        if spreading is None:
+            return result(True)
+
+        # 3. PDU 头部 (16 比特), 不终止, 多译码一段回溯余量
+        block2 = soft[block1_start + block1_symbols:]
+        header_symbols = (16 + self.CODED_HEADER_MARGIN) * spreading
+        if len(block2) < header_symbols:
+            return result(True, spreading=spreading)
+        header_bits = viterbi_decode(pattern_demap(block2[:header_symbols], spreading), terminated=False)[:16]
+        if config.whitening:
+            header_bits = self._remove_whitening(header_bits, config.channel)
+        header = self._bits_to_bytes(header_bits)
+
+        # 4. 整个 FEC 块 2: PDU + CRC + TERM2
+        total_length = 2 + header[1] + 3
+        block2_symbols = (total_length * 8 + TERM_LENGTH) * spreading
+        if len(block2) < block2_symbols:
+            return result(True, pdu=header, spreading=spreading)
+
+        data_bits = decode_fec_block(block2[:block2_symbols], spreading)
+        if config.whitening:
+            data_bits = self._remove_whitening(data_bits, config.channel)
+        pdu_with_crc = self._bits_to_bytes(data_bits)
+
+        crc_valid, _ = self._check_crc(pdu_with_crc)
+        return result(True, pdu=pdu_with_crc[:-3], crc_valid=crc_valid, spreading=spreading)
+
+    def find_packets(self, signal: np.ndarray, max_packets: Optional[int] = None,
+                     include_failed: bool = False) -> List[DemodulationResult]:
+        """
+        在整段采集中查找全部数据包 (单遍)
+
+        1. 整段信号只做一次重采样、FM 解调和匹配滤波
+        2. 去除局部直流 (频偏) 后按每个采样相位硬判决, 与同步图样相关, 得到全部同步候选
+        3. 每个候选由已知同步图样最小二乘估计鉴频直流 (频偏), 只译码一次
+        4. 成功解调的数据包区间内的其他候选直接跳过
+
+        Args:
+            signal: IQ 信号 (任意长度的采集)
+            max_packets: 最大数据包数量, None 表示不限
+            include_failed: 同时返回找到同步但 CRC 错误的数据包
 
         Returns:
-            解调结果列表
+            解调结果列表 (按时间顺序, sample_offset 为数据包在输入信号中的起始采样)
         """
-        results = []
-        offset = 0
-        window_size = int(self.config.sample_rate * 0.5e-3)  # 0.5ms 窗口
+        signal = self._prepare_signal(signal)
+        filtered = self._matched_filter(self._fm_demodulate(signal))
 
-        while offset < len(signal) - window_size and len(results) < max_packets:
-            window = signal[offset:offset + window_size]
-            result = self.demodulate(window)
+        results = []
+        next_free = 0
+        for start in self._sync_candidates(filtered):
+            if start < next_free:
+                continue
 
-            if result.success:
+            result, end = self._decode_candidate(signal, filtered, start)
+            if result.success or include_failed:
                 results.append(result)
-                # 跳过这个数据包
-                packet_samples = len(result.bits) * self.samples_per_symbol
-                offset += packet_samples
-            else:
-                # 向前滑动
-                offset += self.samples_per_symbol * 8
+                if max_packets is not None and len(results) >= max_packets:
+                    break
+            next_free = end
 
         return results
+
+    def _sync_candidates(self, filtered: np.ndarray) -> np.ndarray:
+        """
+        同步候选: 滤波后鉴频信号中同步图样第一个符号的采样位置 (内部采样率)
+
+        每个采样相位的符号序列分别与同步图样相关, 相关值交织回采样率后,
+        过门限的相邻位置 (间隔不超过 1 个符号) 合并为一个候选, 取相关峰。
+        """
+        sps = self.samples_per_symbol
+        pattern_nrz = 2 * self.sync_pattern.astype(np.float32) - 1
+        pattern_length = len(pattern_nrz)
+        num_symbols = len(filtered) // sps
+        if num_symbols < pattern_length:
+            return np.zeros(0, dtype=np.intp)
+
+        # 局部直流 (频偏引起的鉴频输出偏移): 向后一个同步图样长度的滑动平均,
+        # 同步位置处的均值窗口正好覆盖同步图样, 不受数据包之前噪声段的影响
+        usable = filtered[:num_symbols * sps]
+        window = pattern_length * sps
+        local_mean = ndimage.uniform_filter1d(usable, size=window, mode='nearest', origin=-(window // 2))
+
+        decisions = np.where(usable > local_mean, np.float32(1), np.float32(-1)).reshape(num_symbols, sps)
+
+        # 所有采样相位 (列) 一次 FFT 相关
+        correlation = scipy_signal.fftconvolve(decisions, pattern_nrz[::-1, np.newaxis], mode='valid', axes=0)
+        correlation = correlation.ravel()
+
+        threshold = pattern_length * (self.CODED_SYNC_THRESHOLD if self.coded else self.SYNC_THRESHOLD)
+        hits = np.flatnonzero(correlation > threshold)
+        if len(hits) == 0:
+            return hits
+
+        # 硬判决相关峰通常在相邻几个采样相位上取相同的值,
+        # 在每组过门限位置中按软值相关 (匹配滤波输出与图样) 取最大, 即眼图张开最大的采样相位
+        symbol_offsets = np.arange(pattern_length) * sps
+        candidates = []
+        for group in np.split(hits, np.flatnonzero(np.diff(hits) > sps) + 1):
+            soft = filtered[group[:, np.newaxis] + symbol_offsets] @ pattern_nrz
+            candidates.append(group[np.argmax(soft)])
+        return np.array(candidates, dtype=np.intp)
+
+    def _decode_candidate(self, signal: np.ndarray, filtered: np.ndarray,
+                          start: int) -> Tuple[DemodulationResult, int]:
+        """
+        译码一个同步候选
+
+        Args:
+            signal: 内部采样率的 IQ 信号 (用于 RSSI)
+            filtered: 匹配滤波后的鉴频信号
+            start: 同步图样第一个符号的采样位置
+
+        Returns:
+            (解调结果, 数据包结束位置 (内部采样率))
+        """
+        sps = self.samples_per_symbol
+        pattern_nrz = 2 * self.sync_pattern.astype(np.float64) - 1
+        pattern_length = len(pattern_nrz)
+
+        samples = filtered[start::sps][:self.max_packet_symbols].astype(np.float64)
+
+        # 最小二乘: 同步段 = 幅度 * 图样 + 直流
+        sync = samples[:pattern_length]
+        centered = pattern_nrz - pattern_nrz.mean()
+        amplitude = np.dot(sync - sync.mean(), centered) / np.dot(centered, centered)
+        dc = sync.mean() - amplitude * pattern_nrz.mean()
+        samples -= dc
+
+        gain = float(np.sum(self._filter_taps(filtered.dtype)))
+        freq_offset = dc / gain * self.sample_rate / (2 * np.pi)
+        bits = (samples > 0).astype(np.uint8)
+        result = self._decode_symbols(samples, bits, 0.0, freq_offset, (start % sps) / sps)
+
+        # 数据包长度 (符号): 成功时按 PDU 长度, 否则只跳过同步图样
+        num_symbols = pattern_length
+        if result.success:
+            if self.coded:
+                num_symbols = coded_packet_length(len(result.pdu), result.spreading)
+            else:
+                num_symbols = pattern_length + (len(result.pdu) + 3) * 8
+        end = start + num_symbols * sps
+
+        packet_start = max(self._packet_start(start), 0)
+        result.bits = bits[:num_symbols]
+        result.rssi = 10 * np.log10(np.mean(np.abs(signal[packet_start:end]) ** 2) + 1e-10)
+        result.sample_offset = int(round(packet_start * self.config.sample_rate / self.sample_rate))
+        return result, end
+
+    def _packet_start(self, sync_position: float) -> float:
+        """同步图样第一个符号的采样位置 (匹配滤波输出) -> 数据包起始采样 (符号起点, 内部采样率)"""
+        return sync_position - self.samples_per_symbol // 2 - 1
+
+    def detect_sync(self, signal: np.ndarray, access_addresses: Optional[List[int]] = None,
+                    threshold: Optional[float] = None) -> List[SyncHit]:
+        """
+        多接入地址同步检测 (软值 FFT 相关, 见 sync.SyncDetector)
+
+        整段信号只做一次 FM 解调和匹配滤波, 所有接入地址在同一遍中搜索。
+        鉴频输出按标称调制指数下的符号幅度限幅。
+
+        Args:
+            signal: IQ 信号
+            access_addresses: 待搜索的接入地址, None 表示配置中的接入地址
+            threshold: 同步门限 (归一化相关系数), None 按 PHY 取默认值
+
+        Returns:
+            同步命中列表 (按时间顺序); position / timing 换算为输入信号中数据包的起始采样
+        """
+        if access_addresses is None:
+            access_addresses = [self.config.access_address]
+
+        signal = self._prepare_signal(signal)
+        filtered = self._matched_filter(self._fm_demodulate(signal))
+
+        # 符号标称幅度: 每采样相位增量 pi * h / sps, 经匹配滤波放大 sum(taps) 倍
+        taps = self._filter_taps(filtered.dtype)
+        amplitude = np.pi * self.NOMINAL_MODULATION_INDEX / self.samples_per_symbol * float(np.sum(taps))
+        detector = SyncDetector(access_addresses, self.config.phy_mode, self.samples_per_symbol,
+                                threshold=threshold, clip_level=amplitude)
+
+        scale = self.config.sample_rate / self.sample_rate
+        hits = detector.detect(filtered)
+        for hit in hits:
+            hit.position = int(round(max(self._packet_start(hit.position), 0) * scale))
+            hit.timing = max(self._packet_start(hit.timing), 0.0) * scale
+        return hits
@@ -0,0 +1,163 @@
+"""
+BLE 数据信道跳频 (信道选择算法)
+
+- CSA#1: unmapped = (last_unmapped + hop_increment) mod 37, 不可用信道按 unmapped mod N 重映射
+- CSA#2 (BLE 5.0): 以连接事件计数器和信道标识 (接入地址高低 16 位异或) 为输入的伪随机数发生器,
+  不可用信道按 (N * prn_e) >> 16 重映射
+
+每个信道映射的可用信道列表和 CSA#1 重映射表只计算一次 (按信道映射缓存),
+跳频序列对连接事件计数器整体向量化计算, 一次调用得到数千个连接事件的信道。
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Tuple, Union
+
+from .cache import readonly
+
+# 数据信道数
+NUM_DATA_CHANNELS = 37
+
+# 全部数据信道可用的信道映射
+CHANNEL_MAP_ALL = (1 << NUM_DATA_CHANNELS) - 1
+
+# 信道映射缓存大小
+CHANNEL_MAP_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=CHANNEL_MAP_CACHE_SIZE)
+def used_channels(channel_map: int) -> np.ndarray:
+    """
+    信道映射中的可用信道 (升序)
+
+    Args:
+        channel_map: 37-bit 信道映射
+
+    Returns:
+        可用信道号数组 (只读)
+    """
+    channels = np.flatnonzero((channel_map >> np.arange(NUM_DATA_CHANNELS)) & 1)
+    return readonly(channels.astype(np.int64))
+
+
+@lru_cache(maxsize=CHANNEL_MAP_CACHE_SIZE)
+def csa1_remap_table(channel_map: int) -> np.ndarray:
+    """
+    CSA#1 重映射表: 未映射信道 -> 实际信道
+
+    Args:
+        channel_map: 37-bit 信道映射
+
+    Returns:
+        (37,) 数组 (只读)
+    """
+    used = used_channels(channel_map)
+    if len(used) == 0:
+        raise ValueError("信道映射中没有可用信道")
+
+    unmapped = np.arange(NUM_DATA_CHANNELS)
+    is_used = ((channel_map >> unmapped) & 1).astype(bool)
+    table = np.where(is_used, unmapped, used[unmapped % len(used)])
+    return readonly(table)
+
+
+def csa1_channel_sequence(num_events: int, hop_increment: int, channel_map: int,
+                          last_unmapped_channel: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    CSA#1 跳频序列
+
+    Args:
+        num_events: 连接事件数
+        hop_increment: 跳频增量 (5-16)
+        channel_map: 37-bit 信道映射
+        last_unmapped_channel: 第一个事件之前的未映射信道
+
+    Returns:
+        (未映射信道, 实际信道), 各为 (num_events,) 数组
+    """
+    steps = np.arange(1, num_events + 1, dtype=np.int64)
+    unmapped = (last_unmapped_channel + steps * hop_increment) % NUM_DATA_CHANNELS
+    return unmapped, csa1_remap_table(channel_map)[unmapped]
+
+
+def channel_identifier(access_address: int) -> int:
+    """CSA#2 信道标识: 接入地址高 16 位与低 16 位异或"""
+    return ((access_address >> 16) ^ access_address) & 0xFFFF
+
+
+def _reverse_byte_table() -> np.ndarray:
+    """字节内比特反转查找表"""
+    values = np.arange(256)
+    table = np.zeros(256, dtype=np.uint32)
+    for i in range(8):
+        table |= ((values >> i) & 1).astype(np.uint32) << (7 - i)
+    return readonly(table)
+
+
+_REVERSE_BYTE = _reverse_byte_table()
+
+
+def csa2_prn(counter: Union[int, np.ndarray], channel_id: int) -> np.ndarray:
+    """
+    CSA#2 伪随机数 prn_e
+
+    prn_s = 3 轮 (PERM: 两个字节分别比特反转; MAM: (17 * x + channel_id) mod 2^16),
+    输入为 counter ^ channel_id; prn_e = prn_s ^ channel_id。
+
+    Args:
+        counter: 连接事件计数器 (16 bit), 标量或数组
+        channel_id: 信道标识
+
+    Returns:
+        prn_e (uint32 数组, 16 bit)
+    """
+    x = (np.asarray(counter, dtype=np.uint32) & 0xFFFF) ^ np.uint32(channel_id)
+    for _ in range(3):
+        # PERM
+        x = _REVERSE_BYTE[x & 0xFF] | (_REVERSE_BYTE[x >> 8] << np.uint32(8))
+        # MAM
+        x = (x * np.uint32(17) + np.uint32(channel_id)) & np.uint32(0xFFFF)
+    return x ^ np.uint32(channel_id)
+
+
+def csa2_channel_sequence(num_events: int, access_address: int, channel_map: int,
+                          start_counter: int = 0) -> np.ndarray:
+    """
+    CSA#2 跳频序列
+
+    Args:
+        num_events: 连接事件数
+        access_address: 连接接入地址
+        channel_map: 37-bit 信道映射
+        start_counter: 第一个连接事件的计数器值 (按 16 bit 回绕)
+
+    Returns:
+        (num_events,) 信道号数组
+    """
+    counters = np.arange(start_counter, start_counter + num_events, dtype=np.int64) & 0xFFFF
+    return csa2_channels(counters, access_address, channel_map)
+
+
+def csa2_channels(counters: Union[int, np.ndarray], access_address: int,
+                  channel_map: int) -> np.ndarray:
+    """
+    CSA#2: 指定连接事件计数器的信道
+
+    Args:
+        counters: 连接事件计数器, 标量或数组
+        access_address: 连接接入地址
+        channel_map: 37-bit 信道映射
+
+    Returns:
+        信道号 (标量输入返回 int, 数组输入返回相同形状的数组)
+    """
+    used = used_channels(channel_map)
+    if len(used) == 0:
+        raise ValueError("信道映射中没有可用信道")
+
+    prn_e = csa2_prn(counters, channel_identifier(access_address)).astype(np.int64)
+    unmapped = prn_e % NUM_DATA_CHANNELS
+    is_used = (channel_map >> unmapped) & 1
+    remapped = used[(len(used) * prn_e) >> 16]
+    channels = np.where(is_used, unmapped, remapped)
+    return int(channels) if channels.ndim == 0 else channels
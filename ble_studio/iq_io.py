@@ -10,6 +10,10 @@ from dataclasses import dataclass
 from enum import Enum
 
 
+# 复数 IQ 信号, 或已定点化的 (I, Q) 整数数组 (如 NCOModulator 输出)
+IQSignal = Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+
+
 class IQFormat(Enum):
     """IQ 数据格式"""
     INTERLEAVED = "interleaved"     # I0 Q0 I1 Q1 I2 Q2 ... (交织)
@@ -55,12 +59,13 @@ class IQExporter:
     def __init__(self, config: Optional[IQExportConfig] = None):
         self.config = config or IQExportConfig()
 
-    def quantize(self, signal: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def quantize(self, signal: IQSignal) -> Tuple[np.ndarray, np.ndarray]:
         """
         将复数 IQ 信号量化为定点数
 
         Args:
-            signal: 复数 IQ 信号 (归一化, 幅度 <= 1)
+            signal: 复数 IQ 信号 (归一化, 幅度 <= 1),
+                    或已定点化的 (I, Q) 整数数组 (直接使用, 不再量化)
 
         Returns:
             (I_quantized, Q_quantized) 量化后的 I/Q 数组
@@ -70,6 +75,17 @@ class IQExporter:
         min_val = -2 ** (cfg.bit_width - 1)     # 有符号最小值 (如 -2048)
         full_scale = 2 ** (cfg.bit_width - 1)   # 满量程缩放因子 (如 2048)
 
+        if isinstance(signal, tuple):
+            # 定点 I/Q: 已是硬件位宽的整数, 只检查范围
+            i_quant, q_quant = (np.asarray(x) for x in signal)
+            if not (np.issubdtype(i_quant.dtype, np.integer) and
+                    np.issubdtype(q_quant.dtype, np.integer)):
+                raise TypeError("定点 I/Q 须为整数数组")
+            for data in (i_quant, q_quant):
+                if len(data) and (data.min() < min_val or data.max() > max_val):
+                    raise ValueError(f"定点 I/Q 超出 {cfg.bit_width} 位有符号范围")
+            return i_quant.astype(np.int32), q_quant.astype(np.int32)
+
         # 提取 I/Q 分量
         i_data = signal.real
         q_data = signal.imag
@@ -111,13 +127,13 @@ class IQExporter:
             value = value & ((1 << cfg.bit_width) - 1)
         return f"{value:0{num_hex_digits}X}"
 
-    def export_txt(self, signal: np.ndarray, file_path: Union[str, Path],
+    def export_txt(self, signal: IQSignal, file_path: Union[str, Path],
                    config: Optional[IQExportConfig] = None) -> dict:
         """
         导出 IQ 数据到文本文件
 
         Args:
-            signal: 复数 IQ 信号
+            signal: 复数 IQ 信号, 或定点 (I, Q) 整数数组
             file_path: 输出文件路径
             config: 导出配置 (可选, 覆盖默认配置)
 
@@ -141,7 +157,7 @@ class IQExporter:
             lines.append(f"// Q Format: Q{cfg.bit_width - cfg.frac_bits}.{cfg.frac_bits}")
             lines.append(f"// IQ Format: {cfg.iq_format.value}")
             lines.append(f"// Number Format: {cfg.number_format.value}")
-            lines.append(f"// Samples: {len(signal)}")
+            lines.append(f"// Samples: {len(i_quant)}")
             lines.append(f"//")
 
         # 格式化数据
@@ -192,20 +208,20 @@ class IQExporter:
 
         return {
             'file': str(file_path),
-            'samples': len(signal),
+            'samples': len(i_quant),
             'bit_width': cfg.bit_width,
             'q_format': f"Q{cfg.bit_width - cfg.frac_bits}.{cfg.frac_bits}",
             'iq_format': cfg.iq_format.value,
             'number_format': cfg.number_format.value,
         }
 
-    def export_separate_files(self, signal: np.ndarray, i_path: Union[str, Path],
+    def export_separate_files(self, signal: IQSignal, i_path: Union[str, Path],
                               q_path: Union[str, Path]) -> dict:
         """
         导出 I 和 Q 到分离的文件
 
         Args:
-            signal: 复数 IQ 信号
+            signal: 复数 IQ 信号, 或定点 (I, Q) 整数数组
             i_path: I 数据文件路径
             q_path: Q 数据文件路径
 
@@ -236,17 +252,17 @@ class IQExporter:
         return {
             'i_file': str(i_path),
             'q_file': str(q_path),
-            'samples': len(signal),
+            'samples': len(i_quant),
             'bit_width': cfg.bit_width,
             'q_format': f"Q{cfg.bit_width - cfg.frac_bits}.{cfg.frac_bits}",
         }
 
-    def export_verilog_mem(self, signal: np.ndarray, file_path: Union[str, Path]) -> dict:
+    def export_verilog_mem(self, signal: IQSignal, file_path: Union[str, Path]) -> dict:
         """
         导出为 Verilog $readmemh 格式
 
         Args:
-            signal: 复数 IQ 信号
+            signal: 复数 IQ 信号, 或定点 (I, Q) 整数数组
             file_path: 输出文件路径
 
         Returns:
@@ -274,7 +290,7 @@ class IQExporter:
 
         return {
             'file': str(file_path),
-            'samples': len(signal),
+            'samples': len(i_quant),
             'bit_width': cfg.bit_width,
             'packed_width': total_bits,
             'format': 'verilog_memh',
@@ -560,7 +576,7 @@ class IQImporter:
 
 
 # 便捷函数
-def export_iq_txt(signal: np.ndarray, file_path: Union[str, Path],
+def export_iq_txt(signal: IQSignal, file_path: Union[str, Path],
                   bit_width: int = 12, frac_bits: int = 0,
                   iq_format: str = "two_column",
                   number_format: str = "signed",
@@ -569,7 +585,7 @@ def export_iq_txt(signal: np.ndarray, file_path: Union[str, Path],
     导出 IQ 数据到文本文件的便捷函数
 
     Args:
-        signal: 复数 IQ 信号
+        signal: 复数 IQ 信号, 或定点 (I, Q) 整数数组
         file_path: 输出文件路径
         bit_width: 量化位宽 (默认 12)
         frac_bits: 小数位数 (Q格式, 默认 0)
@@ -591,13 +607,13 @@ def export_iq_txt(signal: np.ndarray, file_path: Union[str, Path],
     return exporter.export_txt(signal, file_path)
 
 
-def export_iq_verilog(signal: np.ndarray, file_path: Union[str, Path],
+def export_iq_verilog(signal: IQSignal, file_path: Union[str, Path],
                       bit_width: int = 12, frac_bits: int = 0) -> dict:
     """
     导出 IQ 数据为 Verilog $readmemh 格式
 
     Args:
-        signal: 复数 IQ 信号
+        signal: 复数 IQ 信号, 或定点 (I, Q) 整数数组
         file_path: 输出文件路径
         bit_width: 量化位宽
 
@@ -13,6 +13,8 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Optional
 
+from .precision import resolve_dtype
+
 
 @dataclass
 class RFMetrics:
@@ -76,16 +78,19 @@ class RFMeasure:
     符合 BLE RF-PHY Test Specification 的射频指标测量
     """
 
-    def __init__(self, sample_rate: float = 8e6, samples_per_symbol: int = 8):
+    def __init__(self, sample_rate: float = 8e6, samples_per_symbol: int = 8,
+                 dtype: Optional[str] = None):
         """
         初始化测量器
 
         Args:
             sample_rate: 采样率 (Hz)
             samples_per_symbol: 每符号采样数
+            dtype: 数值精度 (complex128 / complex64), None 表示沿用输入信号精度
         """
         self.sample_rate = sample_rate
         self.samples_per_symbol = samples_per_symbol
+        self.dtype = dtype
 
     def measure(self, signal: np.ndarray, payload_type: str = 'PRBS9') -> RFMetrics:
         """
@@ -98,7 +103,8 @@ class RFMeasure:
         Returns:
             RFMetrics 测量结果
         """
-        # 预处理: 去除前导/尾部空白
+        # 预处理: 统一精度, 去除前导/尾部空白
+        signal = np.asarray(signal, dtype=resolve_dtype(self.dtype, signal))
         signal = self._trim_signal(signal)
         if signal is None or len(signal) < 20 * self.samples_per_symbol:
             return RFMetrics()
@@ -125,19 +131,19 @@ class RFMeasure:
         delta_f2_ratio = delta_f2['avg'] / delta_f1['avg'] if delta_f1['avg'] > 0 else 0
 
         return RFMetrics(
-            delta_f1_avg=delta_f1['avg'],
-            delta_f1_max=delta_f1['max'],
-            delta_f1_min=delta_f1['min'],
-            delta_f2_avg=delta_f2['avg'],
-            delta_f2_max=delta_f2['max'],
-            delta_f2_ratio=delta_f2_ratio,
-            freq_drift=drift['max'],
-            drift_rate=drift['rate'],
-            icft=icft,
-            avg_one=symbol_stats['avg_one'],
-            avg_zero=symbol_stats['avg_zero'],
-            p_avg_dbm=power['avg'],
-            p_peak_dbm=power['peak'],
+            delta_f1_avg=float(delta_f1['avg']),
+            delta_f1_max=float(delta_f1['max']),
+            delta_f1_min=float(delta_f1['min']),
+            delta_f2_avg=float(delta_f2['avg']),
+            delta_f2_max=float(delta_f2['max']),
+            delta_f2_ratio=float(delta_f2_ratio),
+            freq_drift=float(drift['max']),
+            drift_rate=float(drift['rate']),
+            icft=float(icft),
+            avg_one=float(symbol_stats['avg_one']),
+            avg_zero=float(symbol_stats['avg_zero']),
+            p_avg_dbm=float(power['avg']),
+            p_peak_dbm=float(power['peak']),
             # 判定结果
             delta_f1_pass=225 <= delta_f1['avg'] <= 275,
             delta_f2_pass=delta_f2['avg'] >= 185,
@@ -163,8 +169,12 @@ class RFMeasure:
 
     def _compute_instantaneous_frequency(self, signal: np.ndarray) -> np.ndarray:
         """计算瞬时频率"""
+        scale = float(self.sample_rate / (2 * np.pi))
+        if signal.dtype == np.complex64:
+            # 单精度: 长信号展开后的累积相位会丢失 float32 精度, 改用相邻采样差分相位
+            return np.angle(signal[1:] * np.conj(signal[:-1])) * scale
         phase = np.unwrap(np.angle(signal))
-        return np.diff(phase) * self.sample_rate / (2 * np.pi)
+        return np.diff(phase) * scale
 
     def _extract_regions(self, freq_inst: np.ndarray) -> tuple:
         """提取前导码和 payload 区域"""
@@ -363,7 +373,8 @@ class RFMeasure:
 
 def calculate_rf_metrics(signal: np.ndarray, sample_rate: float,
                          samples_per_symbol: int = 8,
-                         payload_type: str = 'PRBS9') -> dict:
+                         payload_type: str = 'PRBS9',
+                         dtype: Optional[str] = None) -> dict:
     """
     便捷函数: 计算 RF 测量指标
 
@@ -372,9 +383,10 @@ def calculate_rf_metrics(signal: np.ndarray, sample_rate: float,
         sample_rate: 采样率 (Hz)
         samples_per_symbol: 每符号采样数
         payload_type: 负载类型
+        dtype: 数值精度 (complex128 / complex64), None 表示沿用输入信号精度
 
     Returns:
         RF 指标字典
     """
-    measurer = RFMeasure(sample_rate, samples_per_symbol)
+    measurer = RFMeasure(sample_rate, samples_per_symbol, dtype)
     return measurer.measure(signal, payload_type).to_dict()
@@ -0,0 +1,153 @@
+"""
+定点 NCO 调制器 (硬件实现模型)
+
+与 RTL 中的 GFSK 发射机逐位一致的整数模型:
+1. 频率字查找表: 每符号 N 个采样点的相位增量 (高斯频率脉冲 × 调制指数, 定点化)
+2. 相位累加器: phase_bits 位无符号累加, 自然溢出回绕
+3. 相位截断: 取累加器高 lut_bits 位作为 sin/cos 查找表地址
+4. sin/cos 查找表: 2^lut_bits 项, output_bits 位有符号幅度
+
+输出整数 I/Q 数组, 可直接交给 IQExporter 导出 (不再重新量化)。
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from .modulator import BLEModulator, ModulatorConfig
+
+
+@dataclass
+class NCOConfig:
+    """定点 NCO 配置"""
+    phase_bits: int = 24              # 相位累加器位宽
+    lut_bits: int = 10                # sin/cos 查找表地址位宽 (表深 2^lut_bits)
+    output_bits: int = 12             # I/Q 输出位宽 (有符号)
+
+
+class NCOModulator:
+    """
+    定点 GFSK 调制器 (相位累加器 + sin/cos 查找表)
+
+    频率脉冲、调制指数、中心频率等沿用 ModulatorConfig, 与浮点 BLEModulator
+    的 Full Response 波形一致 (误差仅来自相位和幅度量化)。
+
+    示例:
+        nco = NCOModulator(ModulatorConfig(sample_rate=8e6), NCOConfig(phase_bits=24))
+        i_data, q_data = nco.modulate(bits)
+        IQExporter(IQExportConfig(bit_width=12)).export_txt((i_data, q_data), 'tx.txt')
+    """
+
+    def __init__(self, config: Optional[ModulatorConfig] = None,
+                 nco_config: Optional[NCOConfig] = None):
+        self.config = config or ModulatorConfig()
+        self.nco_config = nco_config or NCOConfig()
+        self._update_parameters()
+
+    def _update_parameters(self):
+        """更新内部参数"""
+        config = self.config
+        nco = self.nco_config
+
+        if config.partial_response or config.pulse_length != 1:
+            raise ValueError("定点 NCO 调制器只支持 Full Response (pulse_length=1)")
+        if not 1 <= nco.lut_bits <= nco.phase_bits <= 48:
+            raise ValueError(
+                f"位宽须满足 1 <= lut_bits <= phase_bits <= 48: "
+                f"lut_bits={nco.lut_bits}, phase_bits={nco.phase_bits}"
+            )
+        if not 2 <= nco.output_bits <= 32:
+            raise ValueError(f"输出位宽须在 2-32 之间: {nco.output_bits}")
+
+        # 复用浮点调制器的符号率、每符号采样数和频率脉冲
+        reference = BLEModulator(config)
+        if reference.resample_plan.required:
+            raise ValueError("定点 NCO 调制器要求采样率为符号率的整数倍")
+        self.samples_per_symbol = reference.samples_per_symbol
+        self.symbol_rate = reference.symbol_rate
+
+        self.phase_mask = (1 << nco.phase_bits) - 1
+        self.output_dtype = np.int16 if nco.output_bits <= 16 else np.int32
+
+        self._generate_frequency_table(reference.freq_pulse)
+        self._generate_sincos_table()
+
+    def _generate_frequency_table(self, freq_pulse: np.ndarray):
+        """
+        生成每符号的相位增量表 (频率字)
+
+        浮点调制器中符号内第 k 个采样点相位 = h * sym * 2π * sum(g[:k]),
+        即每采样相位增量 h * g[k] 周。定点化为 round(h * g[k] * 2^phase_bits),
+        并修正最大项使每符号总增量恰为 round(h/2 * 2^phase_bits), 避免长数据包的相位漂移。
+        """
+        config = self.config
+        scale = float(1 << self.nco_config.phase_bits)
+        h = config.modulation_index
+
+        table = np.round(h * freq_pulse * scale).astype(np.int64)
+        table[np.argmax(table)] += int(round(h * 0.5 * scale)) - int(table.sum())
+        self.frequency_table = table
+
+        # 中心频率偏移的频率字
+        self.center_word = int(round(config.center_freq / config.sample_rate * scale))
+
+    def _generate_sincos_table(self):
+        """生成 sin/cos 查找表 (有符号 output_bits 位)"""
+        nco = self.nco_config
+        amplitude = (1 << (nco.output_bits - 1)) - 1
+        angle = 2 * np.pi * np.arange(1 << nco.lut_bits) / (1 << nco.lut_bits)
+        self.cos_table = np.round(amplitude * np.cos(angle)).astype(self.output_dtype)
+        self.sin_table = np.round(amplitude * np.sin(angle)).astype(self.output_dtype)
+
+    def phase_increments(self, bits: np.ndarray) -> np.ndarray:
+        """
+        计算每个采样点的相位增量 (频率字)
+
+        Args:
+            bits: 输入比特流 (0/1)
+
+        Returns:
+            相位增量数组 (int64, 长度 len(bits) * samples_per_symbol)
+        """
+        symbols = 2 * np.asarray(bits).astype(np.int64) - 1
+        increments = (symbols[:, np.newaxis] * self.frequency_table).reshape(-1)
+        if self.center_word:
+            increments += self.center_word
+        return increments
+
+    def phase_accumulator(self, bits: np.ndarray) -> np.ndarray:
+        """
+        相位累加器输出 (每个采样点使用累加前的寄存器值)
+
+        int64 累加的高位溢出不影响低 phase_bits 位, 取模结果与硬件回绕一致。
+
+        Args:
+            bits: 输入比特流 (0/1)
+
+        Returns:
+            相位寄存器值 (int64, 0 ~ 2^phase_bits - 1)
+        """
+        increments = self.phase_increments(bits)
+        phase = np.zeros(len(increments), dtype=np.int64)
+        np.cumsum(increments[:-1], out=phase[1:])
+        return phase & self.phase_mask
+
+    def modulate(self, bits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        定点 GFSK 调制
+
+        Args:
+            bits: 输入比特流 (0/1)
+
+        Returns:
+            (I, Q) 整数数组 (output_bits <= 16 时为 int16, 否则为 int32)
+        """
+        nco = self.nco_config
+        address = self.phase_accumulator(bits) >> (nco.phase_bits - nco.lut_bits)
+        return self.cos_table[address], self.sin_table[address]
+
+    def to_complex(self, iq: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        """整数 I/Q 转换为归一化复数信号 (用于与浮点模型比较)"""
+        full_scale = (1 << (self.nco_config.output_bits - 1)) - 1
+        i_data, q_data = iq
+        return (i_data + 1j * q_data.astype(np.float64)) / full_scale
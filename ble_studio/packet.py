@@ -4,10 +4,18 @@ BLE 数据包生成模块
 """
 
 import numpy as np
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import IntEnum
 
+from .crc import crc24, crc24_batch, crc24_patch, crc24_shift
+from .whitening import whitening_sequence, apply_whitening
+from .bitutils import bytes_to_bits, bits_to_bytes, int_to_bits
+from .prbs import prbs_bytes
+from .hopping import used_channels
+from .access_address import generate_access_addresses
+from .coded_phy import CODED_PREAMBLE, coded_header, encode_fec_block
+
 
 class BLEPhyMode(IntEnum):
     """BLE 物理层模式"""
@@ -94,6 +102,7 @@ class BLEPacketConfig:
     pdu_type: int = 0                    # PDU 类型
     payload: bytes = b''                 # 负载数据
     crc_init: int = 0x555555             # CRC 初始值
+    pdu: Optional[bytes] = None          # 完整 PDU (含头部), 设置时忽略 pdu_type/payload
 
 
 @dataclass
@@ -231,7 +240,10 @@ class DataChannelPDU:
 def calculate_data_channel(unmapped_channel: int, channel_map: int,
                            num_used_channels: int = None) -> int:
     """
-    计算数据信道 (根据信道映射)
+    计算数据信道 (CSA#1, 根据信道映射)
+
+    可用信道列表按信道映射缓存 (见 hopping.used_channels), 重映射只需一次查表。
+    整段跳频序列可用 hopping.csa1_channel_sequence 一次计算。
 
     Args:
         unmapped_channel: 未映射信道号 (0-36)
@@ -247,15 +259,12 @@ def calculate_data_channel(unmapped_channel: int, channel_map: int,
     if (channel_map >> unmapped_channel) & 1:
         # 信道可用, 直接使用
         return unmapped_channel
-    else:
-        # 信道不可用, 重新映射
-        remap_index = unmapped_channel % num_used_channels
-        count = 0
-        for ch in range(37):
-            if (channel_map >> ch) & 1:
-                if count == remap_index:
-                    return ch
-                count += 1
+
+    # 信道不可用, 重新映射
+    remap_index = unmapped_channel % num_used_channels
+    used = used_channels(channel_map)
+    if remap_index < len(used):
+        return int(used[remap_index])
     return 0
 
 
@@ -277,10 +286,75 @@ def next_data_channel(last_unmapped_channel: int, hop_increment: int,
     return unmapped, actual
 
 
+def channel_to_frequency(channel: int) -> float:
+    """
+    信道号转换为射频中心频率
+
+    - 数据信道 0-10: 2404-2424 MHz
+    - 数据信道 11-36: 2428-2478 MHz
+    - 广播信道 37/38/39: 2402/2426/2480 MHz
+
+    Args:
+        channel: 信道号 (0-39)
+
+    Returns:
+        中心频率 (Hz)
+    """
+    if channel < 0 or channel > 39:
+        raise ValueError(f"信道号超出范围 (0-39): {channel}")
+    if channel < 11:
+        return (2404 + channel * 2) * 1e6
+    if channel < 37:
+        return (2428 + (channel - 11) * 2) * 1e6
+    return [2402e6, 2426e6, 2480e6][channel - 37]
+
+
+def preamble_bits(access_address: int, phy_mode: BLEPhyMode = BLEPhyMode.LE_1M) -> np.ndarray:
+    """
+    生成前导码 (BLE 规范: 取决于接入地址的 LSB, 保证前导码与接入地址之间比特交替)
+
+    - AA LSB = 1: 10101010 (2M PHY 为 16 bits)
+    - AA LSB = 0: 01010101
+    - LE Coded PHY: 00111100 x 10 (80 符号, 与接入地址无关)
+
+    Args:
+        access_address: 接入地址
+        phy_mode: PHY 模式
+
+    Returns:
+        前导码比特 (发送顺序)
+    """
+    if coded_spreading(phy_mode):
+        return CODED_PREAMBLE.copy()
+    length = 16 if phy_mode == BLEPhyMode.LE_2M else 8
+    return ((np.arange(length) & 1) ^ (access_address & 1)).astype(np.uint8)
+
+
+def coded_spreading(phy_mode: BLEPhyMode) -> Optional[int]:
+    """LE Coded PHY 的 S (8 或 2), 未编码 PHY 返回 None"""
+    return {BLEPhyMode.LE_CODED_S8: 8, BLEPhyMode.LE_CODED_S2: 2}.get(phy_mode)
+
+
+def _packet_header(access_address: int, phy_mode: BLEPhyMode) -> np.ndarray:
+    """数据段之前的空口比特: 前导码 + 接入地址 (Coded PHY: 前导码 + FEC 块 1)"""
+    spreading = coded_spreading(phy_mode)
+    if spreading:
+        return coded_header(access_address, spreading)
+    return np.concatenate([preamble_bits(access_address, phy_mode), int_to_bits(access_address, 32)])
+
+
+def _encode_data(data_bits: np.ndarray, phy_mode: BLEPhyMode) -> np.ndarray:
+    """数据段 (白化后的 PDU + CRC) 的空口比特: 未编码 PHY 不变, Coded PHY 为 FEC 块 2 (支持批量)"""
+    spreading = coded_spreading(phy_mode)
+    if spreading:
+        return encode_fec_block(data_bits, spreading)
+    return data_bits
+
+
 class BLEPacket:
     """BLE 基带数据包生成器"""
 
-    # BLE 前导码
+    # BLE 前导码 (接入地址 LSB = 1 时; LSB = 0 时取反, 见 preamble_bits)
     PREAMBLE_1M = np.array([1, 0, 1, 0, 1, 0, 1, 0], dtype=np.uint8)  # 1M PHY
     PREAMBLE_2M = np.array([1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0], dtype=np.uint8)  # 2M PHY
 
@@ -296,18 +370,11 @@ class BLEPacket:
 
     def _bytes_to_bits(self, data: bytes) -> np.ndarray:
         """字节转比特 (LSB first)"""
-        bits = []
-        for byte in data:
-            for i in range(8):
-                bits.append((byte >> i) & 1)
-        return np.array(bits, dtype=np.uint8)
+        return bytes_to_bits(data)
 
     def _int_to_bits(self, value: int, num_bits: int) -> np.ndarray:
         """整数转比特 (LSB first)"""
-        bits = []
-        for i in range(num_bits):
-            bits.append((value >> i) & 1)
-        return np.array(bits, dtype=np.uint8)
+        return int_to_bits(value, num_bits)
 
     def _calculate_crc(self, data: bytes, init: int = None) -> int:
         """
@@ -318,61 +385,32 @@ class BLEPacket:
         - InitialConditions: 0x555555 (MSB first)
         - DirectMethod: true
 
-        实现方式:
-        1. 将字节转为比特流 (LSB first per byte)
-        2. 使用 MSB-first 直接方法计算 CRC
-        3. 对 CRC 结果进行 bit reverse
+        由 crc.crc24 查表计算 (与逐比特 MSB-first 直接法 + 结果比特反转等价)。
+
+        Args:
+            data: PDU 字节
+            init: CRC 初始值, None 表示使用 config.crc_init
         """
         if init is None:
-            init = self.CRC_INIT_ADV
-
-        # 将字节转为比特流 (LSB first per byte)
-        bits = []
-        for byte in data:
-            for i in range(8):
-                bits.append((byte >> i) & 1)
-
-        # MSB-first 直接方法 CRC 计算
-        poly = 0x00065B  # 不含 x^24 项
-        crc = init
-
-        for bit in bits:
-            msb = (crc >> 23) & 1
-            crc = (crc << 1) & 0xFFFFFF
-            if msb ^ bit:
-                crc ^= poly
-
-        # Bit reverse CRC 输出 (MATLAB 兼容)
-        crc_rev = 0
-        for i in range(24):
-            if crc & (1 << i):
-                crc_rev |= (1 << (23 - i))
-
-        return crc_rev
+            init = self.config.crc_init
+        return crc24(data, init)
 
     def _get_whitening_sequence(self, channel: int, length: int) -> np.ndarray:
-        """生成白化序列"""
-        # 初始化 LFSR (channel 号 + 1 作为种子)
-        lfsr = (channel & 0x3F) | 0x40
-
-        sequence = np.zeros(length, dtype=np.uint8)
-        for i in range(length):
-            sequence[i] = lfsr & 1
-            # x^7 + x^4 + 1
-            feedback = ((lfsr >> 6) ^ (lfsr >> 3)) & 1
-            lfsr = ((lfsr << 1) | feedback) & 0x7F
-
-        return sequence
+        """生成白化序列 (由 whitening 模块的预计算周期平铺得到)"""
+        return whitening_sequence(channel, length)
 
     def _apply_whitening(self, bits: np.ndarray, channel: int) -> np.ndarray:
         """应用白化"""
-        whitening_seq = self._get_whitening_sequence(channel, len(bits))
-        return bits ^ whitening_seq
+        return apply_whitening(bits, channel)
 
     def generate_pdu(self) -> bytes:
         """生成 PDU (Protocol Data Unit)"""
         config = self.config
 
+        # 直接指定的完整 PDU (数据信道 PDU 等, 头部格式与广播 PDU 不同)
+        if config.pdu is not None:
+            return config.pdu
+
         # 广播 PDU 头部 (2字节)
         # [PDU Type (4bit)] [RFU (1bit)] [ChSel (1bit)] [TxAdd (1bit)] [RxAdd (1bit)]
         # [Length (8bit)]
@@ -383,57 +421,254 @@ class BLEPacket:
 
         return pdu_header + config.payload
 
+    def _data_bits(self, pdu: bytes) -> np.ndarray:
+        """数据段: PDU + CRC (24 bits) 并白化"""
+        pdu_bits = self._bytes_to_bits(pdu)
+        crc_bits = self._int_to_bits(self._calculate_crc(pdu), 24)
+        return self._apply_whitening(np.concatenate([pdu_bits, crc_bits]), self.config.channel)
+
     def generate(self) -> np.ndarray:
-        """生成完整的 BLE 基带数据包 (比特流)"""
+        """
+        生成完整的 BLE 基带数据包 (比特流)
+
+        1M/2M PHY: 前导码 + 接入地址 + 白化后的 PDU + CRC
+        Coded PHY: 前导码 (80 符号) + FEC 块 1 + FEC 块 2, 返回 1 Msym/s 的符号流,
+        可直接交给 BLEModulator 调制
+        """
         config = self.config
+        data_bits = self._data_bits(self.generate_pdu())
+        return np.concatenate([
+            _packet_header(config.access_address, config.phy_mode),
+            _encode_data(data_bits, config.phy_mode)
+        ])
 
-        # 1. 前导码
-        if config.phy_mode == BLEPhyMode.LE_2M:
-            preamble = self.PREAMBLE_2M.copy()
-        else:
-            preamble = self.PREAMBLE_1M.copy()
+    def generate_bytes(self) -> bytes:
+        """生成数据包字节"""
+        # 末尾补零到字节边界
+        return bits_to_bytes(self.generate(), pad=True).tobytes()
 
-        # 2. 接入地址 (32 bits, LSB first)
-        access_addr_bits = self._int_to_bits(config.access_address, 32)
 
-        # 3. PDU
-        pdu = self.generate_pdu()
-        pdu_bits = self._bytes_to_bits(pdu)
+class BLEPacketTemplate:
+    """
+    数据包模板: 修改部分负载字节, 增量更新 CRC 和比特流
 
-        # 4. CRC (24 bits)
-        crc = self._calculate_crc(pdu)
-        crc_bits = self._int_to_bits(crc, 24)
+    扫描测试和硬件测试向量中, 数据包之间通常只有少数负载字节不同。
+    CRC 对数据是 GF(2) 线性的, 白化是逐比特异或, 因此修改 k 个字节后:
+    - 新 CRC = 原 CRC ^ shift(crc(差分), 其后的字节数), 运算量 O(k)
+    - 新比特流 = 原比特流 ^ 差分比特 (PDU 区间和 CRC 区间), 与白化序列无关
+    - Coded PHY: 在未编码的数据段上增量更新, 输出时整体 FEC 编码 (向量化)
 
-        # 5. 组合 PDU + CRC 并白化
-        data_bits = np.concatenate([pdu_bits, crc_bits])
-        whitened_bits = self._apply_whitening(data_bits, config.channel)
+    适用于 BLEPacket 及其子类 (如 RFTestPacket), 模板只修改负载内容, 不改变长度。
 
-        # 6. 组合完整数据包
-        packet_bits = np.concatenate([
-            preamble,
-            access_addr_bits,
-            whitened_bits
-        ])
+    示例:
+        template = BLEPacketTemplate(create_advertising_packet(adv_address, b'\x00' * 4))
+        for counter in range(1000):
+            bits = template.patch(6, counter.to_bytes(4, 'little'))
+    """
 
-        return packet_bits
+    PDU_HEADER_LENGTH = 2
 
-    def generate_bytes(self) -> bytes:
-        """生成数据包字节"""
-        bits = self.generate()
-        # 补齐到字节边界
-        pad_len = (8 - len(bits) % 8) % 8
-        if pad_len > 0:
-            bits = np.concatenate([bits, np.zeros(pad_len, dtype=np.uint8)])
+    def __init__(self, packet: BLEPacket):
+        self.pdu = bytearray(packet.generate_pdu())
+        self.crc = packet._calculate_crc(bytes(self.pdu))
+        self.phy_mode = packet.config.phy_mode
+        self._header = _packet_header(packet.config.access_address, self.phy_mode)
+        # 数据段 (白化后的 PDU + CRC); Coded PHY 的 FEC 编码在输出时进行
+        self._data = packet._data_bits(bytes(self.pdu))
+
+    @property
+    def payload_length(self) -> int:
+        """负载字节数"""
+        return len(self.pdu) - self.PDU_HEADER_LENGTH
+
+    @property
+    def payload(self) -> bytes:
+        """当前负载"""
+        return bytes(self.pdu[self.PDU_HEADER_LENGTH:])
+
+    @property
+    def bits(self) -> np.ndarray:
+        """当前数据包比特流 (副本)"""
+        return self._assemble(self._data)
+
+    def _assemble(self, data: np.ndarray) -> np.ndarray:
+        """数据段 (单个或批量) 编码后接在头部之后"""
+        data = _encode_data(data, self.phy_mode)
+        header_length = len(self._header)
+        bits = np.empty(data.shape[:-1] + (header_length + data.shape[-1],), dtype=np.uint8)
+        bits[..., :header_length] = self._header
+        bits[..., header_length:] = data
+        return bits
+
+    def _check_region(self, offset: int, length: int):
+        """检查负载修改区间"""
+        if offset < 0 or offset + length > self.payload_length:
+            raise ValueError(
+                f"修改区间 [{offset}, {offset + length}) 超出负载长度 {self.payload_length}"
+            )
+
+    def patch(self, offset: int, data: bytes) -> np.ndarray:
+        """
+        修改负载字节 (修改保留在模板中, 后续 patch 在此基础上进行)
+
+        Args:
+            offset: 负载内的起始字节位置
+            data: 新字节
+
+        Returns:
+            修改后的数据包比特流 (副本)
+        """
+        data = bytes(data)
+        self._check_region(offset, len(data))
+
+        start = self.PDU_HEADER_LENGTH + offset
+        old = bytes(self.pdu[start:start + len(data)])
+        crc = crc24_patch(self.crc, len(self.pdu), start, old, data)
+
+        # 差分比特: 修改区间和 CRC
+        delta = np.frombuffer(bytes(a ^ b for a, b in zip(old, data)), dtype=np.uint8)
+        self._data[start * 8:(start + len(data)) * 8] ^= bytes_to_bits(delta)
+        self._data[-24:] ^= int_to_bits(self.crc ^ crc, 24)
+
+        self.pdu[start:start + len(data)] = data
+        self.crc = crc
+        return self._assemble(self._data)
+
+    def patch_batch(self, offset: int, data: np.ndarray) -> np.ndarray:
+        """
+        批量生成修改后的数据包 (模板本身不变)
+
+        Args:
+            offset: 负载内的起始字节位置
+            data: 新字节矩阵 (N_packets, k), 每行替换负载 [offset, offset + k)
+
+        Returns:
+            比特流矩阵 (N_packets, 数据包比特数), uint8
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=np.uint8))
+        num_packets, length = data.shape
+        self._check_region(offset, length)
+
+        start = self.PDU_HEADER_LENGTH + offset
+        old = np.frombuffer(bytes(self.pdu[start:start + length]), dtype=np.uint8)
+        delta = data ^ old
+
+        # 差分 CRC (初值 0) 移位到 PDU 末尾
+        crc_delta = crc24_shift(crc24_batch(delta, init=0), len(self.pdu) - start - length)
 
-        # 比特转字节
-        result = []
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(8):
-                byte |= (bits[i + j] << j)
-            result.append(byte)
+        data_bits = np.tile(self._data, (num_packets, 1))
+        data_bits[:, start * 8:(start + length) * 8] ^= bytes_to_bits(delta)
+        data_bits[:, -24:] ^= int_to_bits(crc_delta, 24)
+        return self._assemble(data_bits)
 
-        return bytes(result)
+
+class BLEPacketBatch:
+    """
+    批量数据包生成器 (蒙特卡洛仿真)
+
+    接入地址、信道、PDU 类型等沿用 BLEPacketConfig (config.payload 不使用),
+    N 个负载一次生成 (N, 数据包比特数) 比特矩阵:
+    - PDU 头部和负载按字节矩阵拼接
+    - CRC 由 crc24_batch 逐字节列向量化计算
+    - 白化 (打包为字节后异或) 和比特展开均为整个矩阵的一次运算
+    - Coded PHY 的 FEC 编码和模式映射同样对整个矩阵一次完成
+
+    每行与对应负载的 BLEPacket.generate() 完全一致, 结果可直接交给 BLEModulator.modulate_batch。
+
+    示例:
+        batch = BLEPacketBatch(BLEPacketConfig(channel=37))
+        payloads, bits = batch.generate_random(100000, payload_length=37, seed=1)
+        iq = BLEModulator().modulate_batch(bits)
+    """
+
+    def __init__(self, config: Optional[BLEPacketConfig] = None, whitening: bool = True):
+        self.config = config or BLEPacketConfig()
+        self.whitening = whitening
+
+        config = self.config
+        # 前导码 + 接入地址 (Coded PHY: 前导码 + FEC 块 1) 对所有数据包相同
+        self.header_bits = _packet_header(config.access_address, config.phy_mode)
+
+    def generate(self, payloads: np.ndarray) -> np.ndarray:
+        """
+        生成数据包比特矩阵
+
+        Args:
+            payloads: 负载字节矩阵 (N_packets, payload_length), uint8
+
+        Returns:
+            比特矩阵 (N_packets, 数据包比特数), uint8
+        """
+        config = self.config
+        payloads = np.atleast_2d(np.asarray(payloads, dtype=np.uint8))
+        num_packets, payload_length = payloads.shape
+        if payload_length > 255:
+            raise ValueError(f"负载长度超出范围 (0-255): {payload_length}")
+
+        # PDU = 头部 (2 字节) + 负载
+        pdu = np.empty((num_packets, 2 + payload_length), dtype=np.uint8)
+        pdu[:, 0] = config.pdu_type & 0x0F
+        pdu[:, 1] = payload_length
+        pdu[:, 2:] = payloads
+
+        # PDU + CRC (3 字节, 低字节在前)
+        data = np.empty((num_packets, pdu.shape[1] + 3), dtype=np.uint8)
+        data[:, :-3] = pdu
+        crc = crc24_batch(pdu, init=config.crc_init)
+        data[:, -3:] = crc.astype('<u4').view(np.uint8).reshape(num_packets, 4)[:, :3]
+
+        # 数据段从字节边界开始, 白化序列打包为字节后按字节异或
+        if self.whitening:
+            data ^= bits_to_bytes(whitening_sequence(config.channel, data.shape[1] * 8))
+
+        data_bits = _encode_data(bytes_to_bits(data), config.phy_mode)
+        bits = np.empty((num_packets, len(self.header_bits) + data_bits.shape[1]), dtype=np.uint8)
+        bits[:, :len(self.header_bits)] = self.header_bits
+        bits[:, len(self.header_bits):] = data_bits
+        return bits
+
+    def generate_random(self, num_packets: int, payload_length: int,
+                        seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        生成随机负载的数据包比特矩阵
+
+        Args:
+            num_packets: 数据包数量
+            payload_length: 负载长度 (字节)
+            seed: 随机种子 (None 使用 numpy 全局随机状态)
+
+        Returns:
+            (负载字节矩阵 (N, payload_length), 比特矩阵 (N, 数据包比特数))
+        """
+        if seed is None:
+            payloads = np.random.randint(0, 256, (num_packets, payload_length), dtype=np.uint8)
+        else:
+            rng = np.random.default_rng(seed)
+            payloads = rng.integers(0, 256, (num_packets, payload_length), dtype=np.uint8)
+        return payloads, self.generate(payloads)
+
+
+def generate_batch(payloads: Optional[np.ndarray] = None,
+                   config: Optional[BLEPacketConfig] = None,
+                   num_packets: int = 0, payload_length: int = 0,
+                   seed: Optional[int] = None) -> np.ndarray:
+    """
+    批量生成数据包比特矩阵的便捷函数
+
+    Args:
+        payloads: 负载字节矩阵 (N, payload_length); None 时按 num_packets/payload_length/seed 随机生成
+        config: 数据包配置 (默认广播信道 37)
+        num_packets: 随机负载的数据包数量
+        payload_length: 随机负载长度 (字节)
+        seed: 随机种子
+
+    Returns:
+        比特矩阵 (N, 数据包比特数), uint8
+    """
+    batch = BLEPacketBatch(config)
+    if payloads is None:
+        return batch.generate_random(num_packets, payload_length, seed)[1]
+    return batch.generate(payloads)
 
 
 def create_advertising_packet(
@@ -487,13 +722,11 @@ def create_data_packet(
         access_address=access_address,
         pdu_type=0,  # 数据信道不使用此字段
         payload=pdu[2:] if len(pdu) > 2 else b'',  # 跳过头部
-        crc_init=crc_init
+        crc_init=crc_init,
+        pdu=pdu  # 直接使用完整 PDU (包含 LLID/NESN/SN/MD 头部)
     )
 
-    # 直接设置 PDU (包含头部)
-    packet = BLEPacket(config)
-    packet._data_pdu = pdu  # 存储完整 PDU
-    return packet
+    return BLEPacket(config)
 
 
 def create_connect_ind(
@@ -508,7 +741,8 @@ def create_connect_ind(
     timeout: int = 72,   # 720ms
     channel_map: int = 0x1FFFFFFFFF,
     hop: int = 5,
-    sca: int = 0
+    sca: int = 0,
+    channel: int = 37
 ) -> BLEPacket:
     """
     创建 CONNECT_IND PDU
@@ -526,6 +760,7 @@ def create_connect_ind(
         channel_map: 信道映射 (37 bits)
         hop: 跳频增量 (5-16)
         sca: 睡眠时钟精度
+        channel: 发送 CONNECT_IND 的广播信道 (37/38/39)
 
     Returns:
         BLEPacket 对象
@@ -565,137 +800,84 @@ def create_connect_ind(
         (hop & 0x1F) | ((sca & 0x07) << 5)
     ])
 
-    payload = init_address + adv_address + ll_data
-
+    # 负载: InitA (6) + AdvA (6) + LLData (22)
     return create_advertising_packet(
-        adv_address=b'',  # 不使用
-        adv_data=b'',
-        channel=37,
+        adv_address=init_address,
+        adv_data=adv_address + ll_data,
+        channel=channel,
         pdu_type=AdvertisingPDUType.CONNECT_IND
     )
 
 
-def generate_random_access_address() -> int:
+def generate_random_access_address(coded_phy: bool = False) -> int:
     """
     生成随机接入地址 (符合 BLE 规范)
 
-    规则:
-    - 不能是广播接入地址 (0x8E89BED6)
-    - 不能全 0 或全 1
-    - 不能超过 6 个连续的 0 或 1
-    - 至少有 2 个 bit 翻转
-    """
-    while True:
-        aa = np.random.randint(0, 0xFFFFFFFF)
-
-        # 检查不是广播地址
-        if aa == 0x8E89BED6:
-            continue
-
-        # 检查不是全 0 或全 1
-        if aa == 0 or aa == 0xFFFFFFFF:
-            continue
-
-        # 检查连续 0/1 不超过 6 个
-        binary = format(aa, '032b')
-        max_consecutive = max(
-            len(s) for s in binary.replace('0', ' ').split() + binary.replace('1', ' ').split()
-            if s
-        )
-        if max_consecutive > 6:
-            continue
-
-        # 检查至少 2 个翻转
-        transitions = sum(1 for i in range(31) if binary[i] != binary[i+1])
-        if transitions < 2:
-            continue
+    规则见 access_address 模块; 批量生成互不相同的地址使用 generate_access_addresses。
 
-        return aa
+    Args:
+        coded_phy: 同时满足 LE Coded PHY 的附加规则
+    """
+    return int(generate_access_addresses(1, coded_phy)[0])
 
 
 class RFTestPayloadGenerator:
     """RF Test 测试负载生成器"""
 
     @staticmethod
-    def generate_prbs9(length: int) -> bytes:
+    def generate_prbs9(length: int, phase: int = 0) -> bytes:
         """
         生成 PRBS9 伪随机序列
 
         多项式: x^9 + x^5 + 1
         初始值: 0x1FF (全1)
+        从缓存的完整周期 (511 比特) 中切片, 见 prbs 模块。
 
         Args:
             length: 负载字节长度
+            phase: 起始相位 (周期内比特位置, 0 为 LFSR 初值处)
 
         Returns:
             PRBS9 序列 (bytes)
         """
-        lfsr = 0x1FF  # 9-bit LFSR 初始值
-        result = []
-
-        for _ in range(length):
-            byte = 0
-            for bit_idx in range(8):
-                # 输出当前 bit
-                output_bit = lfsr & 1
-                byte |= (output_bit << bit_idx)
-
-                # LFSR 反馈: x^9 + x^5 + 1
-                feedback = ((lfsr >> 0) ^ (lfsr >> 4)) & 1
-                lfsr = ((lfsr >> 1) | (feedback << 8)) & 0x1FF
-
-            result.append(byte)
-
-        return bytes(result)
+        return prbs_bytes(9, length, phase)
 
     @staticmethod
-    def generate_prbs15(length: int) -> bytes:
+    def generate_prbs15(length: int, phase: int = 0) -> bytes:
         """
         生成 PRBS15 伪随机序列
 
         多项式: x^15 + x^14 + 1
         初始值: 0x7FFF (全1)
+        从缓存的完整周期 (32767 比特) 中切片, 见 prbs 模块。
 
         Args:
             length: 负载字节长度
+            phase: 起始相位 (周期内比特位置, 0 为 LFSR 初值处)
 
         Returns:
             PRBS15 序列 (bytes)
         """
-        lfsr = 0x7FFF  # 15-bit LFSR 初始值
-        result = []
-
-        for _ in range(length):
-            byte = 0
-            for bit_idx in range(8):
-                # 输出当前 bit
-                output_bit = lfsr & 1
-                byte |= (output_bit << bit_idx)
-
-                # LFSR 反馈: x^15 + x^14 + 1
-                feedback = ((lfsr >> 0) ^ (lfsr >> 1)) & 1
-                lfsr = ((lfsr >> 1) | (feedback << 14)) & 0x7FFF
-
-            result.append(byte)
-
-        return bytes(result)
+        return prbs_bytes(15, length, phase)
 
     @staticmethod
-    def generate_pattern(pattern_type: RFTestPayloadType, length: int) -> bytes:
+    def generate_pattern(pattern_type: RFTestPayloadType, length: int,
+                         phase: int = 0) -> bytes:
         """
         生成测试负载
 
         Args:
             pattern_type: 负载类型
             length: 负载字节长度
+            phase: PRBS 起始相位 (比特, 固定模式忽略)
 
         Returns:
             测试负载 (bytes)
         """
         if pattern_type == RFTestPayloadType.PRBS9:
-            return RFTestPayloadGenerator.generate_prbs9(length)
+            return RFTestPayloadGenerator.generate_prbs9(length, phase)
         elif pattern_type == RFTestPayloadType.PRBS15:
-            return RFTestPayloadGenerator.generate_prbs15(length)
+            return RFTestPayloadGenerator.generate_prbs15(length, phase)
         elif pattern_type == RFTestPayloadType.PATTERN_11110000:
             return bytes([0xF0] * length)
         elif pattern_type == RFTestPayloadType.PATTERN_10101010:
@@ -722,6 +904,7 @@ class RFTestConfig:
     access_address: int = 0x71764129          # DTM 默认接入地址
     crc_init: int = 0x555555                  # CRC 初始值
     whitening: bool = False                   # 是否启用白化 (DTM 默认关闭)
+    prbs_phase: int = 0                       # PRBS 负载起始相位 (比特, 连续发射时逐包推进)
 
 
 class RFTestPacket(BLEPacket):
@@ -736,7 +919,8 @@ class RFTestPacket(BLEPacket):
         # 生成测试负载
         payload = RFTestPayloadGenerator.generate_pattern(
             self.test_config.payload_type,
-            self.test_config.payload_length
+            self.test_config.payload_length,
+            self.test_config.prbs_phase
         )
 
         # 构建 BLE 数据包配置
@@ -753,40 +937,14 @@ class RFTestPacket(BLEPacket):
         super().__init__(packet_config)
         self._test_payload = payload
 
-    def generate(self) -> np.ndarray:
-        """生成完整的 RF Test 数据包 (比特流) - 可配置白化"""
-        config = self.config
-
-        # 1. 前导码
-        if config.phy_mode == BLEPhyMode.LE_2M:
-            preamble = self.PREAMBLE_2M.copy()
-        else:
-            preamble = self.PREAMBLE_1M.copy()
-
-        # 2. 接入地址 (32 bits, LSB first)
-        access_addr_bits = self._int_to_bits(config.access_address, 32)
-
-        # 3. PDU
-        pdu = self.generate_pdu()
+    def _data_bits(self, pdu: bytes) -> np.ndarray:
+        """数据段: PDU + CRC (24 bits), 根据配置决定是否白化"""
         pdu_bits = self._bytes_to_bits(pdu)
-
-        # 4. CRC (24 bits)
-        crc = self._calculate_crc(pdu)
-        crc_bits = self._int_to_bits(crc, 24)
-
-        # 5. 组合 PDU + CRC (根据配置决定是否白化)
+        crc_bits = self._int_to_bits(self._calculate_crc(pdu), 24)
         data_bits = np.concatenate([pdu_bits, crc_bits])
         if self.test_config.whitening:
-            data_bits = self._apply_whitening(data_bits, config.channel)
-
-        # 6. 组合完整数据包
-        packet_bits = np.concatenate([
-            preamble,
-            access_addr_bits,
-            data_bits
-        ])
-
-        return packet_bits
+            data_bits = self._apply_whitening(data_bits, self.config.channel)
+        return data_bits
 
     def generate_pdu(self) -> bytes:
         """生成 DTM PDU"""
@@ -881,3 +1039,51 @@ def create_test_packet(
         whitening=whitening
     )
     return RFTestPacket(config)
+
+
+def create_test_packet_sequence(
+    num_packets: int,
+    payload_type: RFTestPayloadType = RFTestPayloadType.PRBS9,
+    payload_length: int = 37,
+    channel: int = 0,
+    phy_mode: BLEPhyMode = BLEPhyMode.LE_1M,
+    access_address: int = 0x71764129,
+    whitening: bool = False,
+    continuous: bool = True,
+    prbs_phase: int = 0
+) -> List[RFTestPacket]:
+    """
+    创建连续发射的 RF Test 数据包序列 (长时间发射测试)
+
+    Args:
+        num_packets: 数据包数量
+        payload_type: 测试负载类型
+        payload_length: 负载长度 (0-255 bytes)
+        channel: 测试信道 (0-39)
+        phy_mode: PHY 模式
+        access_address: 接入地址 (默认 DTM 地址)
+        whitening: 是否启用白化 (默认关闭)
+        continuous: PRBS 负载是否跨数据包连续 (False 时每包从 prbs_phase 重新开始)
+        prbs_phase: 第一个数据包的 PRBS 起始相位 (比特)
+
+    Returns:
+        RFTestPacket 列表
+
+    Example:
+        # 100 个 PRBS15 数据包, 负载拼接后为连续的 PRBS15 序列
+        packets = create_test_packet_sequence(100, RFTestPayloadType.PRBS15, 255)
+        bits = np.concatenate([p.generate() for p in packets])
+    """
+    packets = []
+    for i in range(num_packets):
+        config = RFTestConfig(
+            phy_mode=phy_mode,
+            channel=channel,
+            payload_type=payload_type,
+            payload_length=payload_length,
+            access_address=access_address,
+            whitening=whitening,
+            prbs_phase=prbs_phase + (i * payload_length * 8 if continuous else 0)
+        )
+        packets.append(RFTestPacket(config))
+    return packets
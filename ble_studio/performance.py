@@ -9,9 +9,10 @@ from dataclasses import dataclass, field
 from enum import Enum
 import time
 
-from .packet import BLEPacket, BLEPacketConfig, BLEPhyMode, create_advertising_packet
+from .packet import BLEPacketBatch, BLEPacketConfig, BLEPhyMode
 from .modulator import BLEModulator, ModulatorConfig
 from .demodulator import BLEDemodulator, DemodulatorConfig
+from .channel import AWGNChannel, FrequencyOffset, TimingOffset
 
 
 class TestMode(Enum):
@@ -72,6 +73,9 @@ class TestReport:
 class BLEPerformanceTester:
     """BLE 性能测试器"""
 
+    # BER/PER 测试每块调制和解调的包数 (限制波形矩阵的内存)
+    BLOCK_PACKETS = 32
+
     def __init__(self, config: Optional[TestConfig] = None):
         self.config = config or TestConfig()
         self._setup()
@@ -101,63 +105,75 @@ class BLEPerformanceTester:
         )
         self.demodulator = BLEDemodulator(self.demod_config)
 
-    def _generate_random_payload(self, length: int) -> bytes:
-        """生成随机负载"""
-        return bytes(np.random.randint(0, 256, length, dtype=np.uint8))
-
-    def _generate_test_packet(self) -> Tuple[BLEPacket, np.ndarray]:
-        """生成测试数据包"""
-        config = self.config
-
-        # 随机广播地址
-        adv_address = bytes(np.random.randint(0, 256, 6, dtype=np.uint8))
-
-        # 随机负载
-        payload_data = self._generate_random_payload(config.payload_length)
-
-        # 创建数据包
-        packet = create_advertising_packet(
-            adv_address=adv_address,
-            adv_data=payload_data,
-            channel=config.channel
-        )
+        # 批量数据包生成器 (广播包, 负载 = 广播地址 + 广播数据)
+        self.packet_batch = BLEPacketBatch(BLEPacketConfig(
+            phy_mode=config.phy_mode,
+            channel=config.channel,
+            access_address=self.demod_config.access_address,
+            pdu_type=0x00,  # ADV_IND
+            crc_init=0x555555
+        ))
 
-        # 生成比特流
-        bits = packet.generate()
+    def _generate_test_bits(self, num_packets: int) -> np.ndarray:
+        """
+        批量生成测试数据包 (随机广播地址 + 随机负载)
 
-        return packet, bits
+        Returns:
+            比特矩阵 (num_packets, 数据包比特数)
+        """
+        payload_length = 6 + self.config.payload_length
+        payloads = np.random.randint(0, 256, (num_packets, payload_length), dtype=np.uint8)
+        return self.packet_batch.generate(payloads)
 
     def _apply_channel(self, signal: np.ndarray, snr_db: float) -> np.ndarray:
         """应用信道效应"""
         config = self.config
 
         # 添加 AWGN 噪声
-        output = self.modulator.add_noise(signal, snr_db)
+        output = AWGNChannel(snr_db, config.sample_rate, self.modulator.symbol_rate).apply(signal)
 
         # 添加频偏
         if config.frequency_offset != 0:
-            output = self.modulator.add_frequency_offset(output, config.frequency_offset)
+            output = FrequencyOffset(config.frequency_offset,
+                                     sample_rate=config.sample_rate).apply(output)
 
         # 添加定时偏移
         if config.timing_offset != 0:
-            output = self.modulator.add_timing_offset(output, config.timing_offset)
+            output = TimingOffset(config.timing_offset,
+                                  sample_rate=config.sample_rate).apply(output)
 
         return output
 
-    def _count_bit_errors(self, tx_bits: np.ndarray, rx_bits: np.ndarray) -> int:
-        """计算比特错误数"""
-        min_len = min(len(tx_bits), len(rx_bits))
-        return int(np.sum(tx_bits[:min_len] != rx_bits[:min_len]))
+    def _count_bit_errors(self, tx_bits: np.ndarray, rx_bits: np.ndarray,
+                          num_symbols: np.ndarray) -> np.ndarray:
+        """
+        逐行计算比特错误数
+
+        Args:
+            tx_bits: 发送比特矩阵 (N, 数据包比特数)
+            rx_bits: 符号判决矩阵 (N, 最大符号数)
+            num_symbols: 每行有效符号数 (N,)
+
+        Returns:
+            (N,) 错误比特数 (只比较两者都有效的比特)
+        """
+        num_bits = tx_bits.shape[1]
+        width = min(num_bits, rx_bits.shape[1])
+        compared = np.arange(width) < np.minimum(num_symbols, num_bits)[:, np.newaxis]
+        return np.sum((tx_bits[:, :width] != rx_bits[:, :width]) & compared, axis=1)
 
     def run_ber_test(self, snr_db: float, num_packets: int = None,
                      progress_callback: Callable = None) -> TestResult:
         """
         运行 BER 测试
 
+        测试包按 BLOCK_PACKETS 个一块调制、加信道和批量解调, 内存占用与包数量无关;
+        每块完成后调用一次进度回调。
+
         Args:
             snr_db: 信噪比 (dB)
             num_packets: 包数量
-            progress_callback: 进度回调函数
+            progress_callback: 进度回调函数 (已完成包数, 总包数, snr_db)
 
         Returns:
             TestResult 对象
@@ -172,40 +188,33 @@ class BLEPerformanceTester:
         rssi_sum = 0.0
         freq_offset_sum = 0.0
 
-        for i in range(num_packets):
-            # 生成测试包
-            packet, tx_bits = self._generate_test_packet()
+        # 全部测试包的比特 (随机负载一次生成)
+        tx_bits_matrix = self._generate_test_bits(num_packets)
+        num_bits = tx_bits_matrix.shape[1]
 
-            # 调制
-            tx_signal = self.modulator.modulate(tx_bits)
+        for start in range(0, num_packets, self.BLOCK_PACKETS):
+            tx_bits = tx_bits_matrix[start:start + self.BLOCK_PACKETS]
 
-            # 信道
-            rx_signal = self._apply_channel(tx_signal, snr_db)
+            # 调制, 信道 (逐包生成噪声, 随机数序列与逐包测试相同)
+            tx_signals = self.modulator.modulate_batch(tx_bits)
+            rx_signals = np.stack([self._apply_channel(tx_signal, snr_db) for tx_signal in tx_signals])
 
-            # 解调
-            result = self.demodulator.demodulate(rx_signal)
+            # 批量解调
+            results, rx_bits = self.demodulator.demodulate_batch(rx_signals, return_bits=True)
 
-            # 统计
-            total_packets += 1
-            total_bits += len(tx_bits)
+            # 统计: CRC 正确的包比较比特, 解调失败的包按全部比特错误计
+            bit_errors = self._count_bit_errors(tx_bits, rx_bits, results['num_symbols'])
+            decoded = results['success'] & results['crc_valid']
 
-            rssi_sum += result.rssi
-            freq_offset_sum += abs(result.freq_offset)
-
-            if result.success and result.crc_valid:
-                # 比较比特
-                rx_bits = result.bits
-                bit_errors = self._count_bit_errors(tx_bits, rx_bits)
-                error_bits += bit_errors
-                if bit_errors > 0:
-                    error_packets += 1
-            else:
-                # 解调失败, 假设所有比特错误
-                error_bits += len(tx_bits)
-                error_packets += 1
+            total_packets += len(tx_bits)
+            total_bits += tx_bits.size
+            error_bits += int(np.sum(np.where(decoded, bit_errors, num_bits)))
+            error_packets += int(np.sum(~decoded | (bit_errors > 0)))
+            rssi_sum += float(np.sum(results['rssi']))
+            freq_offset_sum += float(np.sum(np.abs(results['freq_offset'])))
 
             if progress_callback:
-                progress_callback(i + 1, num_packets, snr_db)
+                progress_callback(total_packets, num_packets, snr_db)
 
         # 计算结果
         ber = error_bits / total_bits if total_bits > 0 else 1.0
@@ -0,0 +1,134 @@
+"""
+RF Test (DTM) 伪随机序列 (查表法)
+
+- PRBS9:  x^9 + x^5 + 1, 初值 0x1FF, 周期 511 比特
+- PRBS15: x^15 + x^14 + 1, 初值 0x7FFF, 周期 32767 比特
+
+完整周期只在首次使用时逐比特生成一次并缓存, 之后任意长度、任意起始相位
+(周期内比特位置) 的负载都从预平铺的周期中切片得到 (自动回绕)。
+PRBSSequence 在连续的 DTM 数据包之间保持序列相位, 用于长时间发射测试。
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from .bitutils import bits_to_bytes
+
+
+# 阶数 -> (反馈抽头, 周期)
+# 右移 LFSR, 输出最低位, 反馈 = bit0 ^ bit[tap] 移入最高位
+PRBS_POLYNOMIALS: Dict[int, Tuple[int, int]] = {
+    9: (4, (1 << 9) - 1),      # x^9 + x^5 + 1
+    15: (1, (1 << 15) - 1),    # x^15 + x^14 + 1
+}
+
+# 预平铺余量: 覆盖最长 DTM 负载 (255 字节)
+_MAX_PAYLOAD_BITS = 255 * 8
+
+
+def _check_order(order: int):
+    """检查 PRBS 阶数"""
+    if order not in PRBS_POLYNOMIALS:
+        raise ValueError(f"不支持的 PRBS 阶数: {order} (支持 {sorted(PRBS_POLYNOMIALS)})")
+
+
+@lru_cache(maxsize=None)
+def prbs_period(order: int) -> np.ndarray:
+    """
+    PRBS 完整周期 (逐比特运行 LFSR, 只计算一次)
+
+    Args:
+        order: 阶数 (9 或 15)
+
+    Returns:
+        一个周期的比特序列 (uint8, 只读)
+    """
+    _check_order(order)
+    tap, period = PRBS_POLYNOMIALS[order]
+    lfsr = (1 << order) - 1  # 初值全 1
+
+    bits = np.zeros(period, dtype=np.uint8)
+    for i in range(period):
+        bits[i] = lfsr & 1
+        feedback = (lfsr ^ (lfsr >> tap)) & 1
+        lfsr = (lfsr >> 1) | (feedback << (order - 1))
+
+    bits.flags.writeable = False
+    return bits
+
+
+@lru_cache(maxsize=None)
+def _tiled_period(order: int) -> np.ndarray:
+    """周期平铺到 周期 + 最长负载, 周期内任意相位起始的负载都是一次切片"""
+    period = prbs_period(order)
+    repeats = -(-(len(period) + _MAX_PAYLOAD_BITS) // len(period))
+    tiled = np.tile(period, repeats)
+    tiled.flags.writeable = False
+    return tiled
+
+
+def prbs_bits(order: int, num_bits: int, phase: int = 0) -> np.ndarray:
+    """
+    获取 PRBS 比特序列
+
+    Args:
+        order: 阶数 (9 或 15)
+        num_bits: 比特数
+        phase: 起始相位 (周期内比特位置, 超出周期自动取模)
+
+    Returns:
+        比特序列 (uint8)
+    """
+    period = prbs_period(order)
+    phase %= len(period)
+    tiled = _tiled_period(order)
+    if phase + num_bits <= len(tiled):
+        return tiled[phase:phase + num_bits]
+    return np.resize(np.roll(period, -phase), num_bits)
+
+
+def prbs_bytes(order: int, length: int, phase: int = 0) -> bytes:
+    """
+    获取 PRBS 负载 (字节按 LSB first 打包, 与逐比特 LFSR 生成的负载一致)
+
+    Args:
+        order: 阶数 (9 或 15)
+        length: 负载字节数
+        phase: 起始相位 (比特)
+
+    Returns:
+        PRBS 负载
+    """
+    return bits_to_bytes(prbs_bits(order, length * 8, phase)).tobytes()
+
+
+class PRBSSequence:
+    """
+    连续 PRBS 序列 (在连续数据包之间保持相位)
+
+    示例:
+        sequence = PRBSSequence(9)
+        payload_1 = sequence.next_bytes(37)   # 相位 0 起
+        payload_2 = sequence.next_bytes(37)   # 紧接上一个负载
+    """
+
+    def __init__(self, order: int = 9, phase: int = 0):
+        _check_order(order)
+        self.order = order
+        self.period = PRBS_POLYNOMIALS[order][1]
+        self.phase = phase % self.period
+
+    def next_bits(self, num_bits: int) -> np.ndarray:
+        """取出后续 num_bits 个比特并推进相位"""
+        bits = prbs_bits(self.order, num_bits, self.phase)
+        self.phase = (self.phase + num_bits) % self.period
+        return bits
+
+    def next_bytes(self, length: int) -> bytes:
+        """取出后续 length 个字节并推进相位"""
+        return bits_to_bytes(self.next_bits(length * 8)).tobytes()
+
+    def reset(self, phase: int = 0):
+        """重置相位"""
+        self.phase = phase % self.period
@@ -0,0 +1,63 @@
+"""
+数值精度设置
+
+调制器、信道、解调器和 RF 测量支持两种复数精度:
+- complex128 (默认): float64 实部/虚部
+- complex64: float32 实部/虚部, 内存与带宽减半, 适合超长采集数据
+"""
+
+import numpy as np
+from typing import Optional, Union
+
+
+SUPPORTED_DTYPES = (np.dtype(np.complex128), np.dtype(np.complex64))
+
+DTypeLike = Union[str, type, np.dtype]
+
+
+def resolve_dtype(dtype: Optional[DTypeLike] = None,
+                  signal: Optional[np.ndarray] = None) -> np.dtype:
+    """
+    确定处理使用的复数精度
+
+    Args:
+        dtype: 指定精度 ('complex128' / 'complex64'), None 表示沿用输入信号精度
+        signal: 输入信号 (dtype 为 None 时参考)
+
+    Returns:
+        复数 dtype
+    """
+    if dtype is None:
+        if signal is not None and np.asarray(signal).dtype in (np.complex64, np.float32):
+            return np.dtype(np.complex64)
+        return np.dtype(np.complex128)
+
+    dtype = np.dtype(dtype)
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"不支持的精度: {dtype}, 可选 complex128 / complex64")
+    return dtype
+
+
+def real_dtype(dtype: DTypeLike) -> np.dtype:
+    """复数精度对应的实数精度 (complex64 -> float32)"""
+    return np.dtype(np.finfo(np.dtype(dtype)).dtype)
+
+
+def phasor(phase: np.ndarray, dtype: DTypeLike = np.complex128) -> np.ndarray:
+    """
+    生成单位相量 exp(1j * phase)
+
+    单精度时先在原精度下将相位折叠到 [0, 2π) 再转换为 float32,
+    避免长信号的累积相位过大导致 float32 精度损失。
+
+    Args:
+        phase: 相位 (rad)
+        dtype: 输出复数精度
+
+    Returns:
+        复数相量数组
+    """
+    dtype = np.dtype(dtype)
+    if dtype == np.complex128:
+        return np.exp(1j * phase)
+    return np.exp(1j * np.mod(phase, 2 * np.pi).astype(real_dtype(dtype)))
@@ -0,0 +1,185 @@
+"""
+GFSK 脉冲生成与缓存
+
+调制器的 GMSK 相位脉冲和解调器的高斯匹配滤波器只取决于少数几个参数,
+在进程内按参数缓存 (LRU), 重复创建相同配置的调制器/解调器时直接复用。
+
+注意: 缓存返回的数组为只读, 调用方不可原地修改。
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Tuple
+from scipy.special import erf
+
+from .cache import readonly
+
+
+# 缓存容量 (每种脉冲最多保留的配置数)
+PULSE_CACHE_SIZE = 64
+
+
+def qfunc(t: np.ndarray) -> np.ndarray:
+    """Q 函数: Q(t) = 0.5 * erfc(t / sqrt(2)) = 0.5 * (1 - erf(t / sqrt(2)))"""
+    return 0.5 * (1 - erf(t / np.sqrt(2)))
+
+
+@lru_cache(maxsize=PULSE_CACHE_SIZE)
+def gmsk_phase_pulse(samples_per_symbol: int, bt: float,
+                     pulse_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    生成 GMSK 相位脉冲和频率脉冲 (参考 MATLAB gmskmodparams)
+
+    MATLAB 实现:
+    1. 在高过采样率下计算精确的频率脉冲 g(t)
+    2. 对 g(t) 积分得到相位脉冲 q(t)
+    3. 下采样到目标采样率
+
+    相位脉冲已归一化 (终值 0.5), 与调制指数无关, 因此缓存键不包含调制指数。
+
+    Args:
+        samples_per_symbol: 每符号采样数
+        bt: 高斯滤波器带宽时间积
+        pulse_length: 脉冲长度 (符号数)
+
+    Returns:
+        (phase_pulse, freq_pulse), 只读数组
+    """
+    N = samples_per_symbol  # 每符号采样数
+    L = pulse_length        # 脉冲长度 (符号数)
+    BT = bt                 # 带宽时间积
+
+    # 使用高过采样率计算精确脉冲 (MATLAB 使用 min_os_ratio=64)
+    min_os_ratio = 64
+    R_up = max(1, int(np.ceil(min_os_ratio / N)))  # 上采样因子
+
+    tSym = 1.0  # 符号周期 (归一化)
+    Ts = tSym / (N * R_up)  # 过采样周期
+    Offset = Ts / 2  # 梯形积分偏移
+
+    # 精细时间轴
+    t = np.arange(Offset, L * tSym - Ts + Offset + Ts/2, Ts)
+    t = t[:L * N * R_up]  # 确保长度正确
+    t = t - tSym * (L / 2)  # 偏移到脉冲中心
+
+    # 高斯频率脉冲 g(t) (使用 Q 函数)
+    # g(t) = (1/2T) * [Q(K*(t-T/2)) - Q(K*(t+T/2))]
+    # K = 2*pi*BT / sqrt(ln(2))
+    K = 2 * np.pi * BT / np.sqrt(np.log(2))
+    g = (1 / (2 * tSym)) * (qfunc(K * (t - tSym / 2)) -
+                             qfunc(K * (t + tSym / 2)))
+
+    # 积分得到相位脉冲 q(t)
+    q = Ts * np.cumsum(g)
+
+    # 归一化使总相位变化为 0.5 (对应 h=0.5 时每符号 pi/2 相位)
+    g = g * 0.5 / q[-1] if q[-1] != 0 else g
+
+    # 下采样: 每 R_up 个样本取平均
+    g_len = len(g)
+    g_wrap = np.mean(g[:g_len // R_up * R_up].reshape(-1, R_up), axis=1)
+
+    # 缩放到采样率
+    g = Ts * R_up * g_wrap
+
+    # 最终相位脉冲 q (与 MATLAB gmskmodparams 一致)
+    # phase_pulse 有 N+1 个点: [0, cumsum(g)]
+    # phase_pulse[0] = 0, phase_pulse[N] = 0.5
+    # 调制时: phase = h * sym * phase_pulse * 2π
+    # 符号结束时 (sample N) 相位变化 = h * 0.5 * 2π = h * π
+    phase_pulse = np.concatenate([[0], np.cumsum(g)])  # N+1 个点
+
+    return readonly(phase_pulse), readonly(g)
+
+
+@lru_cache(maxsize=PULSE_CACHE_SIZE)
+def gaussian_matched_filter(samples_per_symbol: int, bt: float,
+                            filter_span: int = 3) -> np.ndarray:
+    """
+    生成高斯匹配滤波器 (用于接收端)
+
+    GFSK 的 FM 解调输出是频率偏移信号，它的波形是:
+    - 发送比特经过高斯滤波后的脉冲
+    - 对于 BT=0.5，脉冲会扩展到约 2 个符号周期
+
+    匹配滤波器应该匹配这个高斯脉冲形状。
+
+    Args:
+        samples_per_symbol: 每符号采样数
+        bt: 高斯滤波器 BT 积
+        filter_span: 滤波器长度 (符号数, 默认覆盖 3 个符号周期以捕获完整脉冲)
+
+    Returns:
+        单位能量的滤波器系数, 只读数组
+    """
+    filter_len = samples_per_symbol * filter_span
+
+    # 时间轴 (以符号周期为单位)
+    t = np.linspace(-filter_span/2, filter_span/2, filter_len)
+
+    # 高斯脉冲
+    # BT 积定义: B * T = bt, 其中 B 是 3dB 带宽, T 是符号周期
+    # 高斯函数: g(t) = exp(-t^2 / (2*sigma^2))
+    # 其中 sigma = sqrt(ln(2)) / (2*pi*B) = sqrt(ln(2)) / (2*pi*bt/T)
+    # 简化后: sigma = sqrt(ln(2)) / (2*pi*bt) (以符号周期为单位)
+    sigma = np.sqrt(np.log(2)) / (2 * np.pi * bt)
+    gaussian = np.exp(-t**2 / (2 * sigma**2))
+
+    # 归一化为单位能量
+    return readonly(gaussian / np.sqrt(np.sum(gaussian**2)))
+
+
+@lru_cache(maxsize=PULSE_CACHE_SIZE)
+def gfsk_symbol_table(samples_per_symbol: int, bt: float, pulse_length: int,
+                      modulation_index: float, num_phase_states: int) -> np.ndarray:
+    """
+    生成 GFSK 符号波形查找表 (Full Response)
+
+    调制指数 h = p/q 时, 每符号相位变化 ±h*π, 符号起始相位只能取
+    num_phase_states = 2q 个值 (π/q 的整数倍)。表项为各相位状态下
+    比特 0/1 对应的一个符号周期的复采样块。
+
+    Args:
+        samples_per_symbol: 每符号采样数
+        bt: 高斯滤波器带宽时间积
+        pulse_length: 脉冲长度 (符号数)
+        modulation_index: 调制指数 h
+        num_phase_states: 相位状态数 (2q)
+
+    Returns:
+        查找表 (num_phase_states, 2, samples_per_symbol), 只读数组
+    """
+    N = samples_per_symbol
+    h = modulation_index
+    phase_pulse, _ = gmsk_phase_pulse(samples_per_symbol, bt, pulse_length)
+
+    # 各状态起始相位: 0, 2π/S, 4π/S, ...
+    state_phase = 2 * np.pi * np.arange(num_phase_states) / num_phase_states
+
+    # 比特 0/1 -> 符号 -1/+1 的符号内相位斜坡
+    symbols = np.array([-1.0, 1.0])
+    ramps = (h * symbols)[:, np.newaxis] * phase_pulse[:N] * 2 * np.pi
+
+    table = np.exp(1j * (state_phase[:, np.newaxis, np.newaxis] + ramps))
+    return readonly(table)
+
+
+def pulse_cache_info() -> dict:
+    """
+    获取脉冲缓存统计 (用于性能分析)
+
+    Returns:
+        {缓存名: functools CacheInfo(hits, misses, maxsize, currsize)}
+    """
+    return {
+        'phase_pulse': gmsk_phase_pulse.cache_info(),
+        'gaussian_filter': gaussian_matched_filter.cache_info(),
+        'symbol_table': gfsk_symbol_table.cache_info(),
+    }
+
+
+def clear_pulse_cache():
+    """清空脉冲缓存并重置统计"""
+    gmsk_phase_pulse.cache_clear()
+    gaussian_matched_filter.cache_clear()
+    gfsk_symbol_table.cache_clear()
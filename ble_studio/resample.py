@@ -0,0 +1,120 @@
+"""
+有理数倍多相重采样
+
+导入的采集文件采样率往往不是符号率的整数倍 (例如 .bwv 的 120 MHz、12.5 MHz),
+直接取 int(sample_rate / symbol_rate) 会截断每符号采样数, 破坏定时。
+本模块将任意采样率转换为整数倍符号率的内部采样率:
+- 重采样比 up/down 由两个采样率的有理数比值确定
+- 抗混叠滤波器 (Kaiser 窗 FIR) 按 (up, down) 在进程内缓存
+- 使用 scipy.signal.resample_poly 多相滤波, 只计算保留的输出采样点
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional
+from scipy.signal import firwin, resample_poly
+
+from .cache import readonly
+from .pulse import PULSE_CACHE_SIZE
+
+
+# 有理数近似的最大分母 (采样率比值)
+MAX_RATIO_DENOMINATOR = 1000
+
+# 内部处理的最小每符号采样数 (FM 解调和定时恢复所需)
+MIN_SAMPLES_PER_SYMBOL = 4
+
+
+@dataclass(frozen=True)
+class ResamplePlan:
+    """重采样方案"""
+    samples_per_symbol: int   # 内部每符号采样数
+    internal_rate: float      # 内部采样率 (Hz)
+    up: int = 1               # 上采样因子
+    down: int = 1             # 下采样因子
+
+    @property
+    def required(self) -> bool:
+        """是否需要重采样"""
+        return self.up != self.down
+
+
+def plan_resampling(sample_rate: float, symbol_rate: float,
+                    max_samples_per_symbol: Optional[int] = None) -> ResamplePlan:
+    """
+    确定内部采样率和重采样比
+
+    采样率是符号率的整数倍且不超过 max_samples_per_symbol 时不重采样;
+    否则选取不超过实际比值 (且在 [MIN_SAMPLES_PER_SYMBOL, max_samples_per_symbol] 内)
+    的整数每符号采样数作为内部采样率。
+
+    Args:
+        sample_rate: 外部采样率 (Hz)
+        symbol_rate: 符号率 (Hz)
+        max_samples_per_symbol: 内部每符号采样数上限, None 表示不限制 (只处理非整数倍)
+
+    Returns:
+        ResamplePlan, up/down 为 外部采样率 -> 内部采样率 的比值
+    """
+    ratio = Fraction(sample_rate / symbol_rate).limit_denominator(MAX_RATIO_DENOMINATOR)
+    if ratio.denominator == 1 and (max_samples_per_symbol is None
+                                   or ratio <= max_samples_per_symbol):
+        sps = int(ratio)
+        return ResamplePlan(sps, sample_rate)
+
+    sps = int(ratio)
+    if max_samples_per_symbol is not None:
+        sps = min(sps, max_samples_per_symbol)
+    sps = max(sps, MIN_SAMPLES_PER_SYMBOL)
+
+    internal_rate = sps * symbol_rate
+    rate_ratio = Fraction(internal_rate / sample_rate).limit_denominator(MAX_RATIO_DENOMINATOR)
+    return ResamplePlan(sps, internal_rate, rate_ratio.numerator, rate_ratio.denominator)
+
+
+@lru_cache(maxsize=PULSE_CACHE_SIZE)
+def resample_filter(up: int, down: int, half_length: int = 10,
+                    kaiser_beta: float = 5.0) -> np.ndarray:
+    """
+    设计重采样抗混叠滤波器 (与 scipy.signal.resample_poly 默认设计一致)
+
+    Args:
+        up: 上采样因子
+        down: 下采样因子
+        half_length: 每个多相分支的半长度
+        kaiser_beta: Kaiser 窗参数
+
+    Returns:
+        FIR 滤波器系数, 只读数组
+    """
+    max_rate = max(up, down)
+    taps = firwin(2 * half_length * max_rate + 1, 1.0 / max_rate,
+                  window=('kaiser', kaiser_beta))
+    return readonly(taps)
+
+
+def resample(signal: np.ndarray, up: int, down: int, axis: int = -1) -> np.ndarray:
+    """
+    有理数倍重采样 (输出长度 ceil(len * up / down))
+
+    滤波器系数转换为信号精度, complex64 输入保持 complex64 输出。
+
+    Args:
+        signal: 输入信号
+        up: 上采样因子
+        down: 下采样因子
+        axis: 重采样的轴
+
+    Returns:
+        重采样后的信号
+    """
+    signal = np.asarray(signal)
+    if up == down:
+        return signal
+
+    taps = resample_filter(up, down)
+    if signal.dtype in (np.complex64, np.float32):
+        taps = taps.astype(np.float32)
+    return resample_poly(signal, up, down, axis=axis, window=taps)
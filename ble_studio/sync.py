@@ -0,0 +1,295 @@
+"""
+多接入地址同步检测 (FFT 软相关)
+
+在匹配滤波后的鉴频输出 (软值) 上同时搜索多个接入地址:
+1. 去除局部直流 (频偏引起的鉴频偏移) 后按符号间隔排成 (符号数, 每符号采样数) 矩阵,
+   每一列是一个采样相位的符号序列; 去直流后按标称幅度限幅 (低 SNR 时相位跳变脉冲会主导窗口能量)
+2. 信号只做一次实数 FFT, 与每个同步模板 (前导码 + 接入地址, NRZ) 的频谱相乘后逆变换,
+   一次得到该模板在所有采样位置上的相关值, 复杂度 O(N log N) / 模板
+3. 相关值按窗口能量归一化 (归一化相关系数, -1 ~ 1), 与信号幅度和 SNR 无关
+4. 过门限的相邻位置 (间隔不超过 1 个符号) 合并为一个命中, 取相关峰,
+   并用相邻采样的抛物线插值得到亚采样精度的定时
+
+用于同时嗅探多个连接 (每个连接一个接入地址); 解调单个已知接入地址的数据包见 BLEDemodulator。
+
+硬判决比特流上的同步字搜索 (find_sync_word) 按比特并行实现: 比特流打包为每个比特位置起始的
+uint64 窗口, 与同步字 XOR 后 popcount 得到汉明距离, 作为 BLEDemodulator 同步检测的可选后端。
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from scipy import fft as scipy_fft
+from scipy import ndimage
+from typing import Iterator, List, Optional, Sequence
+
+from .packet import BLEPhyMode, preamble_bits, coded_spreading
+from .coded_phy import coded_sync_pattern
+from .bitutils import int_to_bits, bits_to_int, popcount
+
+
+# 默认同步门限 (归一化相关系数): 未编码 PHY 图样 40/48 符号, Coded PHY 图样 336 符号
+SYNC_SCORE_THRESHOLD = 0.8
+CODED_SYNC_SCORE_THRESHOLD = 0.6
+
+# 单个接入地址时改用时域直接相关的最大输入符号数 (交叉点见 SyncDetector._correlate_phases)
+DIRECT_CORRELATION_SYMBOLS = 256
+
+
+def sync_pattern(access_address: int, phy_mode: BLEPhyMode = BLEPhyMode.LE_1M) -> np.ndarray:
+    """
+    同步图样: 前导码 + 接入地址 (Coded PHY 为前导码 + 编码后的接入地址)
+
+    Args:
+        access_address: 接入地址
+        phy_mode: PHY 模式
+
+    Returns:
+        符号序列 (发送顺序), uint8
+    """
+    if coded_spreading(phy_mode):
+        return coded_sync_pattern(access_address)
+    return np.concatenate([preamble_bits(access_address, phy_mode), int_to_bits(access_address, 32)])
+
+
+@dataclass
+class SyncHit:
+    """同步检测结果"""
+    access_address: int                # 命中的接入地址
+    position: int                      # 同步图样第一个符号的采样位置 (相关峰, 检测器采样率)
+    timing: float                      # 亚采样精度的位置 (抛物线插值, 检测器采样率)
+    score: float                       # 归一化相关系数 (-1 ~ 1)
+
+
+class SyncDetector:
+    """
+    多接入地址同步检测器
+
+    示例:
+        detector = SyncDetector([0x8E89BED6, 0x50654A2D], samples_per_symbol=8)
+        for hit in detector.detect(filtered):
+            print(hex(hit.access_address), hit.timing, hit.score)
+    """
+
+    def __init__(self, access_addresses: Sequence[int], phy_mode: BLEPhyMode = BLEPhyMode.LE_1M,
+                 samples_per_symbol: int = 8, threshold: Optional[float] = None,
+                 clip_level: Optional[float] = None):
+        """
+        Args:
+            access_addresses: 待搜索的接入地址
+            phy_mode: PHY 模式 (同一检测器内所有接入地址的同步图样等长)
+            samples_per_symbol: 输入信号每符号采样数
+            threshold: 同步门限 (归一化相关系数), None 按 PHY 取默认值
+            clip_level: 去直流后的限幅电平 (通常取符号标称幅度), None 不限幅
+        """
+        self.access_addresses = [int(aa) for aa in access_addresses]
+        if not self.access_addresses:
+            raise ValueError("至少需要一个接入地址")
+        self.phy_mode = phy_mode
+        self.samples_per_symbol = samples_per_symbol
+        if threshold is None:
+            threshold = CODED_SYNC_SCORE_THRESHOLD if coded_spreading(phy_mode) else SYNC_SCORE_THRESHOLD
+        self.threshold = threshold
+        self.clip_level = clip_level
+
+        # 同步模板 (K, L), NRZ
+        self.templates = np.stack([
+            2 * sync_pattern(aa, phy_mode).astype(np.float64) - 1 for aa in self.access_addresses
+        ])
+        self.pattern_length = self.templates.shape[1]
+
+    def correlate(self, filtered: np.ndarray) -> np.ndarray:
+        """
+        归一化相关
+
+        Args:
+            filtered: 匹配滤波后的鉴频信号
+
+        Returns:
+            (K, P) 归一化相关系数, P 为可完整容纳同步图样的采样位置数;
+            [k, p] 为第 k 个接入地址的同步图样从采样 p 开始时的相关值
+        """
+        sps = self.samples_per_symbol
+        length = self.pattern_length
+        num_symbols = len(filtered) // sps
+        if num_symbols < length:
+            return np.zeros((len(self.templates), 0))
+
+        # 局部直流: 向后一个同步图样长度的滑动平均 (窗口正好覆盖同步图样)
+        usable = np.asarray(filtered[:num_symbols * sps], dtype=np.float32)
+        window = length * sps
+        usable = usable - ndimage.uniform_filter1d(usable, size=window, mode='nearest', origin=-(window // 2))
+        if self.clip_level is not None:
+            np.clip(usable, -self.clip_level, self.clip_level, out=usable)
+        # (sps, 符号数): 每行一个采样相位, FFT 沿连续内存的最后一维
+        phases = np.ascontiguousarray(usable.reshape(num_symbols, sps).T)
+
+        # 每个位置同步窗口内的能量: 向后滑动平均 (ndimage 内部按 double 累加, 长采集无累积误差),
+        # 归一化系数 1 / sqrt(能量 * L) = 1 / (L * sqrt(均值)) 原地计算
+        inv_norm = ndimage.uniform_filter1d(np.square(phases), size=length, axis=1, mode='constant',
+                                            origin=-(length // 2))[:, :num_symbols - length + 1]
+        np.maximum(inv_norm, 0, out=inv_norm)
+        np.sqrt(inv_norm, out=inv_norm)
+        inv_norm *= length
+        np.maximum(inv_norm, 1e-12, out=inv_norm)
+        np.reciprocal(inv_norm, out=inv_norm)
+
+        scores = np.empty((len(self.templates), num_symbols - length + 1, sps), dtype=np.float32)
+        for k, correlation in enumerate(self._correlate_phases(phases)):
+            # 交织回采样顺序: 位置 = 符号 * sps + 相位
+            np.multiply(correlation, inv_norm, out=scores[k].T)
+        return scores.reshape(len(self.templates), -1)
+
+    def _correlate_phases(self, phases: np.ndarray) -> Iterator[np.ndarray]:
+        """
+        未归一化的相关: 信号频谱只计算一次, 每个模板一次逆变换 (FFT)
+
+        单个模板且输入不超过 DIRECT_CORRELATION_SYMBOLS 个符号时改用逐相位 np.correlate:
+        实测 (LE 1M/2M/Coded, 每符号 4 或 8 采样, 整个 correlate 耗时) 交叉点约为 256-512 个符号
+        (8 采样/符号时 2k-4k 采样), 更短的输入时域相关快 10-30%; 之后 FFT 通常快 1.2-2 倍
+        (百万采样级的输入两者接近持平),
+        多个模板时 FFT 共用信号频谱, 总是更快。
+
+        Args:
+            phases: (sps, 符号数) 去直流后的各相位符号序列
+
+        Yields:
+            每个模板 (sps, 位置数) 的相关值
+        """
+        length = self.pattern_length
+        num_symbols = phases.shape[1]
+        if len(self.templates) == 1 and num_symbols <= DIRECT_CORRELATION_SYMBOLS:
+            template = self.templates[0].astype(np.float32)
+            yield np.stack([np.correlate(phase, template, mode='valid') for phase in phases])
+            return
+
+        nfft = scipy_fft.next_fast_len(num_symbols + length - 1, real=True)
+        spectrum = scipy_fft.rfft(phases, n=nfft, axis=1)
+        template_spectra = scipy_fft.rfft(self.templates[:, ::-1].astype(np.float32), n=nfft, axis=1)
+        for template_spectrum in template_spectra:
+            yield scipy_fft.irfft(spectrum * template_spectrum, n=nfft, axis=1)[:, length - 1:num_symbols]
+
+    def detect(self, filtered: np.ndarray) -> List[SyncHit]:
+        """
+        同步检测
+
+        Args:
+            filtered: 匹配滤波后的鉴频信号
+
+        Returns:
+            同步命中列表 (按位置排序)
+        """
+        sps = self.samples_per_symbol
+        scores = self.correlate(filtered)
+
+        hits = []
+        for aa, score in zip(self.access_addresses, scores):
+            above = np.flatnonzero(score > self.threshold)
+            if len(above) == 0:
+                continue
+            for group in np.split(above, np.flatnonzero(np.diff(above) > sps) + 1):
+                peak = group[np.argmax(score[group])]
+                hits.append(SyncHit(aa, int(peak), peak + _parabolic_offset(score, peak), float(score[peak])))
+
+        hits.sort(key=lambda hit: hit.position)
+        return hits
+
+
+def _parabolic_offset(values: np.ndarray, peak: int) -> float:
+    """峰值与左右相邻点拟合抛物线, 返回顶点相对峰值的偏移 (-0.5 ~ 0.5)"""
+    if peak == 0 or peak == len(values) - 1:
+        return 0.0
+    left, center, right = values[peak - 1], values[peak], values[peak + 1]
+    curvature = left - 2 * center + right
+    if curvature >= 0:
+        return 0.0
+    return float(np.clip(0.5 * (left - right) / curvature, -0.5, 0.5))
+
+
+# 比特并行同步字搜索: 每次处理的比特位置数 (分块限制中间数组的内存)
+SYNC_BLOCK_BITS = 1 << 20
+
+# 同步字分段长度: uint64 窗口从任意字节起始读取后最多右移 7 位, 保证 56 个有效比特
+_SEGMENT_BITS = 56
+
+
+def max_sync_errors(pattern_length: int, threshold: float = 0.8) -> int:
+    """
+    相关门限 -> 最大允许比特错误数
+
+    NRZ 相关值 = L - 2 * 错误数, 相关值 > threshold * L 等价于错误数 <= 返回值
+    (40 比特同步字 0.8 门限为 3, 48 比特为 4)。
+    """
+    errors = np.arange(pattern_length + 1)
+    return int(np.count_nonzero(pattern_length - 2 * errors > pattern_length * threshold)) - 1
+
+
+def sync_word_errors(bits: np.ndarray, pattern: np.ndarray) -> np.ndarray:
+    """
+    同步字在每个比特位置的汉明距离 (XOR + popcount, 按 uint64 字并行)
+
+    比特流按 LSB first 打包为字节, 位置 p = 64j + 8o + s 的窗口为从第 8j + o 个字节起
+    读取的 uint64 右移 s 位: 每个字节偏移 o (0-7) 是一个 uint64 视图, 每个位偏移 s (0-7)
+    一次移位, 与同步字 XOR、屏蔽后 popcount。同步字按 56 比特分段累加
+    (Coded PHY 的 336 符号为 6 段)。长比特流按 SYNC_BLOCK_BITS 分块处理。
+
+    Args:
+        bits: 硬判决比特流 (N,), 非零即为 1
+        pattern: 同步字比特 (L,)
+
+    Returns:
+        (N - L + 1,) 错误比特数 (int32); N < L 时为空数组
+    """
+    bits = np.asarray(bits)
+    pattern = np.asarray(pattern)
+    length = len(pattern)
+    num_positions = len(bits) - length + 1
+    if num_positions <= 0:
+        return np.zeros(0, dtype=np.int32)
+
+    # 同步字分段: (段起始字节, 段比特, 掩码)
+    segments = []
+    for offset in range(0, length, _SEGMENT_BITS):
+        segment = pattern[offset:offset + _SEGMENT_BITS]
+        mask = np.uint64((1 << len(segment)) - 1)
+        segments.append((offset // 8, np.uint64(bits_to_int(segment)), mask))
+
+    errors = np.empty(num_positions, dtype=np.int32)
+    for start in range(0, num_positions, SYNC_BLOCK_BITS):
+        count = min(SYNC_BLOCK_BITS, num_positions - start)
+        num_words = -(-count // 64)
+
+        # 字节流补零到最后一个窗口 (最后一段起始字节 + 最大字节偏移 + 8 字节) 之后
+        data = np.packbits(bits[start:start + count + length - 1], bitorder='little')
+        packed = np.zeros(num_words * 8 + segments[-1][0] + 16, dtype=np.uint8)
+        packed[:len(data)] = data
+
+        # (字节偏移, 位偏移, 字) 转置为 (字, 字节偏移, 位偏移) 即比特位置顺序
+        block = np.zeros((8, 8, num_words), dtype=np.uint16)
+        windows = np.empty(num_words, dtype=np.uint64)
+        for byte_offset in range(8):
+            for segment_byte, word, mask in segments:
+                view = np.frombuffer(packed, dtype='<u8', offset=byte_offset + segment_byte, count=num_words)
+                for shift in range(8):
+                    np.right_shift(view, np.uint64(shift), out=windows)
+                    np.bitwise_xor(windows, word, out=windows)
+                    np.bitwise_and(windows, mask, out=windows)
+                    block[byte_offset, shift] += popcount(windows)
+        errors[start:start + count] = block.transpose(2, 0, 1).ravel()[:count]
+    return errors
+
+
+def find_sync_word(bits: np.ndarray, pattern: np.ndarray, max_errors: Optional[int] = None) -> np.ndarray:
+    """
+    比特并行同步字搜索
+
+    Args:
+        bits: 硬判决比特流
+        pattern: 同步字比特 (如前导码 + 接入地址, 40/48 比特)
+        max_errors: 最大允许错误比特数, None 按 0.8 相关门限 (见 max_sync_errors)
+
+    Returns:
+        匹配位置 (同步字第一个比特的索引, 升序)
+    """
+    if max_errors is None:
+        max_errors = max_sync_errors(len(pattern))
+    return np.flatnonzero(sync_word_errors(bits, pattern) <= max_errors)
@@ -0,0 +1,402 @@
+"""
+连接事件流量仿真 (长时间多数据包采集)
+
+按 BLE 链路层时序生成一段空口流量, 用于接收机压力测试:
+1. 广播事件: ADV_IND 依次在 37/38/39 信道发送, 事件间隔 advInterval + advDelay (0-10 ms 随机)
+2. 最后一个广播事件中, 发起者在 ADV_IND 之后 T_IFS 回复 CONNECT_IND
+3. 连接事件: 首个锚点 = CONNECT_IND 结束 + 1.25 ms + WinOffset, 之后每个连接间隔一次;
+   每个事件主设备发送数据 PDU, 从设备在 T_IFS 后回复, 信道按 CSA#1 / CSA#2 跳频
+
+全部以生成器实现, 按时间顺序逐个产生数据包, 跳频序列按块计算,
+调制波形按 (信道, 接入地址, CRC 初值, PDU) 缓存 (LRU, 容量固定),
+仿真数分钟空口时间时内存占用不随时长增长。
+
+输出为跟随跳频的接收机采集到的基带信号 (各数据包均在其信道的零中频)。
+"""
+
+import csv
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from .packet import (
+    BLEPacket, BLEPacketConfig, BLEPhyMode, DataChannelConfig, DataChannelPDU,
+    create_advertising_packet, create_connect_ind, coded_spreading,
+)
+from .coded_phy import coded_packet_length
+from .modulator import BLEModulator, ModulatorConfig
+from .hopping import csa1_channel_sequence, csa2_channel_sequence
+from .precision import resolve_dtype
+
+
+# 帧间隔 T_IFS (s)
+T_IFS = 150e-6
+
+# 链路层时间单位 (连接间隔 / 窗口偏移, s)
+CONNECTION_TIME_UNIT = 1.25e-3
+
+# advDelay 上限 (s)
+ADV_DELAY_MAX = 10e-3
+
+# 广播接入地址和 CRC 初值
+ADV_ACCESS_ADDRESS = 0x8E89BED6
+ADV_CRC_INIT = 0x555555
+
+# 每次计算的跳频序列长度 (连接事件数)
+HOP_BLOCK_EVENTS = 1024
+
+# 数据包索引文件列
+INDEX_FIELDS = ['timestamp', 'sample_offset', 'num_samples', 'channel', 'kind',
+                'access_address', 'event_counter', 'pdu']
+
+
+@dataclass
+class TrafficConfig:
+    """流量仿真配置"""
+    phy_mode: BLEPhyMode = BLEPhyMode.LE_1M
+    sample_rate: float = 8e6
+    duration: float = 1.0                          # 仿真空口时长 (s)
+    dtype: str = 'complex64'                       # 输出精度
+
+    # 广播
+    adv_address: bytes = bytes([0x11, 0x22, 0x33, 0x44, 0x55, 0x66])
+    adv_data: bytes = bytes([0x02, 0x01, 0x06])
+    adv_channels: Tuple[int, ...] = (37, 38, 39)
+    adv_interval: float = 20e-3                    # advInterval (s), 不含 advDelay
+    adv_channel_gap: float = 1e-3                  # 同一广播事件内相邻 ADV_IND 起点间隔 (s)
+    num_adv_events: int = 3                        # 建立连接前的广播事件数 (>= 1)
+
+    # 连接 (CONNECT_IND 参数)
+    init_address: bytes = bytes([0xA1, 0xA2, 0xA3, 0xA4, 0xA5, 0xA6])
+    connection: DataChannelConfig = field(default_factory=DataChannelConfig)
+    interval: int = 6                              # 连接间隔 (单位 1.25 ms)
+    win_offset: int = 0                            # 发送窗口偏移 (单位 1.25 ms)
+    channel_selection: int = 1                     # 信道选择算法: 1 (CSA#1) / 2 (CSA#2)
+
+    # 数据: 主设备依次循环发送的 L2CAP 负载 (空则发送空 PDU), 从设备回复空 PDU
+    central_payloads: Tuple[bytes, ...] = ()
+
+    waveform_cache_size: int = 512                 # 调制波形缓存容量 (数据包数)
+    seed: Optional[int] = None                     # advDelay 随机种子
+
+
+@dataclass
+class TrafficEvent:
+    """流量中的一个数据包"""
+    timestamp: float                   # 起始时间 (s)
+    channel: int                       # 信道号
+    kind: str                          # ADV_IND / CONNECT_IND / CENTRAL / PERIPHERAL
+    pdu: bytes                         # 完整 PDU (含头部)
+    access_address: int
+    crc_init: int
+    event_counter: int = -1            # 连接事件计数器 (广播为 -1)
+
+
+class TrafficGenerator:
+    """
+    连接事件流量生成器
+
+    示例:
+        traffic = TrafficGenerator(TrafficConfig(duration=60.0, central_payloads=(b'hello',)))
+        for timestamp, channel, iq in traffic.bursts():
+            ...
+        traffic.write('capture.cf32', index_path='capture.csv')
+    """
+
+    def __init__(self, config: Optional[TrafficConfig] = None):
+        self.config = config or TrafficConfig()
+        self._update_parameters()
+
+    def _update_parameters(self):
+        """更新内部参数"""
+        config = self.config
+
+        if config.num_adv_events < 1:
+            raise ValueError(f"广播事件数至少为 1: {config.num_adv_events}")
+        if not config.adv_channels:
+            raise ValueError("广播信道列表不能为空")
+        if config.channel_selection not in (1, 2):
+            raise ValueError(f"信道选择算法须为 1 或 2: {config.channel_selection}")
+
+        self.dtype = resolve_dtype(config.dtype)
+        self.modulator = BLEModulator(ModulatorConfig(
+            phy_mode=config.phy_mode,
+            sample_rate=config.sample_rate,
+            dtype=config.dtype
+        ))
+        self.symbol_rate = self.modulator.symbol_rate
+        self.preamble_bytes = 2 if config.phy_mode == BLEPhyMode.LE_2M else 1
+        self.spreading = coded_spreading(config.phy_mode)
+
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def air_time(self, pdu_length: int) -> float:
+        """数据包空口时长 (s): 前导码 + 接入地址 + PDU + CRC (Coded PHY 含 FEC 编码)"""
+        if self.spreading:
+            return coded_packet_length(pdu_length, self.spreading) / self.symbol_rate
+        return (self.preamble_bytes + 4 + pdu_length + 3) * 8 / self.symbol_rate
+
+    def _adv_pdu(self, channel: int) -> bytes:
+        """ADV_IND PDU"""
+        config = self.config
+        return create_advertising_packet(config.adv_address, config.adv_data, channel).generate_pdu()
+
+    def _connect_ind_pdu(self, channel: int) -> bytes:
+        """CONNECT_IND PDU"""
+        config = self.config
+        connection = config.connection
+        return create_connect_ind(
+            init_address=config.init_address,
+            adv_address=config.adv_address,
+            access_address=connection.access_address,
+            crc_init=connection.crc_init,
+            win_offset=config.win_offset,
+            interval=config.interval,
+            channel_map=connection.channel_map,
+            hop=connection.hop_increment,
+            channel=channel
+        ).generate_pdu()
+
+    def _data_pdus(self, event_counter: int) -> Tuple[bytes, bytes]:
+        """连接事件中主/从设备的数据 PDU (无丢包, SN/NESN 每个事件翻转)"""
+        payloads = self.config.central_payloads
+        bit = event_counter & 1
+        if payloads:
+            central = DataChannelPDU.create_data_pdu(
+                payloads[event_counter % len(payloads)], nesn=bit, sn=bit
+            )
+        else:
+            central = DataChannelPDU.create_empty_pdu(nesn=bit, sn=bit)
+        peripheral = DataChannelPDU.create_empty_pdu(nesn=bit ^ 1, sn=bit)
+        return central, peripheral
+
+    def _data_channels(self) -> Iterator[int]:
+        """连接事件信道序列 (按块计算跳频序列)"""
+        config = self.config
+        connection = config.connection
+        counter = 0
+        last_unmapped = 0
+        while True:
+            if config.channel_selection == 1:
+                unmapped, channels = csa1_channel_sequence(
+                    HOP_BLOCK_EVENTS, connection.hop_increment,
+                    connection.channel_map, last_unmapped
+                )
+                last_unmapped = int(unmapped[-1])
+            else:
+                channels = csa2_channel_sequence(
+                    HOP_BLOCK_EVENTS, connection.access_address,
+                    connection.channel_map, start_counter=counter
+                )
+            counter += HOP_BLOCK_EVENTS
+            for channel in channels:
+                yield int(channel)
+
+    def schedule(self) -> Iterator[TrafficEvent]:
+        """
+        按时间顺序产生数据包 (不调制)
+
+        Yields:
+            TrafficEvent, 只包含在 duration 内发送完毕的数据包
+        """
+        config = self.config
+        connection = config.connection
+        rng = np.random.default_rng(config.seed)
+
+        def fits(event: TrafficEvent) -> bool:
+            return event.timestamp + self.air_time(len(event.pdu)) <= config.duration
+
+        # 1. 广播事件, 最后一个事件在第一个广播信道上建立连接
+        event_start = 0.0
+        for index in range(config.num_adv_events):
+            for i, channel in enumerate(config.adv_channels):
+                adv = TrafficEvent(event_start + i * config.adv_channel_gap, channel, 'ADV_IND',
+                                   self._adv_pdu(channel), ADV_ACCESS_ADDRESS, ADV_CRC_INIT)
+                if not fits(adv):
+                    return
+                yield adv
+
+                if index == config.num_adv_events - 1:
+                    pdu = self._connect_ind_pdu(channel)
+                    connect = TrafficEvent(adv.timestamp + self.air_time(len(adv.pdu)) + T_IFS,
+                                           channel, 'CONNECT_IND', pdu,
+                                           ADV_ACCESS_ADDRESS, ADV_CRC_INIT)
+                    if not fits(connect):
+                        return
+                    yield connect
+                    break
+            event_start += config.adv_interval + rng.uniform(0, ADV_DELAY_MAX)
+
+        # 2. 连接事件
+        connect_end = connect.timestamp + self.air_time(len(connect.pdu))
+        first_anchor = connect_end + CONNECTION_TIME_UNIT * (1 + config.win_offset)
+        interval = config.interval * CONNECTION_TIME_UNIT
+
+        for counter, channel in enumerate(self._data_channels()):
+            anchor = first_anchor + counter * interval
+            central_pdu, peripheral_pdu = self._data_pdus(counter)
+
+            central = TrafficEvent(anchor, channel, 'CENTRAL', central_pdu,
+                                   connection.access_address, connection.crc_init, counter & 0xFFFF)
+            if not fits(central):
+                return
+            yield central
+
+            peripheral = TrafficEvent(anchor + self.air_time(len(central_pdu)) + T_IFS, channel,
+                                      'PERIPHERAL', peripheral_pdu,
+                                      connection.access_address, connection.crc_init, counter & 0xFFFF)
+            if not fits(peripheral):
+                return
+            yield peripheral
+
+    def waveform(self, event: TrafficEvent) -> np.ndarray:
+        """
+        数据包调制波形 (LRU 缓存)
+
+        Args:
+            event: 数据包
+
+        Returns:
+            IQ 复基带信号 (只读, 缓存共享)
+        """
+        key = (event.channel, event.access_address, event.crc_init, event.pdu)
+        iq = self._cache.get(key)
+        if iq is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return iq
+
+        self._misses += 1
+        bits = BLEPacket(BLEPacketConfig(
+            phy_mode=self.config.phy_mode,
+            channel=event.channel,
+            access_address=event.access_address,
+            crc_init=event.crc_init,
+            pdu=event.pdu
+        )).generate()
+        iq = self.modulator.modulate(bits).astype(self.dtype, copy=False)
+        iq.flags.writeable = False
+
+        self._cache[key] = iq
+        if len(self._cache) > self.config.waveform_cache_size:
+            self._cache.popitem(last=False)
+        return iq
+
+    def cache_info(self) -> dict:
+        """调制波形缓存统计"""
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'size': len(self._cache),
+            'maxsize': self.config.waveform_cache_size,
+        }
+
+    def _events_with_waveforms(self) -> Iterator[Tuple[TrafficEvent, np.ndarray]]:
+        """按时间顺序产生 (数据包, 调制波形)"""
+        for event in self.schedule():
+            yield event, self.waveform(event)
+
+    def bursts(self) -> Iterator[Tuple[float, int, np.ndarray]]:
+        """
+        按时间顺序产生数据包波形
+
+        Yields:
+            (起始时间 s, 信道号, IQ 复基带信号)
+        """
+        for event, iq in self._events_with_waveforms():
+            yield event.timestamp, event.channel, iq
+
+    def blocks(self, block_size: int = 1 << 18,
+               index: Optional[List[dict]] = None) -> Iterator[np.ndarray]:
+        """
+        连续采集信号 (数据包之间为零), 按固定长度分块产生
+
+        Args:
+            block_size: 每块采样点数
+            index: 可选, 传入列表时追加每个数据包的位置信息 (写索引文件用)
+
+        Yields:
+            IQ 信号块, 拼接后长度为 round(duration * sample_rate)
+        """
+        fs = self.config.sample_rate
+        num_samples = int(round(self.config.duration * fs))
+        block_start = 0
+        block = np.zeros(min(block_size, num_samples), dtype=self.dtype)
+
+        for event, iq in self._events_with_waveforms():
+            position = int(round(event.timestamp * fs))
+            iq = iq[:max(0, num_samples - position)]
+            if index is not None:
+                index.append({
+                    'timestamp': event.timestamp,
+                    'sample_offset': position,
+                    'num_samples': len(iq),
+                    'channel': event.channel,
+                    'kind': event.kind,
+                    'access_address': f"0x{event.access_address:08X}",
+                    'event_counter': event.event_counter,
+                    'pdu': event.pdu.hex(),
+                })
+
+            while len(iq):
+                if position >= block_start + len(block):
+                    # 数据包起点在当前块之后: 输出当前块
+                    yield block
+                    block_start += len(block)
+                    block = np.zeros(min(block_size, num_samples - block_start), dtype=self.dtype)
+                    continue
+                offset = position - block_start
+                count = min(len(iq), len(block) - offset)
+                block[offset:offset + count] += iq[:count]
+                iq = iq[count:]
+                position += count
+
+        # 剩余部分 (最后一个数据包之后为零)
+        while block_start < num_samples:
+            yield block
+            block_start += len(block)
+            block = np.zeros(min(block_size, num_samples - block_start), dtype=self.dtype)
+
+    def write(self, path: Union[str, BinaryIO], index_path: Optional[str] = None,
+              block_size: int = 1 << 18) -> int:
+        """
+        将连续采集信号写入文件 (complex64 交织 I/Q, 即 .cf32 格式)
+
+        Args:
+            path: 输出文件路径或已打开的二进制文件
+            index_path: 可选, 数据包索引 CSV 路径 (时间、采样点位置、信道、PDU 等)
+            block_size: 每次写入的采样点数
+
+        Returns:
+            写入的采样点数
+        """
+        index: Optional[List[dict]] = None
+        index_file = None
+        if index_path is not None:
+            index = []
+            index_file = open(index_path, 'w', newline='')
+            writer = csv.DictWriter(index_file, fieldnames=INDEX_FIELDS)
+            writer.writeheader()
+
+        own_file = isinstance(path, str)
+        output = open(path, 'wb') if own_file else path
+        total = 0
+        try:
+            for block in self.blocks(block_size, index):
+                output.write(block.astype(np.complex64, copy=False).tobytes())
+                total += len(block)
+                if index:
+                    # 索引逐块写出, 不在内存中累积
+                    writer.writerows(index)
+                    index.clear()
+            if index:
+                writer.writerows(index)
+        finally:
+            if own_file:
+                output.close()
+            if index_file is not None:
+                index_file.close()
+        return total
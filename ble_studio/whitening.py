@@ -0,0 +1,112 @@
+"""
+BLE 数据白化 (查表法)
+
+白化多项式: x^7 + x^4 + 1, 7 位 LFSR 初值为 信道号 | 0x40。
+白化序列周期为 127 比特且只与信道号有关, 因此模块加载时为信道 0-39
+各生成一个周期, 任意长度的序列由周期平铺得到, 白化/去白化为一次向量化异或。
+周期预先平铺到最长 BLE 数据包的长度, 常见长度下取序列只是一次切片 (视图)。
+
+发送 (BLEPacket) 和接收 (BLEDemodulator) 共用同一份缓存。
+"""
+
+import numpy as np
+from typing import Union
+
+
+# 白化序列周期 (2^7 - 1)
+WHITENING_PERIOD = 127
+
+# 信道数 (0-39)
+NUM_CHANNELS = 40
+
+# 预平铺长度 (周期整数倍): 覆盖最长 PDU + CRC (2 + 255 + 3 字节) 加上周期内任意起始偏移
+_MAX_DATA_BITS = (2 + 255 + 3) * 8
+WHITENING_TILE_LENGTH = (_MAX_DATA_BITS // WHITENING_PERIOD + 2) * WHITENING_PERIOD
+
+
+def _generate_period(channel: int) -> np.ndarray:
+    """逐比特运行 LFSR 生成一个周期的白化序列"""
+    lfsr = (channel & 0x3F) | 0x40
+
+    sequence = np.zeros(WHITENING_PERIOD, dtype=np.uint8)
+    for i in range(WHITENING_PERIOD):
+        sequence[i] = lfsr & 1
+        # x^7 + x^4 + 1
+        feedback = ((lfsr >> 6) ^ (lfsr >> 3)) & 1
+        lfsr = ((lfsr << 1) | feedback) & 0x7F
+
+    return sequence
+
+
+def _generate_table() -> np.ndarray:
+    """生成所有信道的白化序列周期 (NUM_CHANNELS, WHITENING_PERIOD)"""
+    table = np.stack([_generate_period(channel) for channel in range(NUM_CHANNELS)])
+    table.flags.writeable = False
+    return table
+
+
+WHITENING_TABLE = _generate_table()
+_WHITENING_TILED = np.tile(WHITENING_TABLE, WHITENING_TILE_LENGTH // WHITENING_PERIOD)
+_WHITENING_TILED.flags.writeable = False
+
+
+def _check_channel(channel: Union[int, np.ndarray]):
+    """检查信道号"""
+    if isinstance(channel, (int, np.integer)):
+        valid = 0 <= channel < NUM_CHANNELS
+    else:
+        channel = np.asarray(channel)
+        valid = channel.size == 0 or (channel.min() >= 0 and channel.max() < NUM_CHANNELS)
+    if not valid:
+        raise ValueError(f"信道号超出范围 (0-{NUM_CHANNELS - 1}): {channel}")
+
+
+def whitening_sequence(channel: int, length: int, offset: int = 0) -> np.ndarray:
+    """
+    获取白化序列
+
+    Args:
+        channel: 信道号 (0-39)
+        length: 序列长度 (比特)
+        offset: 起始比特位置 (用于分段处理)
+
+    Returns:
+        白化序列 (uint8, 0/1), 只读
+    """
+    _check_channel(channel)
+    offset %= WHITENING_PERIOD
+    if offset + length <= WHITENING_TILE_LENGTH:
+        return _WHITENING_TILED[channel, offset:offset + length]
+
+    period = np.roll(WHITENING_TABLE[channel], -offset)
+    sequence = np.resize(period, length)
+    sequence.flags.writeable = False
+    return sequence
+
+
+def apply_whitening(bits: np.ndarray, channel: Union[int, np.ndarray],
+                    offset: int = 0) -> np.ndarray:
+    """
+    白化/去白化 (两者相同, 均为与白化序列异或)
+
+    Args:
+        bits: 比特流 (长度 L), 或批量比特矩阵 (N, L)
+        channel: 信道号; 批量时可为 (N,) 数组, 每行使用各自信道
+        offset: 比特流第一个比特在白化序列中的位置
+
+    Returns:
+        白化后的比特 (uint8)
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    length = bits.shape[-1]
+
+    if np.ndim(channel) == 0:
+        return bits ^ whitening_sequence(int(channel), length, offset)
+
+    _check_channel(channel)
+    offset %= WHITENING_PERIOD
+    if offset + length <= WHITENING_TILE_LENGTH:
+        return bits ^ _WHITENING_TILED[np.asarray(channel), offset:offset + length]
+
+    index = (np.arange(length) + offset) % WHITENING_PERIOD
+    return bits ^ WHITENING_TABLE[np.asarray(channel)[:, np.newaxis], index]
@@ -0,0 +1,293 @@
+"""
+宽带多信道复合波形生成
+
+在 2.4 GHz 频段内合成包含多个 BLE 数据包的宽带采集信号 (如 40-80 MHz 带宽),
+各数据包位于其信道对应的频率偏移上, 可以同时发送或相互重叠。
+用于测试信道化接收机。
+
+合成方法 (WOLA, 加权重叠相加):
+1. 每个数据包在单信道采样率 (默认 8 Msps) 下调制
+2. 在全局帧网格上分帧 (Hann 窗, 50% 重叠), 每帧 FFT
+3. 频谱按信道频率偏移直接放入宽带频谱的对应频点 (无需逐包变频)
+4. 每个宽带帧只做一次 IFFT, 重叠相加得到宽带信号
+
+宽带帧按块处理, 内存占用与仿真时长无关。
+"""
+
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .packet import BLEPhyMode, channel_to_frequency
+from .modulator import BLEModulator, ModulatorConfig
+from .precision import resolve_dtype, phasor
+
+
+@dataclass
+class WidebandConfig:
+    """宽带合成配置"""
+    sample_rate: float = 80e6          # 宽带采样率 (Hz)
+    center_freq: float = 2441e6        # 宽带中心射频频率 (Hz)
+    channel_sample_rate: float = 8e6   # 单信道调制采样率 (Hz), 须整除宽带采样率
+    frame_length: int = 256            # 单信道 WOLA 帧长 (采样点), 帧移为一半
+    block_frames: int = 1024           # 每次 IFFT 处理的宽带帧数
+    dtype: str = 'complex128'          # 输出精度: complex128 / complex64
+
+
+@dataclass
+class WidebandBurst:
+    """宽带信号中的一个数据包"""
+    bits: np.ndarray                   # 数据包比特流 (前导码 + 接入地址 + PDU + CRC)
+    channel: int                       # 信道号 (0-39)
+    start_time: float = 0.0            # 起始时间 (s)
+    phy_mode: BLEPhyMode = BLEPhyMode.LE_1M
+    power_db: float = 0.0              # 相对功率 (dB)
+    freq_offset: float = 0.0           # 载波频偏 (Hz)
+
+
+@dataclass
+class _BurstFrames:
+    """数据包在全局帧网格上的频谱"""
+    first_frame: int                   # 第一帧的全局帧序号
+    spectra: np.ndarray                # (帧数, 宽带频点数) 中本数据包占用的列
+    bins: np.ndarray                   # 占用的宽带频点序号
+    last_frame: int = field(init=False)
+
+    def __post_init__(self):
+        self.last_frame = self.first_frame + len(self.spectra) - 1
+
+
+class WidebandSynthesizer:
+    """
+    宽带多信道复合波形合成器
+
+    示例:
+        synth = WidebandSynthesizer(WidebandConfig(sample_rate=80e6))
+        bursts = [WidebandBurst(bits, channel=37, start_time=0.0),
+                  WidebandBurst(bits, channel=38, start_time=50e-6)]
+        signal = synth.synthesize(bursts, duration=1e-3)
+    """
+
+    def __init__(self, config: Optional[WidebandConfig] = None):
+        self.config = config or WidebandConfig()
+        self._update_parameters()
+
+    def _update_parameters(self):
+        """更新内部参数"""
+        config = self.config
+
+        ratio = config.sample_rate / config.channel_sample_rate
+        if abs(ratio - round(ratio)) > 1e-9 or round(ratio) < 1:
+            raise ValueError(
+                f"宽带采样率 {config.sample_rate / 1e6} MHz 须为单信道采样率 "
+                f"{config.channel_sample_rate / 1e6} MHz 的整数倍"
+            )
+        if config.frame_length % 2:
+            raise ValueError(f"帧长须为偶数: {config.frame_length}")
+
+        self.interpolation = int(round(ratio))
+        self.dtype = resolve_dtype(config.dtype)
+
+        # 单信道帧: 长度 M, 帧移 H = M/2; 宽带帧: 长度 M * R, 帧移 H * R
+        M = config.frame_length
+        self.hop = M // 2
+        self.wideband_frame_length = M * self.interpolation
+        self.wideband_hop = self.hop * self.interpolation
+
+        # 周期 Hann 窗, 50% 重叠时逐点求和为 1
+        self.window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(M) / M)
+
+        # 频点间隔 (单信道与宽带相同)
+        self.bin_spacing = config.channel_sample_rate / M
+        self._signed_bins = np.fft.fftfreq(M, 1.0 / M).astype(int)
+
+        self._modulators: Dict[BLEPhyMode, BLEModulator] = {}
+
+    def channel_offset(self, channel: int) -> float:
+        """信道中心相对宽带中心的频率偏移 (Hz)"""
+        return channel_to_frequency(channel) - self.config.center_freq
+
+    def _modulator(self, phy_mode: BLEPhyMode) -> BLEModulator:
+        """获取单信道调制器 (按 PHY 模式复用)"""
+        modulator = self._modulators.get(phy_mode)
+        if modulator is None:
+            modulator = BLEModulator(ModulatorConfig(
+                phy_mode=phy_mode,
+                sample_rate=self.config.channel_sample_rate
+            ))
+            self._modulators[phy_mode] = modulator
+        return modulator
+
+    def _first_frame(self, burst: WidebandBurst) -> int:
+        """数据包覆盖的第一个全局帧序号"""
+        start = int(round(burst.start_time * self.config.channel_sample_rate))
+        return (start - self.config.frame_length) // self.hop + 1
+
+    def _burst_frames(self, burst: WidebandBurst) -> _BurstFrames:
+        """
+        调制数据包并计算其在全局帧网格上的频谱
+
+        Args:
+            burst: 数据包
+
+        Returns:
+            _BurstFrames
+        """
+        config = self.config
+        M = config.frame_length
+        H = self.hop
+        fs = config.channel_sample_rate
+
+        # 频率偏移对齐到频点网格
+        # 信道主瓣 (±符号率/2) 须位于宽带内; 单信道频谱超出宽带的部分 (带外残余) 折叠回带内
+        offset_hz = self.channel_offset(burst.channel)
+        offset_bin = int(round(offset_hz / self.bin_spacing))
+        symbol_rate = self._modulator(burst.phy_mode).symbol_rate
+        if abs(offset_hz) + symbol_rate / 2 > config.sample_rate / 2:
+            raise ValueError(
+                f"信道 {burst.channel} ({channel_to_frequency(burst.channel) / 1e6:.0f} MHz) "
+                f"超出宽带范围"
+            )
+
+        # 起始时间对齐到单信道采样点
+        start = int(round(burst.start_time * fs))
+        if start < 0:
+            raise ValueError(f"起始时间不能为负: {burst.start_time}")
+
+        # 单信道调制 (频偏和频点网格余量在单信道采样率下施加)
+        signal = self._modulator(burst.phy_mode).modulate(burst.bits)
+        signal = signal * 10 ** (burst.power_db / 20)
+        residual = burst.freq_offset + offset_hz - offset_bin * self.bin_spacing
+        if residual != 0:
+            t = np.arange(start, start + len(signal)) / fs
+            signal = signal * phasor(2 * np.pi * residual * t)
+
+        # 覆盖数据包的全局帧 [first, last]
+        first = self._first_frame(burst)
+        last = (start + len(signal) - 1) // H
+
+        segment = np.zeros((last - first) * H + M, dtype=complex)
+        segment[start - first * H:start - first * H + len(signal)] = signal
+
+        frames = np.lib.stride_tricks.sliding_window_view(segment, M)[::H]
+        spectra = np.fft.fft(frames * self.window, axis=1)
+
+        # 频谱搬移: 第 k 帧起点的载波相位 = 2π * offset_bin * k * H / M = π * offset_bin * k
+        # IFFT 长度为 M * R, 乘以 R 保持幅度
+        frame_index = np.arange(first, last + 1)
+        sign = np.where((offset_bin * frame_index) % 2, -1.0, 1.0)
+        spectra *= (sign * self.interpolation)[:, np.newaxis]
+
+        bins = (offset_bin + self._signed_bins) % self.wideband_frame_length
+        return _BurstFrames(first, spectra.astype(self.dtype, copy=False), bins)
+
+    def synthesize_blocks(self, bursts: Sequence[WidebandBurst],
+                          duration: Optional[float] = None) -> Iterator[np.ndarray]:
+        """
+        分块合成宽带信号 (生成器)
+
+        Args:
+            bursts: 数据包列表
+            duration: 信号时长 (s), None 表示到最后一个数据包结束
+
+        Yields:
+            连续的宽带 IQ 信号块, 拼接后为完整信号
+        """
+        config = self.config
+        M_wb = self.wideband_frame_length
+        H_wb = self.wideband_hop
+
+        # 按起始时间排序, 逐块计算涉及的数据包频谱
+        pending = sorted(bursts, key=lambda b: b.start_time)
+
+        if duration is None:
+            end = 0.0
+            for burst in pending:
+                sps = self._modulator(burst.phy_mode).samples_per_symbol
+                end = max(end, burst.start_time + len(burst.bits) * sps / config.channel_sample_rate)
+            duration = end
+        num_samples = int(round(duration * config.sample_rate))
+
+        # 帧 k 覆盖宽带采样 [k * H_wb, k * H_wb + M_wb), 从 k = -1 开始保证起点处窗函数求和为 1;
+        # 处理完帧 k < end_frame 后, 采样 [0, end_frame * H_wb) 全部完成
+        end_frame = -(-num_samples // H_wb)
+        active: List[_BurstFrames] = []
+        next_burst = 0
+        tail = np.zeros(M_wb - H_wb, dtype=self.dtype)
+        emitted = -H_wb  # 已输出到的采样位置 (帧 -1 起点)
+
+        for block_start in range(-1, end_frame, config.block_frames):
+            block_end = min(block_start + config.block_frames, end_frame)
+            num_block = block_end - block_start
+
+            # 第一帧落在本块之前的数据包进入活动列表
+            while next_burst < len(pending) and \
+                    self._first_frame(pending[next_burst]) < block_end:
+                active.append(self._burst_frames(pending[next_burst]))
+                next_burst += 1
+
+            # 组装宽带频谱
+            spectrum = np.zeros((num_block, M_wb), dtype=self.dtype)
+            for frames in active:
+                lo = max(frames.first_frame, block_start)
+                hi = min(frames.last_frame + 1, block_end)
+                if lo < hi:
+                    spectrum[lo - block_start:hi - block_start, frames.bins] += \
+                        frames.spectra[lo - frames.first_frame:hi - frames.first_frame]
+            active = [f for f in active if f.last_frame >= block_end]
+
+            # 每帧一次 IFFT, 重叠相加
+            frames_td = np.fft.ifft(spectrum, axis=1)
+            output = np.zeros(num_block * H_wb + M_wb - H_wb, dtype=self.dtype)
+            output[:len(tail)] += tail
+            for i in range(2):
+                # 50% 重叠: 前半帧与后半帧分别相加
+                half = frames_td[:, i * H_wb:(i + 1) * H_wb].reshape(-1)
+                output[i * H_wb:i * H_wb + len(half)] += half
+            tail = output[num_block * H_wb:].copy()
+            block = output[:num_block * H_wb]
+
+            # 丢弃帧 -1 的前半部分 (负时间), 截断到信号时长
+            skip = max(0, -emitted)
+            block = block[skip:]
+            emitted += skip
+            block = block[:max(0, num_samples - emitted)]
+            emitted += len(block)
+            if len(block):
+                yield block
+
+    def synthesize(self, bursts: Sequence[WidebandBurst],
+                   duration: Optional[float] = None) -> np.ndarray:
+        """
+        合成宽带信号
+
+        Args:
+            bursts: 数据包列表
+            duration: 信号时长 (s), None 表示到最后一个数据包结束
+
+        Returns:
+            宽带 IQ 复基带信号 (中心频率为 config.center_freq)
+        """
+        blocks = list(self.synthesize_blocks(bursts, duration))
+        if not blocks:
+            return np.zeros(0, dtype=self.dtype)
+        return np.concatenate(blocks)
+
+
+def synthesize_wideband(bursts: Sequence[WidebandBurst], sample_rate: float = 80e6,
+                        center_freq: float = 2441e6,
+                        duration: Optional[float] = None) -> np.ndarray:
+    """
+    便捷函数: 合成宽带多信道信号
+
+    Args:
+        bursts: 数据包列表
+        sample_rate: 宽带采样率 (Hz)
+        center_freq: 宽带中心射频频率 (Hz)
+        duration: 信号时长 (s), None 表示到最后一个数据包结束
+
+    Returns:
+        宽带 IQ 复基带信号
+    """
+    synth = WidebandSynthesizer(WidebandConfig(sample_rate=sample_rate, center_freq=center_freq))
+    return synth.synthesize(bursts, duration)
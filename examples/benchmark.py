@@ -12,11 +12,13 @@ BLE Studio 解调器性能测试工具
     --phy MODE      PHY 模式: 1M, 2M, all (默认: all)
     --quick         快速模式 (10 次试验)
     --verbose       显示详细信息
+    --check-precision  单精度回归检查 (complex64 与 complex128 在灵敏度点的 PER 一致)
 """
 
 import sys
 import argparse
 import numpy as np
+from typing import Optional
 
 sys.path.insert(0, '.')
 
@@ -28,7 +30,7 @@ from ble_studio import (
 
 
 def test_per(phy_mode: BLEPhyMode, ebn0_db: float, num_trials: int = 50,
-             verbose: bool = False) -> dict:
+             verbose: bool = False, dtype: str = 'complex128') -> dict:
     """
     测试指定 Eb/N0 下的 PER
 
@@ -37,6 +39,7 @@ def test_per(phy_mode: BLEPhyMode, ebn0_db: float, num_trials: int = 50,
         ebn0_db: Eb/N0 (dB)
         num_trials: 试验次数
         verbose: 是否显示详细信息
+        dtype: 数值精度 (信道和解调器沿用调制器输出精度)
 
     Returns:
         测试结果字典
@@ -48,48 +51,51 @@ def test_per(phy_mode: BLEPhyMode, ebn0_db: float, num_trials: int = 50,
     crc_errors = 0
     sync_errors = 0
 
+    # 创建测试包 (各次试验使用相同的测试包)
+    packet = create_test_packet(
+        payload_type=RFTestPayloadType.PRBS9,
+        payload_length=37,
+        channel=0,
+        phy_mode=phy_mode,
+        whitening=False
+    )
+    bits = packet.generate()
+
+    # 调制: 所有试验的发送信号一次批量生成
+    modulator = BLEModulator(ModulatorConfig(
+        phy_mode=phy_mode,
+        sample_rate=sample_rate,
+        modulation_index=0.5,
+        bt=0.5,
+        dtype=dtype
+    ))
+    tx_signals = modulator.modulate_batch(np.broadcast_to(bits, (num_trials, len(bits))))
+
+    # 信道与解调器 (各次试验复用)
+    channel = BLEChannel(ChannelConfig(
+        channel_type=ChannelType.AWGN,
+        sample_rate=sample_rate,
+        symbol_rate=symbol_rate,
+        snr_db=ebn0_db,
+        frequency_offset=0
+    ))
+    demodulator = BLEDemodulator(DemodulatorConfig(
+        phy_mode=phy_mode,
+        sample_rate=sample_rate,
+        access_address=0x71764129,
+        channel=0,
+        whitening=False,
+        use_matched_filter=True,
+        bt=0.5
+    ))
+
     for trial in range(num_trials):
         np.random.seed(trial * 1000 + int(ebn0_db * 100))
 
-        # 创建测试包
-        packet = create_test_packet(
-            payload_type=RFTestPayloadType.PRBS9,
-            payload_length=37,
-            channel=0,
-            phy_mode=phy_mode,
-            whitening=False
-        )
-        bits = packet.generate()
-
-        # 调制
-        modulator = BLEModulator(ModulatorConfig(
-            phy_mode=phy_mode,
-            sample_rate=sample_rate,
-            modulation_index=0.5,
-            bt=0.5
-        ))
-        tx_signal = modulator.modulate(bits)
-
         # 添加噪声
-        channel = BLEChannel(ChannelConfig(
-            channel_type=ChannelType.AWGN,
-            sample_rate=sample_rate,
-            symbol_rate=symbol_rate,
-            snr_db=ebn0_db,
-            frequency_offset=0
-        ))
-        rx_signal = channel.apply(tx_signal)
+        rx_signal = channel.apply(tx_signals[trial])
 
         # 解调
-        demodulator = BLEDemodulator(DemodulatorConfig(
-            phy_mode=phy_mode,
-            sample_rate=sample_rate,
-            access_address=0x71764129,
-            channel=0,
-            whitening=False,
-            use_matched_filter=True,
-            bt=0.5
-        ))
         result = demodulator.demodulate(rx_signal)
 
         if not result.success:
@@ -135,6 +141,43 @@ def find_threshold(phy_mode: BLEPhyMode, target_per: float = 30.0,
     return (low + high) / 2
 
 
+def check_precision(num_trials: int = 200, tolerance: Optional[float] = None) -> bool:
+    """
+    单精度回归检查
+
+    在灵敏度点 (本仿真链路约 30% PER 处) 以相同随机种子分别运行
+    complex128 和 complex64 链路, 比较 PER。
+
+    Args:
+        num_trials: 每个测试点的试验次数
+        tolerance: 允许的 PER 偏差 (百分点); None 时按试验次数取两个 PER 估计之差的 3σ,
+            即 3 * sqrt(2 p (1 - p) / num_trials) (200 次、p ≈ 30% 时约 14 个百分点)
+
+    Returns:
+        是否通过
+    """
+    print(f"{'PHY':>6} {'Eb/N0(dB)':>10} {'complex128':>11} {'complex64':>10} {'偏差':>7} {'状态':>6}")
+    print("-" * 58)
+
+    passed = True
+    for phy_mode, name, ebn0 in [(BLEPhyMode.LE_1M, 'LE_1M', 15.5),
+                                 (BLEPhyMode.LE_2M, 'LE_2M', 13.5)]:
+        per_double = test_per(phy_mode, ebn0, num_trials)['per']
+        per_single = test_per(phy_mode, ebn0, num_trials, dtype='complex64')['per']
+        delta = per_single - per_double
+        if tolerance is None:
+            p = per_double / 100
+            limit = 300 * np.sqrt(2 * p * (1 - p) / num_trials)
+        else:
+            limit = tolerance
+        ok = abs(delta) <= limit
+        passed = passed and ok
+        print(f"{name:>6} {ebn0:>10.1f} {per_double:>10.1f}% {per_single:>9.1f}% "
+              f"{delta:>+6.1f} {'PASS' if ok else 'FAIL':>6}")
+
+    return passed
+
+
 def print_comparison():
     """打印与 CEVA 的对比说明"""
     print("\n" + "=" * 60)
@@ -159,6 +202,7 @@ def main():
   python examples/benchmark.py --quick      # 快速测试
   python examples/benchmark.py --phy 1M     # 只测试 LE 1M
   python examples/benchmark.py --trials 100 # 100 次试验
+  python examples/benchmark.py --check-precision  # 单精度回归检查
         """
     )
     parser.add_argument('--trials', type=int, default=50,
@@ -171,9 +215,19 @@ def main():
                         help='显示详细信息')
     parser.add_argument('--find-threshold', action='store_true',
                         help='查找 30%% PER 对应的门限')
+    parser.add_argument('--check-precision', action='store_true',
+                        help='单精度回归检查 (失败时返回非零退出码)')
 
     args = parser.parse_args()
 
+    if args.check_precision:
+        print("=" * 60)
+        print("单精度回归检查 (complex64 vs complex128)")
+        print("=" * 60)
+        trials = 50 if args.quick else max(args.trials, 200)
+        print(f"试验次数: {trials}\n")
+        sys.exit(0 if check_precision(trials) else 1)
+
     num_trials = 10 if args.quick else args.trials
 
     print("=" * 60)
@@ -0,0 +1,762 @@
+"""
+BLE Studio 基带算法吞吐量测试工具
+
+测量各处理环节的执行速度 (采样点/秒), 用于评估蒙特卡洛仿真耗时。
+
+用法:
+    python examples/benchmark_throughput.py [选项]
+
+选项:
+    --suite NAME    测试项: modulator, construction, partial, resample, wideband, nco, crc, template, whitening, bitutils, batch, coded, viterbi, sniffer, sync, sync_word, demod_batch, prbs, hopping, access_address, traffic, all (默认: all)
+    --repeat N      每项重复次数 (默认: 20)
+    --length N      负载长度 (字节, 默认: 251)
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, '.')
+
+from ble_studio import (
+    BLEModulator, ModulatorConfig, BLEDemodulator, DemodulatorConfig, BLEPhyMode,
+    pulse_cache_info, clear_pulse_cache, create_test_packet,
+    WidebandSynthesizer, WidebandConfig, WidebandBurst,
+    NCOModulator, NCOConfig, IQExporter, IQExportConfig,
+    crc24, crc24_batch, BLEPacketTemplate, BLEPacketBatch, BLEPacketConfig, BLEPacket,
+    TrafficGenerator, TrafficConfig, generate_access_addresses,
+    encode_fec_block, decode_fec_block, SyncDetector, sync_pattern, find_sync_word
+)
+from ble_studio.whitening import apply_whitening
+from ble_studio.bitutils import bytes_to_bits, bits_to_bytes
+from ble_studio.prbs import prbs_bytes, prbs_period
+from ble_studio.packet import next_data_channel
+from ble_studio.hopping import csa1_channel_sequence, csa2_channel_sequence
+
+
+def timeit(func, repeat: int) -> float:
+    """返回单次调用的最短耗时 (秒)"""
+    func()  # 预热
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def modulate_loop(modulator: BLEModulator, bits: np.ndarray) -> np.ndarray:
+    """参考实现: 逐符号循环调制 (向量化之前的 BLEModulator.modulate)"""
+    config = modulator.config
+    N = modulator.samples_per_symbol
+    h = config.modulation_index
+    nSym = len(bits)
+
+    symbols = 2 * bits.astype(np.float64) - 1
+    phase = np.zeros(nSym * N)
+    cumulative_phase = 0.0
+
+    for i in range(nSym):
+        sym = symbols[i]
+        start = i * N
+        phase[start:start + N] = cumulative_phase + h * sym * modulator.phase_pulse[:N] * 2 * np.pi
+        cumulative_phase += h * sym * modulator.phase_pulse[N] * 2 * np.pi
+
+    if config.center_freq != 0:
+        t = np.arange(len(phase)) / config.sample_rate
+        phase += 2 * np.pi * config.center_freq * t
+
+    return np.exp(1j * phase)
+
+
+def crc24_bitwise(data: bytes, init: int = 0x555555) -> int:
+    """参考实现: 逐比特 CRC24 (查表法之前的 BLEPacket._calculate_crc)"""
+    bits = []
+    for byte in data:
+        for i in range(8):
+            bits.append((byte >> i) & 1)
+
+    poly = 0x00065B
+    crc = init
+    for bit in bits:
+        msb = (crc >> 23) & 1
+        crc = (crc << 1) & 0xFFFFFF
+        if msb ^ bit:
+            crc ^= poly
+
+    crc_rev = 0
+    for i in range(24):
+        if crc & (1 << i):
+            crc_rev |= (1 << (23 - i))
+    return crc_rev
+
+
+def whitening_lfsr(bits: np.ndarray, channel: int) -> np.ndarray:
+    """参考实现: 逐比特 LFSR 去白化 (预计算缓存之前的 BLEDemodulator._remove_whitening)"""
+    lfsr = (channel & 0x3F) | 0x40
+
+    result = np.zeros(len(bits), dtype=np.uint8)
+    for i in range(len(bits)):
+        result[i] = bits[i] ^ (lfsr & 1)
+        feedback = ((lfsr >> 6) ^ (lfsr >> 3)) & 1
+        lfsr = ((lfsr << 1) | feedback) & 0x7F
+
+    return result
+
+
+def bytes_to_bits_loop(data: bytes) -> np.ndarray:
+    """参考实现: 逐比特循环 (bitutils 之前的 BLEPacket._bytes_to_bits)"""
+    bits = []
+    for byte in data:
+        for i in range(8):
+            bits.append((byte >> i) & 1)
+    return np.array(bits, dtype=np.uint8)
+
+
+def bits_to_bytes_loop(bits: np.ndarray) -> bytes:
+    """参考实现: 逐比特循环 (bitutils 之前的 BLEDemodulator._bits_to_bytes)"""
+    result = []
+    for i in range(0, len(bits) - 7, 8):
+        byte = 0
+        for j in range(8):
+            byte |= (bits[i + j] << j)
+        result.append(byte)
+    return bytes(result)
+
+
+def prbs15_lfsr(length: int) -> bytes:
+    """参考实现: 逐比特 LFSR (周期缓存之前的 RFTestPayloadGenerator.generate_prbs15)"""
+    lfsr = 0x7FFF
+    result = []
+    for _ in range(length):
+        byte = 0
+        for bit_idx in range(8):
+            byte |= ((lfsr & 1) << bit_idx)
+            feedback = ((lfsr >> 0) ^ (lfsr >> 1)) & 1
+            lfsr = ((lfsr >> 1) | (feedback << 14)) & 0x7FFF
+        result.append(byte)
+    return bytes(result)
+
+
+def bench_modulator(repeat: int, payload_length: int):
+    """调制器: 向量化实现 vs 逐符号循环"""
+    print("\n=== 调制器 (modulate) ===")
+    rng = np.random.default_rng(0)
+
+    print(f"{'PHY':>6} {'采样率':>8} {'循环 (Msps)':>12} {'向量化 (Msps)':>14} {'加速比':>8} {'查找表 (Msps)':>14}")
+    print("-" * 70)
+
+    for phy_mode, name in [(BLEPhyMode.LE_1M, '1M'), (BLEPhyMode.LE_2M, '2M')]:
+        # 前导码 + 接入地址 + 头部 + 负载 + CRC
+        preamble_len = 16 if phy_mode == BLEPhyMode.LE_2M else 8
+        num_bits = preamble_len + 32 + (2 + payload_length + 3) * 8
+        bits = rng.integers(0, 2, num_bits).astype(np.uint8)
+
+        for sample_rate in [8e6, 16e6, 32e6]:
+            modulator = BLEModulator(ModulatorConfig(
+                phy_mode=phy_mode,
+                sample_rate=sample_rate
+            ))
+            num_samples = num_bits * modulator.samples_per_symbol
+
+            # 确认两种实现输出一致
+            assert np.array_equal(modulator.modulate(bits), modulate_loop(modulator, bits))
+
+            lut_modulator = BLEModulator(ModulatorConfig(
+                phy_mode=phy_mode,
+                sample_rate=sample_rate,
+                use_lut=True
+            ))
+
+            t_loop = timeit(lambda: modulate_loop(modulator, bits), repeat)
+            t_vec = timeit(lambda: modulator.modulate(bits), repeat)
+            t_lut = timeit(lambda: lut_modulator.modulate(bits), repeat)
+
+            print(f"{name:>6} {sample_rate / 1e6:>6.0f}M {num_samples / t_loop / 1e6:>12.2f} "
+                  f"{num_samples / t_vec / 1e6:>14.2f} {t_loop / t_vec:>7.1f}x "
+                  f"{num_samples / t_lut / 1e6:>14.2f}")
+
+
+def bench_construction(repeat: int, payload_length: int):
+    """调制器/解调器构造: 脉冲缓存未命中 vs 命中"""
+    print("\n=== 调制器/解调器构造 (脉冲缓存) ===")
+    print(f"{'对象':>12} {'采样率':>8} {'未命中 (us)':>12} {'命中 (us)':>10}")
+    print("-" * 48)
+
+    for name, create in [
+        ('Modulator', lambda fs: BLEModulator(ModulatorConfig(sample_rate=fs))),
+        ('Demodulator', lambda fs: BLEDemodulator(DemodulatorConfig(sample_rate=fs))),
+    ]:
+        for sample_rate in [8e6, 16e6, 32e6]:
+            def cold():
+                clear_pulse_cache()
+                create(sample_rate)
+
+            t_cold = timeit(cold, repeat)
+            t_warm = timeit(lambda: create(sample_rate), repeat)
+            print(f"{name:>12} {sample_rate / 1e6:>6.0f}M {t_cold * 1e6:>12.1f} {t_warm * 1e6:>10.1f}")
+
+    print("缓存统计 (最后一次清空后):")
+    for cache_name, info in pulse_cache_info().items():
+        print(f"  {cache_name}: hits={info.hits}, misses={info.misses}, size={info.currsize}/{info.maxsize}")
+
+
+def bench_partial_response(repeat: int, payload_length: int):
+    """Partial Response 调制: 不同脉冲长度和数据包长度下的吞吐量 (应与长度无关)"""
+    print("\n=== Partial Response 调制 (8 Msps, LE 1M) ===")
+    rng = np.random.default_rng(0)
+    lengths = [256, 2048, 16384, 131072]
+
+    print(f"{'L':>3} " + " ".join(f"{n:>9}b" for n in lengths) + "   (Msps)")
+    print("-" * 50)
+
+    for pulse_length in [1, 2, 3, 4]:
+        modulator = BLEModulator(ModulatorConfig(
+            sample_rate=8e6,
+            pulse_length=pulse_length,
+            partial_response=True
+        ))
+        rates = []
+        for num_bits in lengths:
+            bits = rng.integers(0, 2, num_bits).astype(np.uint8)
+            num_samples = (num_bits + pulse_length - 1) * modulator.samples_per_symbol
+            t = timeit(lambda: modulator.modulate(bits), max(1, repeat // 4))
+            rates.append(num_samples / t / 1e6)
+        print(f"{pulse_length:>3} " + " ".join(f"{r:>10.2f}" for r in rates))
+
+
+def bench_resample(repeat: int, payload_length: int):
+    """高采样率/非整数倍采样率解调: 直接解调 vs 重采样到内部采样率
+
+    非整数倍采样率下直接解调的每符号采样数被截断 (定时错误), 仅作耗时对比。
+    """
+    print("\n=== 解调器前端重采样 (LE 1M) ===")
+    print(f"{'采样率':>8} {'内部采样率':>10} {'up/down':>8} {'直接 (ms)':>10} {'重采样 (ms)':>12}")
+    print("-" * 56)
+
+    packet = create_test_packet(payload_length=payload_length, channel=0, whitening=False)
+    bits = packet.generate()
+
+    for sample_rate in [12.5e6, 32e6, 120e6]:
+        signal = BLEModulator(ModulatorConfig(sample_rate=sample_rate)).modulate(bits)
+        direct = BLEDemodulator(DemodulatorConfig(sample_rate=sample_rate, max_samples_per_symbol=1000))
+        resampled = BLEDemodulator(DemodulatorConfig(sample_rate=sample_rate))
+        plan = resampled.resample_plan
+
+        t_direct = timeit(lambda: direct.demodulate(signal), max(1, repeat // 4))
+        t_resampled = timeit(lambda: resampled.demodulate(signal), max(1, repeat // 4))
+        print(f"{sample_rate / 1e6:>6.1f}M {plan.internal_rate / 1e6:>9.1f}M {plan.up:>4}/{plan.down:<3} "
+              f"{t_direct * 1e3:>10.2f} {t_resampled * 1e3:>12.2f}")
+
+
+def bench_wideband(repeat: int, payload_length: int):
+    """宽带多信道合成: 每秒空口时间的数据包数 vs 合成速度"""
+    print("\n=== 宽带多信道合成 (WOLA, 0.1 s 空口时间) ===")
+    print(f"{'带宽':>6} {'精度':>10} {'包/秒':>7} {'耗时 (s)':>9} {'Msps':>8} {'实时倍数':>8}")
+    print("-" * 56)
+
+    rng = np.random.default_rng(0)
+    bits = create_test_packet(payload_length=payload_length, channel=0, whitening=False).generate()
+    duration = 0.1
+    channels = [37, 38, 39] + list(range(37))
+
+    for sample_rate in [40e6, 80e6]:
+        for dtype in ['complex128', 'complex64']:
+            synth = WidebandSynthesizer(WidebandConfig(sample_rate=sample_rate, center_freq=2441e6, dtype=dtype))
+            usable = [ch for ch in channels
+                      if abs(synth.channel_offset(ch)) + 1e6 <= sample_rate / 2]
+            for packets_per_second in [200, 1000]:
+                num_bursts = int(packets_per_second * duration)
+                bursts = [WidebandBurst(bits, int(rng.choice(usable)),
+                                        start_time=float(rng.uniform(0, duration * 0.99)))
+                          for _ in range(num_bursts)]
+
+                def run():
+                    for _ in synth.synthesize_blocks(bursts, duration):
+                        pass
+
+                t = timeit(run, max(1, repeat // 10))
+                num_samples = duration * sample_rate
+                print(f"{sample_rate / 1e6:>4.0f}M {dtype:>10} {packets_per_second:>7} {t:>9.3f} "
+                      f"{num_samples / t / 1e6:>8.1f} {duration / t:>7.2f}x")
+
+
+def bench_nco(repeat: int, payload_length: int):
+    """定点 I/Q 生成: 浮点调制 + 量化 vs 定点 NCO 调制器"""
+    print("\n=== 定点 I/Q 生成 (12 位输出) ===")
+    print(f"{'采样率':>8} {'浮点+量化 (Msps)':>17} {'定点 NCO (Msps)':>16}")
+    print("-" * 46)
+
+    bits = create_test_packet(payload_length=payload_length, channel=0, whitening=False).generate()
+    exporter = IQExporter(IQExportConfig(bit_width=12))
+
+    for sample_rate in [8e6, 16e6, 32e6]:
+        config = ModulatorConfig(sample_rate=sample_rate)
+        modulator = BLEModulator(config)
+        nco = NCOModulator(config, NCOConfig(phase_bits=24, lut_bits=10, output_bits=12))
+        num_samples = len(bits) * modulator.samples_per_symbol
+
+        t_float = timeit(lambda: exporter.quantize(modulator.modulate(bits)), repeat)
+        t_nco = timeit(lambda: nco.modulate(bits), repeat)
+        print(f"{sample_rate / 1e6:>6.0f}M {num_samples / t_float / 1e6:>17.2f} {num_samples / t_nco / 1e6:>16.2f}")
+
+
+def bench_crc(repeat: int, payload_length: int):
+    """CRC24: 逐比特 vs 查表 vs 批量查表"""
+    print("\n=== CRC24 ===")
+    rng = np.random.default_rng(0)
+    num_packets = 4096
+    pdus = rng.integers(0, 256, (num_packets, 2 + payload_length), dtype=np.uint8)
+    pdu = bytes(pdus[0])
+
+    assert crc24(pdu) == crc24_bitwise(pdu)
+    assert crc24_batch(pdus[:16]).tolist() == [crc24(bytes(row)) for row in pdus[:16]]
+
+    t_bitwise = timeit(lambda: crc24_bitwise(pdu), max(1, repeat // 4))
+    t_table = timeit(lambda: crc24(pdu), repeat)
+    t_batch = timeit(lambda: crc24_batch(pdus), max(1, repeat // 4)) / num_packets
+
+    print(f"PDU 长度 {len(pdu)} 字节, 批量 {num_packets} 个")
+    print(f"  逐比特:   {t_bitwise * 1e6:>9.2f} us/PDU")
+    print(f"  查表:     {t_table * 1e6:>9.2f} us/PDU ({t_bitwise / t_table:.0f}x)")
+    print(f"  批量查表: {t_batch * 1e6:>9.2f} us/PDU ({t_bitwise / t_batch:.0f}x)")
+
+
+def bench_template(repeat: int, payload_length: int):
+    """数据包模板: 每包修改 4 字节计数器, 完整生成 vs 增量更新"""
+    print("\n=== 数据包模板 (4 字节计数器) ===")
+    num_packets = 1024
+    packet = create_test_packet(payload_length=payload_length)
+    template = BLEPacketTemplate(packet)
+    counters = np.arange(num_packets, dtype='<u4').view(np.uint8).reshape(num_packets, 4)
+
+    def full():
+        payload = bytearray(packet.test_payload)
+        for counter in range(num_packets):
+            payload[:4] = counter.to_bytes(4, 'little')
+            packet._test_payload = bytes(payload)
+            packet.generate()
+
+    def patch():
+        for counter in range(num_packets):
+            template.patch(0, counter.to_bytes(4, 'little'))
+
+    t_full = timeit(full, max(1, repeat // 10)) / num_packets
+    t_patch = timeit(patch, max(1, repeat // 4)) / num_packets
+    t_batch = timeit(lambda: template.patch_batch(0, counters), repeat) / num_packets
+
+    print(f"负载 {payload_length} 字节, {num_packets} 个数据包")
+    print(f"  完整生成: {t_full * 1e6:>9.2f} us/包")
+    print(f"  增量更新: {t_patch * 1e6:>9.2f} us/包 ({t_full / t_patch:.0f}x)")
+    print(f"  批量更新: {t_batch * 1e6:>9.2f} us/包 ({t_full / t_batch:.0f}x)")
+
+
+def bench_whitening(repeat: int, payload_length: int):
+    """去白化: 逐比特 LFSR vs 预计算周期平铺"""
+    print("\n=== 白化 ===")
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, (2 + payload_length + 3) * 8, dtype=np.uint8)
+    batch = rng.integers(0, 2, (1024, len(bits)), dtype=np.uint8)
+    channels = rng.integers(0, 40, len(batch))
+
+    assert np.array_equal(apply_whitening(bits, 37), whitening_lfsr(bits, 37))
+
+    t_lfsr = timeit(lambda: whitening_lfsr(bits, 37), max(1, repeat // 4))
+    t_table = timeit(lambda: apply_whitening(bits, 37), repeat)
+    t_batch = timeit(lambda: apply_whitening(batch, channels), max(1, repeat // 4)) / len(batch)
+
+    print(f"数据段 {len(bits)} 比特")
+    print(f"  逐比特 LFSR: {t_lfsr * 1e6:>9.2f} us/包")
+    print(f"  查表:        {t_table * 1e6:>9.2f} us/包 ({t_lfsr / t_table:.0f}x)")
+    print(f"  批量查表:    {t_batch * 1e6:>9.2f} us/包 ({t_lfsr / t_batch:.0f}x)")
+
+
+def bench_bitutils(repeat: int, payload_length: int):
+    """比特/字节转换: 逐比特循环 vs np.unpackbits/np.packbits (37 / 255 字节 PDU)"""
+    print("\n=== 比特/字节转换 ===")
+    rng = np.random.default_rng(0)
+    num_packets = 1024
+
+    print(f"{'PDU 字节':>8} | {'操作':>6} | {'循环 (us)':>10} | {'向量化 (us)':>11} | "
+          f"{'批量 (us/包)':>12} | {'加速比':>6}")
+    print("-" * 70)
+    for length in (37, 255):
+        batch = rng.integers(0, 256, (num_packets, length), dtype=np.uint8)
+        pdu = bytes(batch[0])
+        bits = bytes_to_bits(pdu)
+        batch_bits = bytes_to_bits(batch)
+
+        assert np.array_equal(bits, bytes_to_bits_loop(pdu))
+        assert bits_to_bytes(bits).tobytes() == bits_to_bytes_loop(bits) == pdu
+
+        cases = [
+            ('解包', lambda: bytes_to_bits_loop(pdu), lambda: bytes_to_bits(pdu),
+             lambda: bytes_to_bits(batch)),
+            ('打包', lambda: bits_to_bytes_loop(bits), lambda: bits_to_bytes(bits).tobytes(),
+             lambda: bits_to_bytes(batch_bits)),
+        ]
+        for name, loop, vectorized, batched in cases:
+            t_loop = timeit(loop, max(1, repeat // 4))
+            t_vec = timeit(vectorized, repeat * 10)
+            t_batch = timeit(batched, repeat) / num_packets
+            print(f"{length:>8} | {name:>6} | {t_loop * 1e6:>10.2f} | {t_vec * 1e6:>11.2f} | "
+                  f"{t_batch * 1e6:>12.3f} | {t_loop / t_vec:>5.0f}x")
+
+
+def bench_packet_batch(repeat: int, payload_length: int):
+    """数据包生成: 逐个 BLEPacket vs BLEPacketBatch (广播包, 37 字节负载)"""
+    print("\n=== 批量数据包生成 (广播包) ===")
+    config = BLEPacketConfig(channel=37)
+    batch = BLEPacketBatch(config)
+    num_packets = 100000
+    rng = np.random.default_rng(0)
+    payloads = rng.integers(0, 256, (num_packets, 37), dtype=np.uint8)
+
+    def per_packet(count: int):
+        for row in payloads[:count]:
+            config.payload = bytes(row)
+            BLEPacket(config).generate()
+
+    bits = batch.generate(payloads[:4])
+    for i in range(4):
+        config.payload = bytes(payloads[i])
+        assert np.array_equal(bits[i], BLEPacket(config).generate())
+
+    t_loop = timeit(lambda: per_packet(1000), max(1, repeat // 10)) / 1000
+    t_batch = timeit(lambda: batch.generate(payloads), max(1, repeat // 4))
+
+    print(f"{num_packets} 个数据包, 每包 {bits.shape[1]} 比特")
+    print(f"  逐个生成: {t_loop * num_packets * 1e3:>9.1f} ms ({t_loop * 1e6:.1f} us/包)")
+    print(f"  批量生成: {t_batch * 1e3:>9.1f} ms ({t_loop * num_packets / t_batch:.0f}x)")
+
+
+def bench_coded(repeat: int, payload_length: int):
+    """批量数据包生成: 1M PHY vs LE Coded S=2 / S=8 (FEC 编码 + 模式映射)"""
+    print("\n=== 批量数据包生成 (LE Coded PHY) ===")
+    num_packets = 10000
+    rng = np.random.default_rng(0)
+    payloads = rng.integers(0, 256, (num_packets, 37), dtype=np.uint8)
+
+    print(f"{num_packets} 个数据包, 37 字节负载")
+    print(f"{'PHY':>12} | {'符号/包':>7} | {'耗时 (ms)':>9} | {'us/包':>7} | {'Msym/s':>8}")
+    print("-" * 56)
+    for phy_mode in (BLEPhyMode.LE_1M, BLEPhyMode.LE_CODED_S2, BLEPhyMode.LE_CODED_S8):
+        batch = BLEPacketBatch(BLEPacketConfig(phy_mode=phy_mode, channel=37))
+        elapsed = timeit(lambda: batch.generate(payloads), max(1, repeat // 4))
+        symbols = batch.generate(payloads[:1]).shape[1]
+        print(f"{phy_mode.name:>12} | {symbols:>7} | {elapsed * 1e3:>9.1f} | "
+              f"{elapsed / num_packets * 1e6:>7.2f} | {symbols * num_packets / elapsed / 1e6:>8.1f}")
+
+
+def bench_viterbi(repeat: int, payload_length: int):
+    """LE Coded PHY 软判决 Viterbi 译码: 单个数据包 vs 批量"""
+    print("\n=== Viterbi 译码 (LE Coded PHY) ===")
+    rng = np.random.default_rng(0)
+    num_bits = (2 + payload_length + 3) * 8
+    batch_size = 32
+    bits = rng.integers(0, 2, (batch_size, num_bits), dtype=np.uint8)
+
+    print(f"PDU {payload_length} 字节 ({num_bits} 比特 + TERM2)")
+    print(f"{'S':>3} | {'单包 (ms)':>9} | {f'批量 {batch_size} 包 (ms/包)':>20}")
+    print("-" * 40)
+    for spreading in (2, 8):
+        symbols = 2.0 * encode_fec_block(bits, spreading) - 1
+        soft = symbols + rng.normal(0, 0.8, symbols.shape)
+        assert np.array_equal(decode_fec_block(symbols[0], spreading), bits[0])
+
+        t_single = timeit(lambda: decode_fec_block(soft[0], spreading), max(1, repeat // 4))
+        t_batch = timeit(lambda: decode_fec_block(soft, spreading), max(1, repeat // 10)) / batch_size
+        print(f"{spreading:>3} | {t_single * 1e3:>9.2f} | {t_batch * 1e3:>20.3f}")
+
+
+def find_packets_sliding(demodulator: BLEDemodulator, signal: np.ndarray) -> list:
+    """参考实现: 0.5 ms 窗口每次滑动 8 个符号并完整解调 (单遍检测之前的 find_packets)"""
+    signal = demodulator._prepare_signal(signal)
+    sps = demodulator.samples_per_symbol
+    window_size = int(demodulator.sample_rate * 0.5e-3)
+    results = []
+    offset = 0
+    while offset < len(signal) - window_size:
+        result = demodulator._demodulate(signal[offset:offset + window_size])
+        if result.success:
+            results.append(result)
+            offset += len(result.bits) * sps
+        else:
+            offset += sps * 8
+    return results
+
+
+def bench_sniffer(repeat: int, payload_length: int):
+    """多数据包采集检测: 滑动窗口逐窗解调 vs 单遍 find_packets (Msamples/s)"""
+    print("\n=== 数据包检测 (find_packets) ===")
+    sample_rate = 8e6
+    num_packets = 100
+    payload_length = min(payload_length, 37)
+    rng = np.random.default_rng(0)
+    modulator = BLEModulator(ModulatorConfig(sample_rate=sample_rate))
+
+    parts = []
+    for _ in range(num_packets):
+        parts.append(np.zeros(rng.integers(400, 4000), dtype=np.complex64))
+        payload = rng.integers(0, 256, payload_length, dtype=np.uint8).tobytes()
+        iq = modulator.modulate(BLEPacket(BLEPacketConfig(payload=payload)).generate())
+        parts.append(iq * np.exp(2j * np.pi * rng.uniform(-50e3, 50e3) * np.arange(len(iq)) / sample_rate))
+    capture = np.concatenate(parts)
+    capture = capture + 0.05 * (rng.standard_normal(len(capture)) + 1j * rng.standard_normal(len(capture)))
+    capture = capture.astype(np.complex64)
+
+    demodulator = BLEDemodulator(DemodulatorConfig(sample_rate=sample_rate))
+    head = capture[:len(capture) // 10]
+    t_sliding = timeit(lambda: find_packets_sliding(demodulator, head), 1)
+    t_single = timeit(lambda: demodulator.find_packets(capture), max(1, repeat // 10))
+    found_sliding = len(find_packets_sliding(demodulator, head))
+    found_single = len(demodulator.find_packets(capture))
+
+    print(f"采集 {len(capture) / 1e6:.2f} M 采样 ({num_packets} 个数据包, 8 MHz)")
+    print(f"  滑动窗口: {len(head) / t_sliding / 1e6:>7.2f} Msamples/s (前 10% 采集检出 {found_sliding} 个)")
+    print(f"  单遍检测: {len(capture) / t_single / 1e6:>7.2f} Msamples/s (检出 {found_single} 个, "
+          f"{len(capture) / t_single / (len(head) / t_sliding):.0f}x)")
+
+
+class DirectSyncDetector(SyncDetector):
+    """参考实现: 相关核心为逐地址逐相位 np.correlate (时域直接相关), 去直流和归一化与 SyncDetector 相同"""
+
+    def _correlate_phases(self, phases: np.ndarray):
+        for template in self.templates.astype(np.float32):
+            yield np.stack([np.correlate(phase, template, mode='valid') for phase in phases])
+
+
+def bench_sync(repeat: int, payload_length: int):
+    """多接入地址同步检测: 逐地址逐相位时域相关 vs FFT 模板组相关"""
+    print("\n=== 多接入地址同步检测 ===")
+    sample_rate = 8e6
+    access_addresses = [int(aa) for aa in generate_access_addresses(16, seed=0)]
+    rng = np.random.default_rng(0)
+    modulator = BLEModulator(ModulatorConfig(sample_rate=sample_rate))
+
+    parts = []
+    for i in range(64):
+        parts.append(np.zeros(rng.integers(400, 4000), dtype=np.complex64))
+        config = BLEPacketConfig(access_address=access_addresses[i % len(access_addresses)],
+                                 payload=bytes(min(payload_length, 37)))
+        parts.append(modulator.modulate(BLEPacket(config).generate()))
+    capture = np.concatenate(parts)
+    capture = capture + 0.1 * (rng.standard_normal(len(capture)) + 1j * rng.standard_normal(len(capture)))
+    capture = capture.astype(np.complex64)
+
+    demodulator = BLEDemodulator(DemodulatorConfig(sample_rate=sample_rate))
+    sps = demodulator.samples_per_symbol
+    filtered = demodulator._matched_filter(demodulator._fm_demodulate(capture)).astype(np.float64)
+
+    print(f"采集 {len(capture) / 1e6:.2f} M 采样, 64 个数据包")
+    print(f"{'接入地址数':>10} | {'时域相关 (ms)':>13} | {'FFT 相关 (ms)':>13} | {'命中':>4} | 加速比")
+    print("-" * 62)
+    for count in (1, 4, 16):
+        detector = SyncDetector(access_addresses[:count], samples_per_symbol=sps)
+        direct = DirectSyncDetector(access_addresses[:count], samples_per_symbol=sps)
+        t_direct = timeit(lambda: direct.detect(filtered), max(1, repeat // 10))
+        t_fft = timeit(lambda: detector.detect(filtered), max(1, repeat // 10))
+        hits = len(detector.detect(filtered))
+        assert len(direct.detect(filtered)) == hits
+        print(f"{count:>10} | {t_direct * 1e3:>13.1f} | {t_fft * 1e3:>13.1f} | {hits:>4} | {t_direct / t_fft:.1f}x")
+
+
+def bench_sync_word(repeat: int, payload_length: int):
+    """硬判决比特流同步字搜索: 浮点 np.correlate vs uint64 XOR + popcount"""
+    print("\n=== 比特流同步字搜索 ===")
+    num_bits = 1 << 22
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, num_bits, dtype=np.uint8)
+
+    print(f"比特流 {num_bits / 1e6:.1f} M 比特")
+    print(f"{'同步字':>12} | {'np.correlate (ms)':>17} | {'XOR+popcount (ms)':>17} | 加速比")
+    print("-" * 66)
+    for name, phy_mode in (('40 bit (1M)', BLEPhyMode.LE_1M), ('48 bit (2M)', BLEPhyMode.LE_2M),
+                           ('336 (Coded)', BLEPhyMode.LE_CODED_S8)):
+        pattern = sync_pattern(0x8E89BED6, phy_mode)
+        pattern_nrz = 2 * pattern.astype(np.float64) - 1
+        threshold = len(pattern) * 0.8
+
+        def correlate():
+            bits_nrz = 2 * bits.astype(np.float64) - 1
+            return np.flatnonzero(np.correlate(bits_nrz, pattern_nrz, mode='valid') > threshold)
+
+        assert np.array_equal(correlate(), find_sync_word(bits, pattern))
+        t_correlate = timeit(correlate, max(1, repeat // 10))
+        t_bitwise = timeit(lambda: find_sync_word(bits, pattern), max(1, repeat // 10))
+        print(f"{name:>12} | {t_correlate * 1e3:>17.1f} | {t_bitwise * 1e3:>17.1f} | {t_correlate / t_bitwise:.1f}x")
+
+
+def bench_demod_batch(repeat: int, payload_length: int):
+    """批量解调: 逐包 demodulate vs demodulate_batch (包/秒)"""
+    print("\n=== 批量解调 ===")
+    num_packets = 200
+    rng = np.random.default_rng(0)
+
+    print(f"{'PHY':>12} | {'逐包 (包/s)':>12} | {'批量 (包/s)':>12} | 加速比")
+    print("-" * 54)
+    for phy_mode in (BLEPhyMode.LE_1M, BLEPhyMode.LE_2M, BLEPhyMode.LE_CODED_S2, BLEPhyMode.LE_CODED_S8):
+        modulator = BLEModulator(ModulatorConfig(phy_mode=phy_mode))
+        demodulator = BLEDemodulator(DemodulatorConfig(phy_mode=phy_mode))
+        bits = [BLEPacket(BLEPacketConfig(phy_mode=phy_mode, payload=bytes(payload_length))).generate()
+                for _ in range(num_packets)]
+        signals = modulator.modulate_batch(bits)
+        signals = signals + 0.1 * (rng.standard_normal(signals.shape) + 1j * rng.standard_normal(signals.shape))
+
+        t_loop = timeit(lambda: [demodulator.demodulate(signal) for signal in signals], max(1, repeat // 10))
+        t_batch = timeit(lambda: demodulator.demodulate_batch(signals), max(1, repeat // 10))
+        assert demodulator.demodulate_batch(signals)['crc_valid'].all()
+        print(f"{phy_mode.name:>12} | {num_packets / t_loop:>12.0f} | {num_packets / t_batch:>12.0f} | "
+              f"{t_loop / t_batch:.1f}x")
+
+
+def bench_prbs(repeat: int, payload_length: int):
+    """PRBS15 负载: 逐比特 LFSR vs 周期缓存切片"""
+    print("\n=== PRBS15 负载 ===")
+    assert prbs_bytes(15, payload_length) == prbs15_lfsr(payload_length)
+
+    prbs_period.cache_clear()
+    start = time.perf_counter()
+    prbs_period(15)
+    t_period = time.perf_counter() - start
+
+    t_lfsr = timeit(lambda: prbs15_lfsr(payload_length), max(1, repeat // 4))
+    t_cached = timeit(lambda: prbs_bytes(15, payload_length, phase=12345), repeat * 10)
+
+    print(f"负载 {payload_length} 字节")
+    print(f"  周期生成 (一次): {t_period * 1e3:>9.2f} ms")
+    print(f"  逐比特 LFSR:     {t_lfsr * 1e6:>9.2f} us/包")
+    print(f"  周期切片:        {t_cached * 1e6:>9.2f} us/包 ({t_lfsr / t_cached:.0f}x)")
+
+
+def bench_hopping(repeat: int, payload_length: int):
+    """跳频序列: 逐事件 next_data_channel vs 向量化 CSA#1 / CSA#2"""
+    print("\n=== 跳频序列 ===")
+    num_events = 10000
+    channel_map = 0x1E00E00600  # 9 个可用信道, 大部分事件需要重映射
+
+    def per_event():
+        unmapped = 0
+        for _ in range(num_events):
+            unmapped, _ = next_data_channel(unmapped, 7, channel_map)
+
+    t_loop = timeit(per_event, max(1, repeat // 10))
+    t_csa1 = timeit(lambda: csa1_channel_sequence(num_events, 7, channel_map), repeat)
+    t_csa2 = timeit(lambda: csa2_channel_sequence(num_events, 0x8E89BED6, channel_map), repeat)
+
+    print(f"{num_events} 个连接事件")
+    print(f"  CSA#1 逐事件: {t_loop * 1e3:>9.2f} ms")
+    print(f"  CSA#1 向量化: {t_csa1 * 1e3:>9.2f} ms ({t_loop / t_csa1:.0f}x)")
+    print(f"  CSA#2 向量化: {t_csa2 * 1e3:>9.2f} ms")
+
+
+def random_access_address_loop() -> int:
+    """参考实现: 逐个候选、二进制字符串检查 (向量化之前的 generate_random_access_address)"""
+    while True:
+        aa = np.random.randint(0, 0xFFFFFFFF)
+        if aa in (0x8E89BED6, 0, 0xFFFFFFFF):
+            continue
+        binary = format(aa, '032b')
+        max_consecutive = max(
+            len(s) for s in binary.replace('0', ' ').split() + binary.replace('1', ' ').split()
+            if s
+        )
+        if max_consecutive > 6:
+            continue
+        transitions = sum(1 for i in range(31) if binary[i] != binary[i+1])
+        if transitions < 2:
+            continue
+        return aa
+
+
+def bench_access_address(repeat: int, payload_length: int):
+    """接入地址生成: 逐个生成 vs 批量向量化筛选"""
+    print("\n=== 接入地址生成 ===")
+    count = 10000
+
+    t_loop = timeit(lambda: {random_access_address_loop() for _ in range(count)}, 1)
+    t_batch = timeit(lambda: generate_access_addresses(count), repeat)
+
+    print(f"{count} 个接入地址")
+    print(f"  逐个生成:   {t_loop * 1e3:>9.2f} ms")
+    print(f"  批量向量化: {t_batch * 1e3:>9.2f} ms ({t_loop / t_batch:.0f}x)")
+
+
+def bench_traffic(repeat: int, payload_length: int):
+    """连接流量仿真: 生成 10 s 空口时间的连续采集"""
+    print("\n=== 连接流量仿真 ===")
+    duration = 10.0
+    config = TrafficConfig(duration=duration, central_payloads=(bytes(payload_length),), seed=0)
+
+    for selection in (1, 2):
+        config.channel_selection = selection
+        traffic = TrafficGenerator(config)
+
+        def run():
+            for _ in traffic.blocks(1 << 20):
+                pass
+
+        elapsed = timeit(run, 1)
+        info = traffic.cache_info()
+        print(f"CSA#{selection}: {duration:.0f} s 空口时间 {elapsed:.2f} s "
+              f"({duration / elapsed:.1f}x 实时), 波形缓存命中 {info['hits']}/{info['hits'] + info['misses']}")
+
+
+SUITES = {
+    'modulator': bench_modulator,
+    'construction': bench_construction,
+    'partial': bench_partial_response,
+    'resample': bench_resample,
+    'wideband': bench_wideband,
+    'nco': bench_nco,
+    'crc': bench_crc,
+    'template': bench_template,
+    'whitening': bench_whitening,
+    'bitutils': bench_bitutils,
+    'batch': bench_packet_batch,
+    'coded': bench_coded,
+    'viterbi': bench_viterbi,
+    'sniffer': bench_sniffer,
+    'sync': bench_sync,
+    'sync_word': bench_sync_word,
+    'demod_batch': bench_demod_batch,
+    'prbs': bench_prbs,
+    'hopping': bench_hopping,
+    'access_address': bench_access_address,
+    'traffic': bench_traffic,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='BLE Studio 吞吐量测试',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  python examples/benchmark_throughput.py                    # 全部测试
+  python examples/benchmark_throughput.py --suite modulator  # 只测试调制器
+        """
+    )
+    parser.add_argument('--suite', choices=list(SUITES) + ['all'], default='all',
+                        help='测试项 (默认: all)')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='每项重复次数 (默认: 20)')
+    parser.add_argument('--length', type=int, default=251,
+                        help='负载长度, 字节 (默认: 251)')
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BLE Studio 吞吐量测试")
+    print("=" * 60)
+
+    suites = SUITES.values() if args.suite == 'all' else [SUITES[args.suite]]
+    for bench in suites:
+        bench(args.repeat, args.length)
+
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+单精度回归测试: complex64 与 complex128 链路在灵敏度点的 PER 一致
+
+链路与 examples/benchmark.py 相同 (PRBS9 测试包, 8 Msps, AWGN, 高斯匹配滤波)。
+两种精度使用相同的随机种子, 噪声按同一序列生成 (单精度由双精度噪声截断), 差异只来自数值精度。
+
+容差: 按试验次数取两个 PER 估计之差的 3σ (即使两次运行的噪声相互独立也成立),
+σ = sqrt(2 p (1 - p) / N); 200 次试验、p ≈ 30% 时约 4.6 个百分点, 容差约 14 个百分点。
+单精度链路出现系统性误差 (如相位累积丢失精度) 时 PER 会偏离数十个百分点。
+"""
+
+import numpy as np
+import pytest
+
+from ble_studio import (
+    BLEModulator, BLEDemodulator, ModulatorConfig, DemodulatorConfig,
+    BLEPhyMode, create_test_packet, RFTestPayloadType,
+    BLEChannel, ChannelConfig, ChannelType
+)
+
+NUM_TRIALS = 200
+SAMPLE_RATE = 8e6
+SEED = 2024
+
+
+def measure_per(phy_mode: BLEPhyMode, ebn0_db: float, dtype: str) -> float:
+    """以固定种子运行 NUM_TRIALS 次试验, 返回 PER (0-1)"""
+    symbol_rate = 2e6 if phy_mode == BLEPhyMode.LE_2M else 1e6
+    packet = create_test_packet(
+        payload_type=RFTestPayloadType.PRBS9,
+        payload_length=37,
+        channel=0,
+        phy_mode=phy_mode,
+        whitening=False
+    )
+    bits = packet.generate()
+
+    modulator = BLEModulator(ModulatorConfig(phy_mode=phy_mode, sample_rate=SAMPLE_RATE, dtype=dtype))
+    tx_signals = modulator.modulate_batch(np.broadcast_to(bits, (NUM_TRIALS, len(bits))))
+
+    channel = BLEChannel(ChannelConfig(
+        channel_type=ChannelType.AWGN,
+        sample_rate=SAMPLE_RATE,
+        symbol_rate=symbol_rate,
+        snr_db=ebn0_db,
+        frequency_offset=0
+    ))
+    np.random.seed(SEED)
+    rx_signals = np.stack([channel.apply(signal) for signal in tx_signals])
+    assert rx_signals.dtype == np.dtype(dtype)
+
+    demodulator = BLEDemodulator(DemodulatorConfig(
+        phy_mode=phy_mode,
+        sample_rate=SAMPLE_RATE,
+        access_address=0x71764129,
+        channel=0,
+        whitening=False
+    ))
+    results = demodulator.demodulate_batch(rx_signals)
+    return 1.0 - results['success'].mean()
+
+
+@pytest.mark.parametrize('phy_mode, ebn0_db', [
+    (BLEPhyMode.LE_1M, 15.5),
+    (BLEPhyMode.LE_2M, 13.5),
+])
+def test_single_precision_per_matches_double(phy_mode, ebn0_db):
+    per_double = measure_per(phy_mode, ebn0_db, 'complex128')
+    per_single = measure_per(phy_mode, ebn0_db, 'complex64')
+
+    # 测试点须在灵敏度区域内, 否则两种精度都是 0% 或 100%, 比较没有意义
+    assert 0.05 < per_double < 0.95
+
+    tolerance = 3 * np.sqrt(2 * per_double * (1 - per_double) / NUM_TRIALS)
+    assert abs(per_single - per_double) <= tolerance, \
+        f"PER complex128 {per_double:.1%} / complex64 {per_single:.1%}, 容差 {tolerance:.1%}"